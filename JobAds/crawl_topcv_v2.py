@@ -8,6 +8,8 @@ import json
 from datetime import datetime
 import os
 
+from job_features import salary_range
+
 # Import giả định cho các dependencies bên ngoài
 # Bạn cần đảm bảo các dependency này đã được cài đặt và hàm send_request hoạt động.
 # Ví dụ đơn giản cho send_request (cần thay thế bằng implementation thực tế):
@@ -18,8 +20,6 @@ def send_request(method: str, url: str):
         return requests.get(url, timeout=10) 
     raise NotImplementedError(f"Method {method} not implemented")
 
-USD_TO_VND = 26088
-
 #################################################
 
 
@@ -172,47 +172,7 @@ class JobProcessor():
         Parse salary tag into integer salary range (in million VND).
         Detects USD and convert to million VND.
         """
-        salary_str = salary_tag.text.strip() # Dùng strip() đơn giản hơn
-
-        if salary_str == "Thoả thuận":       # Default string for no salary info
-            return None, None
-        
-        # Remove , thousand separators
-        # Dùng regex hoặc list comprehension để đảm bảo lấy được các giá trị số
-        import re
-        salary_arr = re.split(r'[\s\u200b]+', salary_str) # Tách bằng khoảng trắng và zero-width space
-        salary_values = []
-        unit = "VND" # Giả định mặc định là VND
-
-        for item in salary_arr:
-            item = item.replace(",", "")
-            if item.isdigit():
-                salary_values.append(int(item))
-            elif item.upper() == "USD":
-                unit = "USD"
-        
-        min_salary, max_salary = None, None
-        
-        if len(salary_values) == 2:          # Normal range (<min> - <max> <unit>)
-            min_salary, max_salary = salary_values[0], salary_values[1]
-        elif salary_str.startswith("Trên") and len(salary_values) == 1: # Min only (Trên <min> <unit>)
-            min_salary = salary_values[0]
-        elif salary_str.startswith("Tới") and len(salary_values) == 1: # Max only (Tới <max> <unit>)
-            max_salary = salary_values[0]
-        elif len(salary_values) == 1:        # Chỉ có 1 con số
-            min_salary, max_salary = salary_values[0], salary_values[0]
-
-        # Convert USD to million VND
-        if unit == "USD":
-            min_salary = int(min_salary * USD_TO_VND / 10**6) if min_salary is not None else None
-            max_salary = int(max_salary * USD_TO_VND / 10**6) if max_salary is not None else None
-        else: # Convert VND to million VND (VND là đơn vị, thường đã là nghìn/triệu)
-              # Giả định nếu không phải USD thì đơn vị trên trang là triệu VND
-            min_salary = min_salary if min_salary is not None else None
-            max_salary = max_salary if max_salary is not None else None
-
-
-        return min_salary, max_salary
+        return salary_range(salary_tag.text)
     
     def _process_xp(self, xp_tag: Tag):
         # Returns min & max required experience (years)
@@ -0,0 +1,245 @@
+import os
+import re
+import csv
+import json
+import time
+import threading
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_PATH = os.path.join(BASE_DIR, "vn_gazetteer.csv")
+CACHE_PATH = os.path.join(BASE_DIR, "data", "_cache", "geocode_cache.json")
+MAX_WINDOW = 5          # longest place name, in tokens
+FUZZY_THRESHOLD = 0.85
+SEGMENT_RE = re.compile(r"[,;/&|()\n]+|\s-\s")
+NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def fold(text: str):
+    """Lowercase, no diacritics, punctuation to spaces: 'TP.HCM' -> 'tp hcm'."""
+    text = unidecode(str(text).replace("Đ", "D").replace("đ", "d")).lower()
+    return NON_WORD_RE.sub(" ", text).strip()
+
+
+def _trigrams(key: str):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def nominatim_resolver(user_agent: str = "fadaml_jobs_geocoder", timeout: int = 10, min_delay: float = 1.0):
+    """
+    External fallback with the notebook's Nominatim settings (loc + ", Vietnam"),
+    spaced by `min_delay` seconds as the Nominatim usage policy asks.
+    """
+    from geopy.geocoders import Nominatim
+    geolocator = Nominatim(user_agent=user_agent)
+    lock, last_call = threading.Lock(), [0.0]
+
+    def resolve(loc: str):
+        with lock:
+            wait = min_delay - (time.monotonic() - last_call[0])
+            if wait > 0:
+                time.sleep(wait)
+            last_call[0] = time.monotonic()
+        try:
+            res = geolocator.geocode(loc + ", Vietnam", timeout=timeout)
+        except Exception:
+            return None
+        return (res.latitude, res.longitude) if res else None
+
+    return resolve
+
+
+class Geocoder():
+    """
+    Offline geocoder for Vietnamese job locations, replacing `geocode_safe`.
+
+    1. The bundled gazetteer (provinces and major districts, each with
+       aliases) is indexed by folded name, so "Hồ Chí Minh", "Ho Chi Minh",
+       "TP.HCM" and "Sài Gòn" hit the same entry. Every run of up to
+       MAX_WINDOW tokens of every address segment is looked up; a district
+       wins over its province, and among provinces the first mentioned wins
+       ("Hà Nội, Hồ Chí Minh" -> Hà Nội).
+    2. If nothing matches exactly, segments are matched fuzzily through a
+       prebuilt character-trigram index ("Ho Chi Mihn").
+    3. Only then, and only if an `external` resolver is given (e.g.
+       nominatim_resolver()), the network is used; its answers, including
+       misses, are kept in a persistent JSON cache.
+
+    Results are memoized per input string, so repeated locations cost one
+    dict lookup.
+
+    Usage:
+        geocoder = Geocoder()
+        geocoder.geocode("Số 18 Lê Văn Lương, phường Trung Hòa, Cầu Giấy")   # (21.0362, 105.7906)
+        df[["lat", "lon"]] = geocoder.geocode_series(df["location_extracted"])
+    """
+    def __init__(self, gazetteer_path: str = GAZETTEER_PATH, cache_path: str = CACHE_PATH, external=None):
+        self.entries = []
+        self.index = {}
+        with open(gazetteer_path, "r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                entry = {
+                    "name": row["name"], "type": row["type"], "province": row["province"],
+                    "lat": float(row["lat"]), "lon": float(row["lon"]),
+                }
+                self.entries.append(entry)
+                for alias in [row["name"]] + [a for a in (row["aliases"] or "").split("|") if a.strip()]:
+                    # Same key in several provinces (e.g. Tân Phú): keep all, in file order
+                    self.index.setdefault(fold(alias), []).append(entry)
+
+        self.trigram_index = {}
+        for key in self.index:
+            for g in _trigrams(key):
+                self.trigram_index.setdefault(g, set()).add(key)
+
+        self.external = external
+        self.cache_path = cache_path
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self.cache = json.load(f)
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    # -- Matching --
+    def _exact_matches(self, segments: list[str]):
+        """(segment no, start token, entries) for the longest non-overlapping names."""
+        matches = []
+        for seg_no, segment in enumerate(segments):
+            tokens = segment.split()
+            i = 0
+            while i < len(tokens):
+                for size in range(min(MAX_WINDOW, len(tokens) - i), 0, -1):
+                    entries = self.index.get(" ".join(tokens[i:i + size]))
+                    if entries:
+                        matches.append((seg_no, i, entries))
+                        i += size
+                        break
+                else:
+                    i += 1
+        return matches
+
+    def _fuzzy_match(self, segment: str):
+        grams = _trigrams(segment)
+        counts = {}
+        for g in grams:
+            for key in self.trigram_index.get(g, ()):
+                counts[key] = counts.get(key, 0) + 1
+        best, best_score = None, FUZZY_THRESHOLD
+        # Only the keys sharing the most trigrams are compared character by character
+        for key, _ in sorted(counts.items(), key=lambda kv: -kv[1])[:10]:
+            score = SequenceMatcher(None, segment, key).ratio()
+            if score >= best_score:
+                best, best_score = key, score
+        return self.index[best] if best else None
+
+    @staticmethod
+    def _pick(matches: list[list[dict]]):
+        provinces = [e for entries in matches for e in entries if e["type"] == "province"]
+        mentioned = {e["province"] for e in provinces}
+        districts = [entries for entries in matches if any(e["type"] == "district" for e in entries)]
+        for entries in districts:
+            for e in entries:
+                if e["type"] == "district" and (not mentioned or e["province"] in mentioned):
+                    return e
+        if provinces:
+            return provinces[0]
+        for entries in districts:
+            return entries[0]
+        return None
+
+    def resolve(self, text):
+        """
+        Returns:
+            place [dict | None]: name, type, province, lat, lon and source
+                ("gazetteer", "fuzzy", "external"), or None if unresolved.
+        """
+        if not isinstance(text, str) or not text.strip():
+            return None
+        place = self._memo.get(text)
+        if place is not None or text in self._memo:
+            return place
+
+        segments = [fold(s) for s in SEGMENT_RE.split(text)]
+        segments = [s for s in segments if s]
+        place = None
+        matches = self._exact_matches(segments)
+        if matches:
+            place = {**self._pick([entries for _, _, entries in matches]), "source": "gazetteer"}
+        else:
+            fuzzy = [m for m in (self._fuzzy_match(s) for s in segments) if m]
+            if fuzzy:
+                place = {**self._pick(fuzzy), "source": "fuzzy"}
+        if place is None and self.external is not None:
+            place = self._resolve_external(text)
+
+        self._memo[text] = place
+        return place
+
+    def _resolve_external(self, text: str):
+        key = fold(text)
+        with self._lock:
+            cached = self.cache.get(key, "missing")
+        if cached == "missing":
+            result = self.external(text)
+            cached = list(result) if result else None
+            with self._lock:
+                self.cache[key] = cached
+                self._save_cache()
+        if cached is None:
+            return None
+        return {"name": text, "type": "external", "province": None,
+                "lat": cached[0], "lon": cached[1], "source": "external"}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, ensure_ascii=False, indent=4)
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+
+    # -- Notebook-compatible API --
+    def geocode(self, loc):
+        """(lat, lon) like geocode_safe, (nan, nan) when unresolved."""
+        place = self.resolve(loc)
+        return (place["lat"], place["lon"]) if place else (np.nan, np.nan)
+
+    def geocode_series(self, locations: pd.Series):
+        """lat / lon columns for a Series of location strings (each distinct value resolved once)."""
+        locations = pd.Series(locations)
+        uniques = locations.dropna().unique()
+        coords = {loc: self.geocode(loc) for loc in uniques}
+        lat = locations.map(lambda x: coords.get(x, (np.nan, np.nan))[0])
+        lon = locations.map(lambda x: coords.get(x, (np.nan, np.nan))[1])
+        return pd.DataFrame({"lat": lat.astype(float), "lon": lon.astype(float)}, index=locations.index)
+
+
+def main():
+    """Resolve every job_city of the latest merged JobAds file offline."""
+    merged_dir = os.path.join(BASE_DIR, "merged_data")
+    latest = sorted(os.listdir(merged_dir))[-1]
+    df = pd.read_csv(os.path.join(merged_dir, latest, "job_data.csv"), encoding="utf-8-sig")
+
+    start = time.perf_counter()
+    geocoder = Geocoder()
+    print(f"📚 Gazetteer: {len(geocoder.entries)} entries, {len(geocoder.index)} keys ({time.perf_counter() - start:.3f}s)")
+
+    start = time.perf_counter()
+    coords = geocoder.geocode_series(df["job_city"])
+    elapsed = time.perf_counter() - start
+    n_unique = df["job_city"].nunique()
+    print(f"📍 {coords['lat'].notna().mean():.1%} of {len(df)} rows resolved, "
+          f"{n_unique} distinct locations in {elapsed:.3f}s ({elapsed / max(n_unique, 1) * 1e6:.0f} µs / location)")
+    unresolved = df.loc[coords["lat"].isna(), "job_city"].value_counts()
+    if len(unresolved):
+        print("❔ Unresolved:", ", ".join(unresolved.index[:10]))
+
+
+if __name__ == "__main__":
+    main()
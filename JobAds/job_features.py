@@ -0,0 +1,245 @@
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+USD_TO_VND = 26088      # rate used for TopCV salaries quoted in USD
+
+# ========================
+# CONFIG — crawler salary rules (JobProcessor._process_salary)
+# "10 - 15 triệu", "Trên 1,000 USD", "Tới 20 triệu", "Thoả thuận"
+# ========================
+# A whitespace / zero-width-space separated token made only of digits and "," separators
+SALARY_TOKEN = r"(?<![^\s\u200b])(?=[\d,]*\d)([\d,]+)(?![^\s\u200b])"
+SALARY_TOKEN_RE = re.compile(SALARY_TOKEN)
+USD_TOKEN_RE = re.compile(r"(?<![^\s\u200b])usd(?![^\s\u200b])", flags=re.I)
+NEGOTIABLE = "Thoả thuận"
+
+# ========================
+# CONFIG — description features (build_job_v0.ipynb)
+# ========================
+SALARY_RE = re.compile(r"(\d+(?:[.,]\d+)?\s*(?:tỷ|triệu|vnđ|vnd|k|m|usd|\$))", flags=re.I)
+SALARY_NUM_RE = re.compile(r"(\d[\d\.,]*)")
+# Matched against the lowercased text, so no re.I (about twice as fast on long descriptions)
+REMOTE_RE = re.compile(r"remote|làm việc từ xa|work from home|wfh")
+EXPERIENCE_LEVELS = [   # checked in order, first match wins
+    ("senior", re.compile(r"senior|sr|trên 5 năm|5\+ năm|thâm niên")),
+    ("junior", re.compile(r"junior|fresh|mới tốt nghiệp|0-1 năm")),
+    ("mid", re.compile(r"mid|2-4 năm|trên 2 năm|3 năm")),
+]
+SKILLS = ["python", "java", "sql", "excel", "aws", "docker", "react", "node", "ml", "ai", "tensorflow", "pytorch"]
+SKILLS_RE = re.compile(r"\b(" + "|".join(SKILLS) + r")\b")
+
+
+# ---------- Crawler salary range ----------
+def _to_million_vnd(value, usd: bool):
+    if value is None:
+        return None
+    return int(value * USD_TO_VND / 10**6) if usd else value
+
+
+def salary_range(salary_str: str):
+    """
+    (min, max) salary in million VND of one TopCV salary string
+    (USD converted at USD_TO_VND), (None, None) when negotiable or unparsable.
+    """
+    salary_str = salary_str.strip()
+    if salary_str == NEGOTIABLE:
+        return None, None
+    values = [int(v.replace(",", "")) for v in SALARY_TOKEN_RE.findall(salary_str)]
+    usd = USD_TOKEN_RE.search(salary_str) is not None
+
+    min_salary, max_salary = None, None
+    if len(values) == 2:                                        # <min> - <max> <unit>
+        min_salary, max_salary = values
+    elif len(values) == 1 and salary_str.startswith("Trên"):    # Trên <min> <unit>
+        min_salary = values[0]
+    elif len(values) == 1 and salary_str.startswith("Tới"):     # Tới <max> <unit>
+        max_salary = values[0]
+    elif len(values) == 1:
+        min_salary = max_salary = values[0]
+    return _to_million_vnd(min_salary, usd), _to_million_vnd(max_salary, usd)
+
+
+def salary_ranges(salary_text: pd.Series):
+    """
+    salary_range over a Series of salary strings (e.g. job_data.csv salary_text).
+
+    Returns:
+        ranges [pd.DataFrame]: salary_min / salary_max (nullable Int64), aligned with the input.
+    """
+    # Salary strings repeat a lot ("Thoả thuận", "15 - 25 triệu"): parse each distinct one once
+    codes, uniques = pd.factorize(salary_text.fillna("").astype(str))
+    s = pd.Series(uniques).str.strip()
+    n_values = s.str.count(SALARY_TOKEN)
+    first = s.str.extract(SALARY_TOKEN, expand=False).str.replace(",", "", regex=False).astype(float)
+    last = s.str.extract(".*" + SALARY_TOKEN, expand=False).str.replace(",", "", regex=False).astype(float)
+    usd = s.str.contains(USD_TOKEN_RE)
+
+    one = (n_values == 1) & s.ne(NEGOTIABLE)
+    two = (n_values == 2) & s.ne(NEGOTIABLE)
+    above = one & s.str.startswith("Trên")
+    below = one & s.str.startswith("Tới") & ~above
+    min_salary = first.where(two | (one & ~below))
+    max_salary = last.where(two | (one & ~above))
+
+    ranges = pd.DataFrame({"salary_min": min_salary, "salary_max": max_salary})
+    ranges.loc[usd] = np.floor(ranges.loc[usd] * USD_TO_VND / 10**6)
+    ranges = ranges.astype("Int64").iloc[codes]
+    ranges.index = salary_text.index
+    return ranges
+
+
+# ---------- Description features ----------
+def salary_million(text: pd.Series):
+    """Vectorized extract_salary: first salary mention in million VND, NaN if none."""
+    match = text.str.extract(SALARY_RE, expand=False)
+    raw = match.str.extract(SALARY_NUM_RE, expand=False).str.replace(r"[.,]", "", regex=True)
+    value = pd.to_numeric(raw, errors="coerce")
+    # Unit checks are case-sensitive on the matched text, as in extract_salary
+    scale = np.select(
+        [match.str.contains("tỷ", regex=False) == True,
+         (match.str.contains("triệu", regex=False) | match.str.contains("m", regex=False)) == True,
+         match.str.contains("k", regex=False) == True],
+        [1000.0, 1.0, 0.001],
+        default=1.0,
+    )
+    return value * scale
+
+
+def _is_remote(lowered: pd.Series):
+    return lowered.str.contains(REMOTE_RE).astype(int)
+
+
+def _experience_level(lowered: pd.Series):
+    levels = pd.Series(None, index=lowered.index, dtype=object)
+    pending = lowered
+    for level, pattern in EXPERIENCE_LEVELS:
+        # Only rows without a higher level are searched again
+        hit = pending.str.contains(pattern)
+        levels[hit[hit].index] = level
+        pending = pending[~hit]
+    return levels
+
+
+def _skills_count(lowered: pd.Series):
+    """Distinct SKILLS mentioned (case-insensitive; as the notebook on description_clean)."""
+    return lowered.str.findall(SKILLS_RE).map(lambda found: len(set(found)))
+
+
+def extract_features(text: pd.Series):
+    """
+    Regex features of the FADAML job build over a whole column
+    (salary_million, is_remote, experience_level, skills_count).
+
+    Usage:
+        df = df.join(extract_features(df["description_clean"]))
+    """
+    text = text.fillna("").astype(str)
+    lowered = text.str.lower()
+    return pd.DataFrame({
+        "salary_million": salary_million(text),
+        "is_remote": _is_remote(lowered),
+        "experience_level": _experience_level(lowered),
+        "skills_count": _skills_count(lowered),
+    }, index=text.index)
+
+
+# ---------- Benchmark ----------
+def _legacy_process_salary(salary_str):
+    salary_str = salary_str.strip()
+    if salary_str == "Thoả thuận":
+        return None, None
+    salary_arr = re.split(r'[\s\u200b]+', salary_str)
+    salary_values = []
+    unit = "VND"
+    for item in salary_arr:
+        item = item.replace(",", "")
+        if item.isdigit():
+            salary_values.append(int(item))
+        elif item.upper() == "USD":
+            unit = "USD"
+    min_salary, max_salary = None, None
+    if len(salary_values) == 2:
+        min_salary, max_salary = salary_values[0], salary_values[1]
+    elif salary_str.startswith("Trên") and len(salary_values) == 1:
+        min_salary = salary_values[0]
+    elif salary_str.startswith("Tới") and len(salary_values) == 1:
+        max_salary = salary_values[0]
+    elif len(salary_values) == 1:
+        min_salary, max_salary = salary_values[0], salary_values[0]
+    if unit == "USD":
+        min_salary = int(min_salary * USD_TO_VND / 10**6) if min_salary is not None else None
+        max_salary = int(max_salary * USD_TO_VND / 10**6) if max_salary is not None else None
+    return min_salary, max_salary
+
+
+def _legacy_features(s):
+    m = re.search(r'(\d+(?:[.,]\d+)?\s*(?:tỷ|triệu|vnđ|vnd|k|m|usd|\$))', s, flags=re.I)
+    salary = np.nan
+    if m:
+        num = re.search(r'(\d[\d\.,]*)', m.group(1))
+        v = float(num.group(1).replace(',', '').replace('.', ''))
+        if 'tỷ' in m.group(1):
+            salary = v * 1000.0
+        elif 'triệu' in m.group(1) or 'm' in m.group(1):
+            salary = v
+        elif 'k' in m.group(1):
+            salary = v * 0.001
+        else:
+            salary = v
+    remote = int(bool(re.search(r'remote|làm việc từ xa|work from home|wfh', s, flags=re.I)))
+    if re.search(r'senior|sr|trên 5 năm|5\+ năm|thâm niên', s, flags=re.I):
+        level = 'senior'
+    elif re.search(r'junior|fresh|mới tốt nghiệp|0-1 năm', s, flags=re.I):
+        level = 'junior'
+    elif re.search(r'mid|2-4 năm|trên 2 năm|3 năm', s, flags=re.I):
+        level = 'mid'
+    else:
+        level = None
+    skills = re.findall(r'\b(python|java|sql|excel|aws|docker|react|node|ml|ai|tensorflow|pytorch)\b', s, flags=re.I)
+    return salary, remote, level, len(set(skills))
+
+
+def _bench(name, legacy, vectorized):
+    results = {}
+    for label, fn in [("per-row", legacy), ("vectorized", vectorized)]:
+        start = time.perf_counter()
+        results[label] = fn()
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<12} {elapsed:.3f}s")
+    pd.testing.assert_frame_equal(results["per-row"], results["vectorized"], check_dtype=False)
+    print(f"   ✅ {name}: output identical")
+
+
+def main(repeat: int = 20):
+    """Benchmark on the latest merged JobAds file (rows repeated `repeat` times)."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    merged_dir = os.path.join(base_dir, "merged_data")
+    latest = sorted(os.listdir(merged_dir))[-1]
+    df = pd.read_csv(os.path.join(merged_dir, latest, "job_data.csv"), encoding="utf-8-sig")
+
+    salary_text = pd.concat([df["salary_text"].fillna("")] * repeat, ignore_index=True)
+    print(f"💰 Salary ranges: {len(salary_text)} strings")
+    _bench(
+        "salary_ranges",
+        lambda: pd.DataFrame([_legacy_process_salary(s) for s in salary_text],
+                             columns=["salary_min", "salary_max"]).astype("Int64"),
+        lambda: salary_ranges(salary_text),
+    )
+
+    # description_clean as in build_job_v0.ipynb (clean_text lowercases)
+    text = pd.concat([df["jd"].fillna("").str.replace(r"\s+", " ", regex=True).str.lower()] * repeat, ignore_index=True)
+    print(f"📄 Description features: {len(text)} texts")
+    _bench(
+        "extract_features",
+        lambda: pd.DataFrame([_legacy_features(s) for s in text],
+                             columns=["salary_million", "is_remote", "experience_level", "skills_count"]),
+        lambda: extract_features(text),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from job_features import extract_features
+from ner_extraction import EntityExtractor
+from geocoder import Geocoder
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PREDICTOR_PATH = os.path.join(BASE_DIR, "Autogluon_FADAML_jobs")     # save_path of build_job_v0.ipynb
+DISTILLED_PATH = PREDICTOR_PATH + "_distilled"
+BATCH_SIZE = 256
+MAX_DELAY = 2.0         # seconds a record may wait for its micro-batch to fill
+THRESHOLD = 0.5
+
+# Model inputs, as `features` in build_job_v0.ipynb
+FEATURES = [
+    "description_clean", "salary_million", "company_extracted", "location_extracted",
+    "experience_level", "is_remote", "skills_count", "lat", "lon",
+]
+# Job description column of the input, first found wins (TopCV records use "jd")
+TEXT_COLUMNS = ["description", "raw_text", "text", "job_description", "jd"]
+N_TEXT_FEATURES = 2 ** 18
+N_CATEGORY_FEATURES = 2 ** 12
+
+
+def clean_text_series(text: pd.Series):
+    """Vectorized clean_text of the notebook: no html tags, collapsed whitespace, lowercase."""
+    return (text.fillna("").astype(str)
+            .str.replace(r"<.*?>", " ", regex=True)
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip()
+            .str.lower())
+
+
+def iter_records(paths: list[str]):
+    """Yield crawler records (dicts) from job_data*.csv / .json files, in file order."""
+    for path in paths:
+        if path.endswith(".json"):
+            df = pd.read_json(path, dtype={"job_id": str})
+        else:
+            df = pd.read_csv(path, encoding="utf-8-sig", dtype={"job_id": str})
+        yield from df.to_dict("records")
+
+
+class FeatureBuilder():
+    """
+    FADAML job features for a batch of crawler records, with the
+    extractors (NER cache / pool, gazetteer, compiled patterns) loaded once.
+
+    Company / location come from NER on every row by default, as the
+    notebook built them for the trained predictor; pass EntityExtractor()
+    to take the crawler fields first for a model trained that way.
+    """
+    def __init__(self, entities: EntityExtractor = None, geocoder: Geocoder = None):
+        self.entities = entities or EntityExtractor(use_fields=False)
+        self.geocoder = geocoder or Geocoder()
+
+    def build(self, records: pd.DataFrame):
+        """
+        Returns:
+            features [pd.DataFrame]: FEATURES columns, aligned with records.index.
+        """
+        text_col = next((c for c in TEXT_COLUMNS if c in records.columns), None)
+        if text_col is None:
+            raise ValueError(f"No job description column (expected one of {TEXT_COLUMNS})")
+
+        df = records.copy()
+        df["description_clean"] = clean_text_series(df[text_col])
+        for col, values in extract_features(df["description_clean"]).items():
+            df[col] = values
+        ents = self.entities.extract_frame(df, text_col="description_clean")
+        df["company_extracted"] = ents["company_extracted"]
+        df["location_extracted"] = ents["location_extracted"]
+        coords = self.geocoder.geocode_series(df["location_extracted"])
+        df["lat"], df["lon"] = coords["lat"], coords["lon"]
+        return df[FEATURES]
+
+
+# ---------- Distilled model ----------
+class DistilledScorer():
+    """
+    Linear student of the AutoGluon ensemble: logistic regression over
+    hashed description n-grams, hashed categorical values and a few scaled
+    numeric features. Hashing is stateless, so scoring a record is one
+    sparse dot product and nothing but the weights is stored.
+
+    It is fitted on the ensemble's probabilities: every row is used once
+    as positive with weight p and once as negative with weight 1 - p.
+
+    Usage:
+        student = DistilledScorer().fit(features, teacher_proba)
+        student.report = agreement_report(teacher_proba, student.predict_proba(holdout))
+        student.save()
+        proba = DistilledScorer.load().predict_proba(features)
+    """
+    def __init__(self, C: float = 4.0):
+        from sklearn.feature_extraction import FeatureHasher
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.C = C
+        self.text_hasher = HashingVectorizer(n_features=N_TEXT_FEATURES, ngram_range=(1, 2), alternate_sign=False)
+        self.category_hasher = FeatureHasher(n_features=N_CATEGORY_FEATURES, input_type="string", alternate_sign=False)
+        self.model = None
+        self.report = {}
+
+    def transform(self, features: pd.DataFrame):
+        text = self.text_hasher.transform(features["description_clean"].fillna(""))
+        categories = self.category_hasher.transform(
+            [f"company={c}", f"location={l}", f"experience={e}"]
+            for c, l, e in zip(features["company_extracted"], features["location_extracted"], features["experience_level"])
+        )
+        salary = features["salary_million"].astype(float)
+        numeric = np.column_stack([
+            np.log1p(salary.clip(lower=0).fillna(0)),
+            salary.isna(),
+            features["is_remote"].astype(float),
+            features["skills_count"].astype(float) / 10,
+            features["lat"].astype(float).fillna(0) / 90,
+            features["lon"].astype(float).fillna(0) / 180,
+            features["lat"].isna(),
+        ]).astype(np.float64)
+        return sparse.hstack([text, categories, sparse.csr_matrix(numeric)], format="csr")
+
+    def fit(self, features: pd.DataFrame, teacher_proba):
+        from sklearn.linear_model import LogisticRegression
+        X = self.transform(features)
+        p = np.clip(np.asarray(teacher_proba, dtype=float), 0, 1)
+        X2 = sparse.vstack([X, X], format="csr")
+        y2 = np.r_[np.ones(len(p)), np.zeros(len(p))]
+        w2 = np.r_[p, 1 - p]
+        self.model = LogisticRegression(C=self.C, solver="liblinear", max_iter=1000)
+        self.model.fit(X2, y2, sample_weight=w2)
+        return self
+
+    def predict_proba(self, features: pd.DataFrame):
+        """P(label = 1) for each row."""
+        return self.model.predict_proba(self.transform(features))[:, 1]
+
+    def save(self, path: str = DISTILLED_PATH):
+        import joblib
+        os.makedirs(path, exist_ok=True)
+        joblib.dump(self.model, os.path.join(path, "model.pkl"))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"C": self.C, "n_text_features": N_TEXT_FEATURES,
+                       "n_category_features": N_CATEGORY_FEATURES, "report": self.report}, f, indent=4)
+
+    @classmethod
+    def load(cls, path: str = DISTILLED_PATH):
+        import joblib
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        scorer = cls(C=meta["C"])
+        scorer.model = joblib.load(os.path.join(path, "model.pkl"))
+        scorer.report = meta.get("report", {})
+        return scorer
+
+
+def agreement_report(teacher_proba, student_proba, threshold: float = THRESHOLD):
+    """How closely the student follows the ensemble on the same records."""
+    from sklearn.metrics import cohen_kappa_score, roc_auc_score
+    teacher_proba = np.asarray(teacher_proba, dtype=float)
+    student_proba = np.asarray(student_proba, dtype=float)
+    teacher, student = teacher_proba >= threshold, student_proba >= threshold
+    report = {
+        "n": int(len(teacher)),
+        "agreement": float((teacher == student).mean()),
+        "cohen_kappa": float(cohen_kappa_score(teacher, student)),
+        "teacher_positive_rate": float(teacher.mean()),
+        "student_positive_rate": float(student.mean()),
+        "mean_abs_proba_diff": float(np.abs(teacher_proba - student_proba).mean()),
+    }
+    if 0 < teacher.sum() < len(teacher):
+        report["roc_auc_vs_teacher"] = float(roc_auc_score(teacher, student_proba))
+    return report
+
+
+# ---------- Scoring service ----------
+class JobScorer():
+    """
+    Scores newly crawled TopCV records with the FADAML predictor.
+
+    The predictor (or the distilled student) and the feature extractors are
+    loaded once and kept in memory; records are scored in micro-batches so
+    per-call overhead (pandas, AutoGluon preprocessing) is shared.
+
+    Usage:
+        scorer = JobScorer()                                # full AutoGluon ensemble
+        scorer = JobScorer(distilled=DistilledScorer.load())  # linear student only
+        scored = scorer.score(pd.read_csv("merged_data/2025-11-07/job_data.csv"))
+        for batch in scorer.score_stream(iter_records(paths)):
+            batch.to_csv(...)
+    """
+    def __init__(self,
+        predictor_path: str = PREDICTOR_PATH,
+        predictor=None,
+        distilled: DistilledScorer = None,
+        features: FeatureBuilder = None,
+        batch_size: int = BATCH_SIZE,
+        threshold: float = THRESHOLD
+    ):
+        """
+        Arguments:
+            predictor_path [str]: TabularPredictor directory (ignored when `distilled` is given).
+            predictor: Already loaded predictor with predict_proba.
+            distilled [DistilledScorer]: Score with the linear student instead of the ensemble.
+            features [FeatureBuilder]: Feature extraction with warm extractors.
+            batch_size [int]: Records per micro-batch in score_stream.
+            threshold [float]: Probability above which a job is labelled fake (1).
+        """
+        self.distilled = distilled
+        self.predictor = predictor
+        if self.predictor is None and distilled is None:
+            from autogluon.tabular import TabularPredictor
+            self.predictor = TabularPredictor.load(predictor_path)
+            # Keep the models in memory instead of reloading them from disk per call
+            persist = getattr(self.predictor, "persist", None) or getattr(self.predictor, "persist_models", None)
+            if persist:
+                persist()
+        self.features = features or FeatureBuilder()
+        self.batch_size = batch_size
+        self.threshold = threshold
+
+    def predict_proba(self, features: pd.DataFrame):
+        if self.distilled is not None:
+            return self.distilled.predict_proba(features)
+        proba = self.predictor.predict_proba(features)
+        if isinstance(proba, pd.DataFrame):
+            proba = proba[1] if 1 in proba.columns else proba.iloc[:, -1]
+        return np.asarray(proba, dtype=float)
+
+    def score(self, records: pd.DataFrame):
+        """
+        Returns:
+            scored [pd.DataFrame]: job_id (when present), fake_proba and label, aligned with records.
+        """
+        features = self.features.build(records)
+        proba = self.predict_proba(features)
+        scored = pd.DataFrame({"fake_proba": proba, "label": (proba >= self.threshold).astype(int)}, index=records.index)
+        if "job_id" in records.columns:
+            scored.insert(0, "job_id", records["job_id"])
+        return scored
+
+    def score_stream(self, records, batch_size: int = None, max_delay: float = MAX_DELAY):
+        """
+        Score an iterable of record dicts in micro-batches, yielding each
+        scored batch as soon as it is full or its oldest record has waited
+        `max_delay` seconds. Records are read by a background thread, so a
+        partial batch is flushed on time even while the source is idle
+        (e.g. a crawler between pages); errors of the source are re-raised.
+        """
+        batch_size = batch_size or self.batch_size
+        inbox = queue.Queue(maxsize=batch_size)
+
+        def read():
+            try:
+                for record in records:
+                    inbox.put(("record", record))
+            except Exception as e:
+                inbox.put(("error", e))
+            else:
+                inbox.put(("end", None))
+
+        threading.Thread(target=read, daemon=True).start()
+        batch, deadline = [], None
+        while True:
+            try:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                kind, value = inbox.get(timeout=timeout)
+            except queue.Empty:
+                # Idle source: the oldest record has waited max_delay
+                yield self.score(pd.DataFrame(batch))
+                batch, deadline = [], None
+                continue
+
+            if kind == "record":
+                if not batch:
+                    deadline = time.monotonic() + max_delay
+                batch.append(value)
+                if len(batch) >= batch_size or time.monotonic() >= deadline:
+                    yield self.score(pd.DataFrame(batch))
+                    batch, deadline = [], None
+                continue
+            if batch:
+                yield self.score(pd.DataFrame(batch))
+            if kind == "error":
+                raise value
+            return
+
+
+def distill(scorer: JobScorer, records: pd.DataFrame, holdout: float = 0.2, random_state: int = 42):
+    """
+    Fit a DistilledScorer on the ensemble's probabilities over `records`
+    and report its agreement with the ensemble on a held-out share.
+    `ms_per_record` times the whole scoring path of the held-out records
+    (FeatureBuilder + student), with warm extractors.
+    """
+    records = records.reset_index(drop=True)
+    features = scorer.features.build(records)
+    teacher = scorer.predict_proba(features)
+    order = np.random.default_rng(random_state).permutation(len(features))
+    n_test = int(len(order) * holdout)
+    test, train = order[:n_test], order[n_test:]
+
+    student = DistilledScorer().fit(features.iloc[train], teacher[train])
+    start = time.perf_counter()
+    student_proba = student.predict_proba(scorer.features.build(records.iloc[test]))
+    elapsed = time.perf_counter() - start
+    student.report = agreement_report(teacher[test], student_proba, scorer.threshold)
+    student.report["ms_per_record"] = elapsed / max(len(test), 1) * 1000
+    return student
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score crawled TopCV job records with the FADAML model.")
+    parser.add_argument("paths", nargs="+", help="job_data*.csv / .json files from the crawler")
+    parser.add_argument("--output", default=None, help="Scored CSV (default: <first input>_scored.csv)")
+    parser.add_argument("--distilled", action="store_true", help="Score with the distilled linear model")
+    parser.add_argument("--distill", action="store_true", help="Fit the distilled model on these records and save it")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    distilled = DistilledScorer.load() if args.distilled else None
+    scorer = JobScorer(distilled=distilled, batch_size=args.batch_size)
+    print(f"🚀 Scorer ready ({'distilled' if distilled else 'AutoGluon'}) in {time.perf_counter() - start:.1f}s")
+
+    if args.distill:
+        records = pd.DataFrame(list(iter_records(args.paths)))
+        student = distill(scorer, records)
+        student.save()
+        print(f"🧪 Distilled model saved -> {DISTILLED_PATH}")
+        print(json.dumps(student.report, indent=4))
+        return
+
+    output = args.output or os.path.splitext(args.paths[0])[0] + "_scored.csv"
+    n, start = 0, time.perf_counter()
+    for i, batch in enumerate(scorer.score_stream(iter_records(args.paths))):
+        batch.to_csv(output, mode="w" if i == 0 else "a", header=i == 0, index=False, encoding="utf-8-sig")
+        n += len(batch)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {n} jobs in {elapsed:.2f}s ({elapsed / max(n, 1) * 1000:.2f} ms / job) -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import hashlib
+import importlib.util
+import sqlite3
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "_cache", "ner_cache.sqlite")
+BATCH_SIZE = 64
+# Structured crawler fields answering the NER question, in order of preference
+COMPANY_FIELDS = ["company", "company_name"]
+LOCATION_FIELDS = ["job_city", "location"]
+
+
+def normalize_text(text):
+    """NFC + collapsed whitespace: the form used for cache keys."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text):
+    return hashlib.sha1(("ner:" + normalize_text(text)).encode("utf-8")).hexdigest()
+
+
+def ner_entities(text):
+    """
+    extract_company_location_experience (build_job_v0.ipynb) without the
+    experience heuristic: ORG tokens joined -> company, LOC tokens -> location.
+    (None, None) when underthesea is not installed, as the notebook's
+    `ner = None` fallback.
+
+    Note: the notebook's `for token, label in res` raised on underthesea's
+    4-tuples, so its company / location were always None; these are real.
+
+    Returns:
+        (company, location) [tuple[str | None, str | None]]
+    """
+    try:
+        from underthesea import ner
+    except ImportError:
+        return None, None
+    try:
+        res = ner(text)
+    except Exception:
+        return None, None
+    # Tuples are (token, ..., label) with B-/I- prefixed labels
+    orgs = [item[0] for item in res if item[-1].endswith("ORG")]
+    locs = [item[0] for item in res if item[-1].endswith("LOC")]
+    return (" ".join(orgs) if orgs else None), (" ".join(locs) if locs else None)
+
+
+# -- Process-pool worker --
+def _warm_up():
+    # Load the NER model once per worker instead of on the first real row
+    ner_entities("Công ty ABC tại Hà Nội")
+
+
+def _ner_batch(texts):
+    return [ner_entities(t) for t in texts]
+
+
+class NERCache():
+    """
+    Persistent text-hash -> [company, location] store (SQLite, one file).
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS entities (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get_many(self, keys: list[str]):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 900):   # SQLite parameter limit
+            chunk = unique[i:i + 900]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM entities WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((key, tuple(json.loads(value))) for key, value in rows)
+        return found
+
+    def put_many(self, items: dict):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entities VALUES (?, ?)",
+            ((key, json.dumps(list(value), ensure_ascii=False)) for key, value in items.items())
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _first_filled(df: pd.DataFrame, fields: list[str]):
+    """Row-wise first non-empty value over the fields present in df (None if none)."""
+    result = pd.Series(None, index=df.index, dtype=object)
+    for field in fields:
+        if field in df.columns:
+            values = df[field].where(df[field].astype(str).str.strip().ne("") & df[field].notna())
+            result = result.fillna(values.astype(object).str.strip())
+    return result.where(result.notna(), None)
+
+
+class EntityExtractor():
+    """
+    Company / location features for the FADAML job build
+    (company_extracted, location_extracted).
+
+    - Fast path: the crawler already scrapes the employer (`company`,
+      `company_name`) and the workplace (`job_city`, `location`); when a row
+      has them, they are used as is and the model is not called.
+    - Only rows still missing one of the two go through underthesea NER.
+      Descriptions are keyed by text hash, so a description is tagged once
+      across runs; new ones are sent in batches to a process pool whose
+      workers load the model once at start-up.
+    - Model output only fills the missing side, structured fields win.
+
+    Usage:
+        extractor = EntityExtractor()
+        ents = extractor.extract_frame(df, text_col="description_clean")
+        df["company_extracted"] = ents["company_extracted"]
+        df["location_extracted"] = ents["location_extracted"]
+    """
+    def __init__(self,
+        cache: NERCache = None,
+        n_jobs: int = None,
+        batch_size: int = BATCH_SIZE,
+        use_fields: bool = True
+    ):
+        """
+        Arguments:
+            cache [NERCache]: Persistent cache (default file under data/_cache/).
+            n_jobs [int]: Worker processes (os.cpu_count() if None, 1 = in-process).
+            batch_size [int]: Texts per worker task.
+            use_fields [bool]: Take the crawler fields when present (False = NER on every row, as the notebook).
+        """
+        self.cache = cache or NERCache()
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.use_fields = use_fields
+
+    def entities(self, texts: list[str]):
+        """
+        Returns:
+            entities [list[tuple]]: (company, location) from NER for each text, in order.
+        """
+        texts = ["" if not isinstance(t, str) else t for t in texts]
+        keys = [text_key(t) for t in texts]
+        cached = self.cache.get_many(keys)
+
+        # Tag each missing text once, even if it appears many times
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            print(f"🏷️ NER {len(missing)} / {len(texts)} texts (còn lại lấy từ cache)")
+            results = self._run(list(missing.values()))
+            computed = dict(zip(missing.keys(), results))
+            if importlib.util.find_spec("underthesea") is not None:
+                # Results without the model are placeholders, not worth keeping
+                self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def extract_frame(self, df: pd.DataFrame, text_col: str = "description_clean"):
+        """
+        Returns:
+            entities [pd.DataFrame]: company_extracted, location_extracted and
+                ner_used (whether the model was needed), aligned with df.index.
+        """
+        if self.use_fields:
+            company = _first_filled(df, COMPANY_FIELDS)
+            location = _first_filled(df, LOCATION_FIELDS)
+        else:
+            company = pd.Series(None, index=df.index, dtype=object)
+            location = pd.Series(None, index=df.index, dtype=object)
+
+        need_ner = company.isna() | location.isna()
+        if need_ner.any():
+            found = self.entities(df.loc[need_ner, text_col].tolist())
+            found = pd.DataFrame(found, index=df.index[need_ner], columns=["company", "location"], dtype=object)
+            company = company.fillna(found["company"])
+            location = location.fillna(found["location"])
+
+        return pd.DataFrame({
+            "company_extracted": company.where(company.notna(), None),
+            "location_extracted": location.where(location.notna(), None),
+            "ner_used": need_ner,
+        }, index=df.index)
+
+    def _run(self, texts: list[str]):
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self.n_jobs == 1 or len(batches) == 1:
+            _warm_up()
+            results = [_ner_batch(batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_warm_up) as pool:
+                results = list(pool.map(_ner_batch, batches))
+        return [ents for batch in results for ents in batch]
+
+
+def main():
+    """Company / location features of the latest merged JobAds file, timing the fast path."""
+    merged_dir = os.path.join(BASE_DIR, "merged_data")
+    latest = sorted(os.listdir(merged_dir))[-1]
+    df = pd.read_csv(os.path.join(merged_dir, latest, "job_data.csv"), encoding="utf-8-sig")
+
+    start = time.perf_counter()
+    ents = EntityExtractor().extract_frame(df, text_col="jd")
+    print(f"🏢 {len(df)} jobs in {time.perf_counter() - start:.2f}s, "
+          f"NER needed for {int(ents['ner_used'].sum())} ({ents['ner_used'].mean():.1%})")
+    print(ents.head(10).to_string())
+
+
+if __name__ == "__main__":
+    main()
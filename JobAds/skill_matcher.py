@@ -0,0 +1,171 @@
+import os
+import re
+import csv
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from unidecode import unidecode
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_PATH = os.path.join(BASE_DIR, "skill_taxonomy.csv")
+# Words, keeping the "+" / "#" of C++ / C# and a leading "." of .NET / .js
+TOKEN_RE = re.compile(r"\.?\w+[+#]*")
+_END = ""       # trie key marking the end of an alias (never a token)
+
+
+class SkillMatcher():
+    """
+    Dictionary matcher for a skill taxonomy, one left-to-right pass per document.
+
+    Aliases are tokenized like the documents and stored in a token trie, so
+    matches always fall on word boundaries ("ml" never hits "html", "java"
+    never hits "javascript"). At each position the longest alias wins
+    ("react native" over "react", "asp.net core" over ".net"), and matching
+    resumes after it, so overlapping aliases are counted once.
+
+    Tokens are compared case-insensitively ("Học Máy" = "học máy").
+    Vietnamese aliases of two or more words also match without diacritics
+    ("hoc may"); single syllables do not, since their folded forms collide
+    ("nhúng" / "nhưng"). Aliases in the taxonomy's exact_aliases column
+    ("AI", "BA", "QA") must also match the original case, as their
+    lowercase forms are ordinary Vietnamese words.
+
+    Taxonomy CSV columns: skill_id, name, category, aliases, exact_aliases
+    ("|"-separated). Any taxonomy in this format can be loaded.
+
+    Usage:
+        matcher = SkillMatcher()
+        matcher.match("Thành thạo Python, ReactJS; ưu tiên biết học máy")
+        # {"python": 1, "react": 1, "machine_learning": 1}
+        X = matcher.transform(df["jd"]) + matcher.transform(df["tags"])     # CSR (n_jobs, n_skills)
+        skills = pd.DataFrame.sparse.from_spmatrix(X, columns=matcher.skill_ids)
+    """
+    def __init__(self, taxonomy_path: str = TAXONOMY_PATH):
+        self.skill_ids, self.names, self.categories = [], [], []
+        self.trie = {}
+        self._fold_cache = {}
+        with open(taxonomy_path, "r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                index = len(self.skill_ids)
+                self.skill_ids.append(row["skill_id"])
+                self.names.append(row["name"])
+                self.categories.append(row.get("category"))
+                for alias in (row.get("aliases") or "").split("|"):
+                    self._add(alias, index, exact=False)
+                for alias in (row.get("exact_aliases") or "").split("|"):
+                    self._add(alias, index, exact=True)
+        self.index = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+
+    def __len__(self):
+        return len(self.skill_ids)
+
+    def _fold(self, token: str):
+        folded = self._fold_cache.get(token)
+        if folded is None:
+            folded = unicodedata.normalize("NFC", token.lower())
+            self._fold_cache[token] = folded
+        return folded
+
+    def _add(self, alias: str, index: int, exact: bool):
+        tokens = TOKEN_RE.findall(alias.strip())
+        if not tokens:
+            return
+        self._insert(tokens, index, exact)
+        # Unaccented spelling of multi-word Vietnamese aliases ("hoc may")
+        plain = [unidecode(t) for t in tokens]
+        if len(tokens) > 1 and plain != tokens:
+            self._insert(plain, index, exact)
+
+    def _insert(self, tokens: list[str], index: int, exact: bool):
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(self._fold(token), {})
+        # First skill in file order wins when two skills share an alias
+        node.setdefault(_END, []).append((index, tuple(tokens) if exact else None))
+
+    def match_indices(self, text):
+        """Skill indices of every (non-overlapping) match in text, in order."""
+        if not isinstance(text, str) or not text:
+            return []
+        tokens = TOKEN_RE.findall(text)
+        folded = [self._fold(t) for t in tokens]
+        n, i, found = len(tokens), 0, []
+        while i < n:
+            node, j, best = self.trie, i, None
+            while j < n:
+                node = node.get(folded[j])
+                if node is None:
+                    break
+                j += 1
+                for index, exact in node.get(_END, ()):
+                    if exact is None or exact == tuple(tokens[i:j]):
+                        best = (index, j)
+                        break
+            if best is None:
+                i += 1
+            else:
+                found.append(best[0])
+                i = best[1]
+        return found
+
+    def match(self, text):
+        """
+        Returns:
+            counts [dict]: skill_id -> number of mentions, in order of first mention.
+        """
+        counts = {}
+        for index in self.match_indices(text):
+            skill_id = self.skill_ids[index]
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+        return counts
+
+    def transform(self, texts):
+        """
+        Returns:
+            X [sparse.csr_matrix]: (len(texts), len(self)) int32 mention counts,
+                columns in `skill_ids` order.
+        """
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(self.match_indices(text))
+            indptr.append(len(indices))
+        X = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self)),
+        )
+        X.sum_duplicates()      # repeated mentions -> counts
+        return X
+
+    def skill_lists(self, X: sparse.csr_matrix):
+        """Matched skill_ids of each row of a transform() matrix."""
+        ids = np.asarray(self.skill_ids, dtype=object)
+        return [ids[X.indices[X.indptr[r]:X.indptr[r + 1]]].tolist() for r in range(X.shape[0])]
+
+
+def main():
+    """Skill matrix of the latest merged JobAds file (jd + listing tags)."""
+    merged_dir = os.path.join(BASE_DIR, "merged_data")
+    latest = sorted(os.listdir(merged_dir))[-1]
+    df = pd.read_csv(os.path.join(merged_dir, latest, "job_data.csv"), encoding="utf-8-sig")
+
+    start = time.perf_counter()
+    matcher = SkillMatcher()
+    print(f"📚 Taxonomy: {len(matcher)} skills ({time.perf_counter() - start:.3f}s)")
+
+    start = time.perf_counter()
+    X = matcher.transform(df["jd"]) + matcher.transform(df["tags"])
+    elapsed = time.perf_counter() - start
+    print(f"🧩 {X.shape[0]} jobs x {X.shape[1]} skills, {X.nnz} non-zeros in {elapsed:.2f}s "
+          f"({X.shape[0] / elapsed:,.0f} jobs/s)")
+    print(f"   skills per job: {np.diff(X.indptr).mean():.1f} (mean)")
+
+    doc_freq = np.asarray((X > 0).sum(axis=0)).ravel()
+    top = doc_freq.argsort()[::-1][:15]
+    print("🔝 " + ", ".join(f"{matcher.skill_ids[i]} ({doc_freq[i]})" for i in top))
+
+
+if __name__ == "__main__":
+    main()
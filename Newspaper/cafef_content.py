@@ -0,0 +1,176 @@
+import os
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cafef_listing import HEADERS, CafefListingFetcher
+
+# ===================== CẤU HÌNH =====================
+MAX_WORKERS = 16        # số luồng tải nội dung
+PER_HOST_LIMIT = 8      # số request đồng thời tối đa tới cùng một host
+MAX_RETRIES = 3
+OUTPUT_COLUMNS = ["category", "title", "link", "description", "time_posted", "crawl_date", "content"]
+# ===================================================
+
+
+def extract_content(html: str):
+    """Article body exactly as the notebook crawler: `div.detail-content p` joined by spaces."""
+    soup = BeautifulSoup(html, "html.parser")
+    return " ".join([p.text.strip() for p in soup.select("div.detail-content p")])
+
+
+def build_session(pool_size: int = MAX_WORKERS, max_retries: int = MAX_RETRIES):
+    """
+    Session with a connection pool sized for the worker threads and
+    retries with backoff on connection errors, 429 and 5xx.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CsvResultWriter():
+    """
+    Append rows to a CSV file as soon as they are ready.
+    Thread-safe; the header is written once when the file is new.
+    """
+    def __init__(self, filepath: str, fieldnames: list[str] = OUTPUT_COLUMNS):
+        self.filepath = filepath
+        self.fieldnames = fieldnames
+        self._lock = threading.Lock()
+        is_new = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+        self._file = open(filepath, "a", newline="", encoding="utf-8-sig" if is_new else "utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction="ignore")
+        if is_new:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def __call__(self, item: dict):
+        with self._lock:
+            self._writer.writerow(item)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArticleContentFetcher():
+    """
+    Concurrent article-body stage of the CafeF crawler. Replaces the
+    sequential `requests.get` + `time.sleep(0.5)` loop: threads share one
+    pooled session, concurrent requests per host are capped by a semaphore
+    and failed requests are retried with backoff by the session adapter.
+
+    Usage:
+        fetcher = ArticleContentFetcher()
+        with CsvResultWriter("cafef_full_data_2.csv") as writer:
+            fetcher.fetch_all(all_data, on_result=writer)
+    """
+    def __init__(self,
+        session: requests.Session = None,
+        max_workers: int = MAX_WORKERS,
+        per_host_limit: int = PER_HOST_LIMIT,
+        timeout: int = 10
+    ):
+        """
+        Arguments:
+            session [requests.Session]: Shared session (build_session() if None).
+            max_workers [int]: Number of worker threads.
+            per_host_limit [int]: Max in-flight requests per host.
+            timeout [int]: Request timeout in seconds.
+        """
+        self.session = session or build_session(max_workers)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._host_slots = {}
+        self._slots_lock = threading.Lock()
+
+    def fetch_one(self, item: dict):
+        """
+        Fill item["content"] in place ("" on failure, like the notebook) and
+        item["fetch_error"]: None when the page was downloaded, even if it has
+        no text body (video / photo articles), else the error message.
+        """
+        try:
+            with self._host_slot(item["link"]):
+                response = self.session.get(item["link"], timeout=self.timeout)
+            response.raise_for_status()
+            item["content"] = extract_content(response.text)
+            item["fetch_error"] = None
+        except Exception as e:
+            item["content"] = ""
+            item["fetch_error"] = str(e)
+            print(f"Lỗi tải nội dung: {e}")
+        return item
+
+    def fetch_all(self, items: list[dict], on_result=None):
+        """
+        Fetch bodies for every item concurrently.
+
+        Arguments:
+            items [list[dict]]: Listing rows with a "link" key (updated in place).
+            on_result [callable]: Called with each finished item, in completion order.
+
+        Returns:
+            items [list[dict]]: The same list, in input order.
+        """
+        if not items:
+            return items
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.fetch_one, item) for item in items]
+            for done, future in enumerate(as_completed(futures), 1):
+                item = future.result()
+                if on_result:
+                    on_result(item)
+                if done % 50 == 0 or done == len(items):
+                    print(f"   {done}/{len(items)} bài đã tải")
+        return items
+
+    def _host_slot(self, url: str):
+        host = urlparse(url).netloc
+        with self._slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+
+def main():
+    session = build_session()
+    all_data = CafefListingFetcher(session=session).fetch_all()
+    print(f"\n✅ Tổng số bài thu được: {len(all_data)}")
+
+    print("\n🧠 Đang tải nội dung chi tiết từng bài...")
+    output_path = "cafef_full_data_2.csv"
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    with CsvResultWriter(output_path) as writer:
+        ArticleContentFetcher(session=session).fetch_all(all_data, on_result=writer)
+
+    print("\n🎯 Crawl hoàn tất!")
+    print(f"📁 File lưu tại: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
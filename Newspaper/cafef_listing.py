@@ -0,0 +1,213 @@
+import os
+import re
+from datetime import datetime
+from urllib.parse import urljoin
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
+
+# ===================== CẤU HÌNH =====================
+BASE_URL = "https://cafef.vn"
+CATEGORIES = {
+    "doanh-nghiep": "https://cafef.vn/doanh-nghiep.chn",
+    "thi-truong": "https://cafef.vn/thi-truong.chn",
+    "chung-khoan": "https://cafef.vn/chung-khoan.chn",
+    "bat-dong-san": "https://cafef.vn/bat-dong-san.chn",
+}
+# Zone ids used by the "Xem thêm" timeline endpoint. Discovered from the
+# category page when missing here.
+ZONE_IDS = {
+    "chung-khoan": 18831,
+    "bat-dong-san": 18835,
+    "doanh-nghiep": 18836,
+    "thi-truong": 18839,
+}
+TIMELINE_URL = "https://cafef.vn/timelinelist/{zone_id}/{page}.chn"
+MAX_LOAD_MORE = 10   # số trang timeline tải thêm (tương đương số lần scroll)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0 Safari/537.36"
+}
+# ===================================================
+
+ZONE_ID_RE = re.compile(r"timelinelist/(\d+)|zone_?id\W{1,4}(\d+)", flags=re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+BLOCK_TAGS = {"div", "p", "br", "li", "ul", "h1", "h2", "h3", "h4", "section"}
+
+
+def _visible_text(tag: Tag):
+    """
+    Approximate WebElement.text: block-level children are separated by
+    newlines, whitespace inside a line is collapsed.
+    """
+    parts = []
+    for node in tag.descendants:
+        if isinstance(node, NavigableString):
+            if node.parent.name in ("script", "style"):
+                continue
+            # Source newlines are plain whitespace, only block tags break lines
+            parts.append(WHITESPACE_RE.sub(" ", str(node)))
+        elif isinstance(node, Tag) and node.name in BLOCK_TAGS:
+            parts.append("\n")
+    lines = [" ".join(line.split()) for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def parse_timeline(html: str, category: str, crawl_date: str, base_url: str = BASE_URL):
+    """
+    Parse `div.tlitem` entries of a CafeF category page or timeline fragment.
+
+    Arguments:
+        html [str]: Page or fragment HTML.
+        category [str]: Category name stored on every row.
+        crawl_date [str]: Crawl timestamp stored on every row.
+
+    Returns:
+        articles [list[dict]]: Same fields as the Selenium crawler
+            (category, title, link, description, time_posted, crawl_date).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    articles = []
+    for item in soup.select("div.tlitem"):
+        title_elem = item.select_one("h3 a")
+        if not title_elem or not title_elem.get("href"):
+            continue
+
+        desc_elem = item.select_one("h3 + div")
+        time_elem = item.select_one(".pdate")
+
+        articles.append({
+            "category": category,
+            "title": _visible_text(title_elem),
+            "link": urljoin(base_url, title_elem["href"]),
+            "description": _visible_text(desc_elem) if desc_elem else "",
+            "time_posted": _visible_text(time_elem) if time_elem else "",
+            "crawl_date": crawl_date
+        })
+    return articles
+
+
+class CafefListingFetcher():
+    """
+    Fetch CafeF category timelines over plain HTTP (no browser).
+    Page 1 is the category page itself, following pages come from the
+    timeline endpoint that the "Xem thêm" / infinite scroll calls.
+
+    Usage:
+        fetcher = CafefListingFetcher()
+        articles = fetcher.fetch_category("chung-khoan", CATEGORIES["chung-khoan"])
+    """
+    def __init__(self,
+        session: requests.Session = None,
+        fetch=None,
+        max_load_more: int = MAX_LOAD_MORE,
+        timeout: int = 10
+    ):
+        """
+        Arguments:
+            session [requests.Session]: Shared HTTP session (created if None).
+            fetch [callable]: Optional url -> html function, overrides HTTP
+                (used to replay saved fixture pages).
+            max_load_more [int]: Number of timeline pages after page 1.
+            timeout [int]: Request timeout in seconds.
+        """
+        self.session = session or requests.Session()
+        self.session.headers.update(HEADERS)
+        self.fetch = fetch or self._http_get
+        self.max_load_more = max_load_more
+        self.timeout = timeout
+
+    @classmethod
+    def from_fixtures(cls, fixture_dir: str, **kwargs):
+        """
+        Build a fetcher that reads saved pages from fixture_dir instead of
+        the network. A URL is mapped to its path with "/" replaced by "_",
+        e.g. chung-khoan.chn or timelinelist_18831_2.chn.
+        """
+        def fetch(url):
+            name = url.split("://", 1)[-1].split("/", 1)[-1].replace("/", "_")
+            with open(os.path.join(fixture_dir, name), "r", encoding="utf-8") as f:
+                return f.read()
+        return cls(fetch=fetch, **kwargs)
+
+    def fetch_category(self, category: str, url: str, crawl_date: str = None):
+        """
+        Collect articles of one category, stopping early on an empty page.
+
+        Returns:
+            articles [list[dict]]: Deduplicated by link, in page order.
+        """
+        crawl_date = crawl_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        articles, seen = [], set()
+        for html in self.iter_pages(category, url):
+            page_items = parse_timeline(html, category, crawl_date)
+            if not page_items:
+                break
+            for item in page_items:
+                if item["link"] not in seen:
+                    seen.add(item["link"])
+                    articles.append(item)
+        return articles
+
+    def iter_pages(self, category: str, url: str):
+        """Yield raw HTML of the category page, then its timeline pages."""
+        try:
+            html = self.fetch(url)
+        except Exception as e:
+            print(f"Lỗi tải {url}: {e}")
+            return
+        yield html
+
+        zone_id = ZONE_IDS.get(category) or self._find_zone_id(html)
+        if not zone_id:
+            print(f"⚠️ Không tìm thấy zone id cho {category}, chỉ lấy trang đầu.")
+            return
+
+        # Page 1 of the timeline duplicates the category page
+        for page in range(2, self.max_load_more + 2):
+            page_url = TIMELINE_URL.format(zone_id=zone_id, page=page)
+            try:
+                yield self.fetch(page_url)
+            except Exception as e:
+                print(f"Lỗi tải {page_url}: {e}")
+                return
+
+    def fetch_all(self, categories: dict = CATEGORIES, crawl_date: str = None):
+        """Collect articles of every category into one list."""
+        crawl_date = crawl_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        all_data = []
+        for cat_name, url in categories.items():
+            print(f"\n📰 Đang crawl chuyên mục: {cat_name}")
+            items = self.fetch_category(cat_name, url, crawl_date)
+            print(f"   {len(items)} bài")
+            all_data.extend(items)
+        return all_data
+
+    def _http_get(self, url: str):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def _find_zone_id(html: str):
+        m = ZONE_ID_RE.search(html)
+        if not m:
+            return None
+        return int(m.group(1) or m.group(2))
+
+
+def main():
+    all_data = CafefListingFetcher().fetch_all()
+    print(f"\n✅ Tổng số bài thu được: {len(all_data)}")
+
+    output_path = "cafef_listing.csv"
+    df = pd.DataFrame(all_data)
+    df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    print(f"📁 File lưu tại: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
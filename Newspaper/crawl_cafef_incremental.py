@@ -0,0 +1,228 @@
+import os
+import json
+from datetime import datetime
+
+import pandas as pd
+
+from cafef_listing import CATEGORIES, CafefListingFetcher, parse_timeline
+from cafef_content import ArticleContentFetcher, CsvResultWriter, build_session
+
+# ===================== CẤU HÌNH =====================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(BASE_DIR, "data", "_index")
+KNOWN_RUN_TO_STOP = 3   # dừng phân trang khi gặp liên tiếp N bài đã biết
+MAX_ATTEMPTS = 5        # số lần tải lại tối đa cho một bài lỗi
+LATEST_PATH = os.path.join(BASE_DIR, "cafef_latest_news.csv")
+TIME_FORMATS = ["%d/%m/%Y %H:%M", "%d/%m/%Y - %H:%M", "%Y-%m-%dT%H:%M:%S", "%d/%m/%Y"]
+# ===================================================
+
+
+def parse_time_posted(value: str):
+    """Parse a `.pdate` string; None when empty or in an unknown format."""
+    value = (value or "").strip()
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class NewsIndex():
+    """
+    Persistent state of the incremental crawl:
+        - seen_links.txt: every article link already stored (append-only)
+        - watermarks.json: newest time_posted per category
+        - retry.json: listing rows whose body download failed, with their
+          attempt count; they are re-queued on every run (even once older
+          than the watermark) until stored or MAX_ATTEMPTS is reached
+    """
+    def __init__(self, index_dir: str = INDEX_DIR):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self.links_path = os.path.join(index_dir, "seen_links.txt")
+        self.watermarks_path = os.path.join(index_dir, "watermarks.json")
+        self.retry_path = os.path.join(index_dir, "retry.json")
+
+        self.links = set()
+        if os.path.exists(self.links_path):
+            with open(self.links_path, "r", encoding="utf-8") as f:
+                self.links = {line.strip() for line in f if line.strip()}
+
+        self.watermarks = {}
+        if os.path.exists(self.watermarks_path):
+            with open(self.watermarks_path, "r", encoding="utf-8") as f:
+                self.watermarks = json.load(f)
+
+        self.retry = {}     # link -> {"item": listing row, "attempts": n}
+        if os.path.exists(self.retry_path):
+            with open(self.retry_path, "r", encoding="utf-8") as f:
+                self.retry = json.load(f)
+
+    def seed_from_csv(self, filepath: str):
+        """Mark links of an existing full crawl (e.g. cafef_full_data_2.csv) as seen."""
+        df = pd.read_csv(filepath, encoding="utf-8-sig")
+        self.add(df.fillna("").to_dict("records"))
+
+    def is_known(self, item: dict):
+        if item["link"] in self.links:
+            return True
+        watermark = self.watermark(item["category"])
+        posted = parse_time_posted(item.get("time_posted"))
+        return bool(watermark and posted and posted < watermark)
+
+    def watermark(self, category: str):
+        value = self.watermarks.get(category)
+        return datetime.fromisoformat(value) if value else None
+
+    def add(self, items: list[dict], advance: bool = True):
+        """
+        Record links (and drop them from the retry list), then persist.
+        Watermarks only move when `advance`: during a run rows are marked as
+        they are written and the watermarks advance once the run is done, so
+        a crash never skips articles that were listed but not fetched yet.
+        """
+        new_links = [item["link"] for item in items if item["link"] not in self.links]
+        if new_links:
+            with open(self.links_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(new_links) + "\n")
+            self.links.update(new_links)
+
+        if advance:
+            for item in items:
+                posted = parse_time_posted(item.get("time_posted"))
+                current = self.watermark(item["category"])
+                if posted and (current is None or posted > current):
+                    self.watermarks[item["category"]] = posted.isoformat()
+
+            with open(self.watermarks_path, "w", encoding="utf-8") as f:
+                json.dump(self.watermarks, f, ensure_ascii=False, indent=4)
+
+        if any(item["link"] in self.retry for item in items):
+            for item in items:
+                self.retry.pop(item["link"], None)
+            self._save_retry()
+
+    def retries(self, category: str):
+        """Listing rows of a category waiting for another download attempt."""
+        return [entry["item"] for entry in self.retry.values()
+                if entry["item"]["category"] == category and entry["item"]["link"] not in self.links]
+
+    def add_failed(self, items: list[dict], max_attempts: int = MAX_ATTEMPTS):
+        """Queue failed rows for the next run; rows failing max_attempts times are dropped."""
+        for item in items:
+            row = {k: v for k, v in item.items() if k not in ("content", "fetch_error")}
+            entry = self.retry.get(item["link"]) or {"item": row, "attempts": 0}
+            entry["attempts"] += 1
+            if entry["attempts"] >= max_attempts:
+                print(f"⚠️ Bỏ qua sau {entry['attempts']} lần lỗi: {item['link']}")
+                self.retry.pop(item["link"], None)
+            else:
+                self.retry[item["link"]] = entry
+        self._save_retry()
+
+    def _save_retry(self):
+        with open(self.retry_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.retry, f, ensure_ascii=False, indent=4)
+        os.replace(self.retry_path + ".tmp", self.retry_path)
+
+
+class IncrementalNewsCrawler():
+    """
+    Incremental CafeF crawl: timeline pages are read newest-first and
+    paging stops as soon as already indexed articles are reached; bodies
+    are fetched only for new links and appended to data/YYYY-MM-DD/.
+    Each article is marked in the index as soon as its row is written, so
+    a crashed run does not write it again. Articles whose download failed
+    are kept in the index's retry list and fetched again on the next runs;
+    pages without a text body (video / photo articles) are stored as is.
+
+    Usage:
+        new_items = IncrementalNewsCrawler().run()
+    """
+    def __init__(self,
+        index: NewsIndex = None,
+        listing: CafefListingFetcher = None,
+        content: ArticleContentFetcher = None,
+        known_run_to_stop: int = KNOWN_RUN_TO_STOP
+    ):
+        session = build_session() if listing is None or content is None else None
+        self.index = index or NewsIndex()
+        self.listing = listing or CafefListingFetcher(session=session)
+        self.content = content or ArticleContentFetcher(session=session)
+        self.known_run_to_stop = known_run_to_stop
+
+    def collect_new(self, category: str, url: str, crawl_date: str):
+        """
+        Listing rows of one category not yet in the index, followed by the
+        rows of its retry list. A run of `known_run_to_stop` consecutive
+        known articles ends paging.
+        """
+        new_items, seen = [], set()
+        for html in self.listing.iter_pages(category, url):
+            page_items = parse_timeline(html, category, crawl_date)
+            if not page_items:
+                break
+
+            known_run, reached_known = 0, False
+            for item in page_items:
+                if item["link"] in seen:
+                    continue
+                seen.add(item["link"])
+                if self.index.is_known(item):
+                    known_run += 1
+                    if known_run >= self.known_run_to_stop:
+                        reached_known = True
+                        break
+                else:
+                    known_run = 0
+                    new_items.append(item)
+            if reached_known:
+                break
+        queued = {item["link"] for item in new_items}
+        return new_items + [item for item in self.index.retries(category) if item["link"] not in queued]
+
+    def run(self, categories: dict = CATEGORIES):
+        crawl_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        new_items = []
+        for cat_name, url in categories.items():
+            items = self.collect_new(cat_name, url, crawl_date)
+            print(f"📰 {cat_name}: {len(items)} bài mới")
+            new_items.extend(items)
+
+        if not new_items:
+            print("✅ Không có bài mới.")
+            return []
+
+        save_dir = os.path.join(BASE_DIR, "data", datetime.now().strftime("%Y-%m-%d"))
+        os.makedirs(save_dir, exist_ok=True)
+        output_path = os.path.join(save_dir, "cafef_news.csv")
+
+        def store(item):
+            if item.get("fetch_error") is None:
+                writer(item)
+                self.index.add([item], advance=False)
+
+        print(f"\n🧠 Đang tải nội dung {len(new_items)} bài mới...")
+        with CsvResultWriter(output_path) as writer:
+            self.content.fetch_all(new_items, on_result=store)
+
+        # Failed downloads stay out of the index and go to the retry list
+        stored = [item for item in new_items if item.get("fetch_error") is None]
+        failed = [item for item in new_items if item.get("fetch_error") is not None]
+        self.index.add(stored)
+        if failed:
+            self.index.add_failed(failed)
+            print(f"🔁 {len(failed)} bài lỗi sẽ được tải lại lần sau")
+
+        pd.DataFrame(stored).drop(columns="fetch_error", errors="ignore").to_csv(LATEST_PATH, index=False, encoding="utf-8-sig")
+        print(f"📁 Đã ghi thêm {len(stored)} bài vào: {output_path}")
+        return stored
+
+
+def main():
+    IncrementalNewsCrawler().run()
+
+
+if __name__ == "__main__":
+    main()
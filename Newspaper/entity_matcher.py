@@ -0,0 +1,217 @@
+import os
+import csv
+from collections import deque
+
+import pandas as pd
+from unidecode import unidecode
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LISTING_PATH = os.path.join(BASE_DIR, "stock_listing.csv")
+
+# ======== Company keywords / mapping (from preprocessing_cafef.ipynb) ==========
+COMPANY_KEYWORDS = [
+    "vin", "vingroup", "vietcombank", "fpt", "vietinbank", "bidv",
+    "hoa phat", "vietjet", "masan", "samsung", "vietnam airlines",
+    "vib", "acb", "mbbank", "shb", "techcombank", "vpbank"
+]
+COMPANY_STOCK_MAP = {
+    "vingroup": "VIC",
+    "vietcombank": "VCB",
+    "fpt": "FPT",
+    "vietinbank": "CTG",
+    "bidv": "BID",
+    "hoa phat": "HPG",
+    "vietjet": "VJC",
+    "masan": "MSN",
+    "vib": "VIB",
+    "acb": "ACB",
+    "mbbank": "MBB",
+    "shb": "SHB",
+    "techcombank": "TCB",
+    "vpbank": "VPB"
+}
+
+_FOLD_CACHE = {}
+
+
+def fold_text(text: str):
+    """
+    Character-wise `unidecode(text.lower())` that keeps string length, so
+    match offsets in the folded text are offsets in the original text.
+    Characters whose transliteration is not a single char are kept lowercased.
+    """
+    out = []
+    for c in text:
+        f = _FOLD_CACHE.get(c)
+        if f is None:
+            low = c.lower()
+            f = unidecode(low) if len(low) == 1 else c
+            if len(f) != 1:
+                f = low if len(low) == 1 else c
+            _FOLD_CACHE[c] = f
+        out.append(f)
+    return "".join(out)
+
+
+def _is_word_char(c: str):
+    return c.isalnum() or c == "_"
+
+
+class AhoCorasick():
+    """
+    Multi-pattern string automaton: every pattern occurrence in a text is
+    found in one left-to-right pass, independent of the number of patterns.
+    """
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self._built = False
+
+    def add(self, pattern: str, payload):
+        node = 0
+        for c in pattern:
+            nxt = self.goto[node].get(c)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][c] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append((len(pattern), payload))
+        self._built = False
+
+    def build(self):
+        # Breadth-first: fail links point to the longest proper suffix in the trie
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(c, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+        self._built = True
+
+    def iter(self, text: str):
+        """Yield (start, end, payload) for every occurrence."""
+        if not self._built:
+            self.build()
+        node = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, c in enumerate(text):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            for length, payload in out[node]:
+                yield i - length + 1, i + 1, payload
+
+
+class EntityMatcher():
+    """
+    Company alias and stock ticker matcher backed by one Aho-Corasick
+    automaton over the folded (lowercase, no diacritics) text.
+
+    - Company aliases behave like the notebook's `kw in unidecode(text.lower())`
+      substring test; aliases loaded from a listing file match whole words only.
+    - Tickers replace `\\b[A-Z]{3}\\b`: a hit is kept only if the original
+      text has the ticker in upper case at word boundaries, and only listed
+      tickers are in the automaton.
+
+    Usage:
+        matcher = EntityMatcher.from_listing()
+        matcher.match("Vingroup (VIC) và FPT ...")
+        # {"companies": ["vingroup", "fpt"], "stocks": ["VIC", "FPT"], "mapped_stock": ["VIC", "FPT"]}
+    """
+    def __init__(self,
+        aliases: dict = None,
+        tickers=None,
+        whole_word_aliases: set = None
+    ):
+        """
+        Arguments:
+            aliases [dict]: alias -> ticker (or None when not listed).
+                Defaults to COMPANY_KEYWORDS with COMPANY_STOCK_MAP.
+            tickers [iterable[str]]: Valid tickers (upper case).
+            whole_word_aliases [set]: Aliases that must match whole words.
+        """
+        if aliases is None:
+            aliases = {kw: COMPANY_STOCK_MAP.get(kw) for kw in COMPANY_KEYWORDS}
+        self.aliases = {fold_text(a): t for a, t in aliases.items()}
+        self.tickers = set(tickers if tickers is not None else COMPANY_STOCK_MAP.values())
+        self.whole_word_aliases = {fold_text(a) for a in (whole_word_aliases or ())}
+
+        # Keep the notebook's keyword order for the "companies" output
+        self._alias_order = {a: i for i, a in enumerate(self.aliases)}
+        self.automaton = AhoCorasick()
+        for alias in self.aliases:
+            self.automaton.add(alias, ("company", alias))
+        for ticker in self.tickers:
+            self.automaton.add(ticker.lower(), ("stock", ticker))
+        self.automaton.build()
+
+    @classmethod
+    def from_listing(cls, path: str = LISTING_PATH):
+        """
+        Notebook keywords plus a listing CSV with columns
+        ticker, exchange, company_name, aliases ("|"-separated).
+        """
+        aliases = {kw: COMPANY_STOCK_MAP.get(kw) for kw in COMPANY_KEYWORDS}
+        whole_word, tickers = set(), set(COMPANY_STOCK_MAP.values())
+        with open(path, "r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                ticker = row["ticker"].strip().upper()
+                tickers.add(ticker)
+                for alias in (row.get("aliases") or "").split("|"):
+                    alias = fold_text(alias.strip())
+                    if alias and alias not in aliases:
+                        aliases[alias] = ticker
+                        whole_word.add(alias)
+        return cls(aliases, tickers, whole_word)
+
+    def match(self, text: str):
+        """
+        Returns:
+            entities [dict]: companies (aliases, keyword order), stocks
+                (validated tickers, first-seen order) and mapped_stock
+                (tickers of matched companies).
+        """
+        if not isinstance(text, str) or not text:
+            return {"companies": [], "stocks": [], "mapped_stock": []}
+
+        folded = fold_text(text)
+        companies, stocks = set(), {}
+        n = len(text)
+        for start, end, (kind, value) in self.automaton.iter(folded):
+            if kind == "company":
+                if value in self.whole_word_aliases and not self._at_boundaries(folded, start, end, n):
+                    continue
+                companies.add(value)
+            else:
+                span = text[start:end]
+                if span == value and self._at_boundaries(text, start, end, n):
+                    stocks.setdefault(value, None)
+
+        companies = sorted(companies, key=self._alias_order.get)
+        mapped = list(dict.fromkeys(self.aliases[c] for c in companies if self.aliases[c]))
+        return {"companies": companies, "stocks": list(stocks), "mapped_stock": mapped}
+
+    def annotate(self, df: pd.DataFrame, text_cols=("title", "content")):
+        """
+        Add company / stock / mapped_stock columns, matching each document
+        (its text columns joined by newlines) in one pass.
+        """
+        docs = df[list(text_cols)].fillna("").astype(str).agg("\n".join, axis=1)
+        results = [self.match(doc) for doc in docs]
+        df["company"] = [r["companies"] for r in results]
+        df["stock"] = [r["stocks"] for r in results]
+        df["mapped_stock"] = [r["mapped_stock"] for r in results]
+        return df
+
+    @staticmethod
+    def _at_boundaries(text: str, start: int, end: int, n: int):
+        return (start == 0 or not _is_word_char(text[start - 1])) and \
+            (end == n or not _is_word_char(text[end]))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Newspaper modules import each other by plain name (from cafef_listing import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from cafef_listing import CATEGORIES, CafefListingFetcher, parse_timeline
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CRAWL_DATE = "2025-11-07 15:00:00"
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_timeline_category_page():
+    articles = parse_timeline(read_fixture("chung-khoan.chn"), "chung-khoan", CRAWL_DATE)
+
+    # The sponsored entry without href is skipped
+    assert [a["link"] for a in articles] == [
+        "https://cafef.vn/vn-index-vuot-moc-1700-diem-188251107001.chn",
+        "https://cafef.vn/khoi-ngoai-ban-rong-phien-thu-5-188251107002.chn",
+        "https://cafef.vn/co-phieu-thep-tang-tran-188251106003.chn",
+    ]
+    first = articles[0]
+    assert first["category"] == "chung-khoan"
+    assert first["crawl_date"] == CRAWL_DATE
+    assert first["title"] == "VN-Index vượt mốc 1.700 điểm"
+    assert first["description"] == "Dòng tiền quay lại nhóm ngân hàng,\nthanh khoản HoSE đạt hơn 30.000 tỷ đồng."
+    assert first["time_posted"] == "07/11/2025 14:30"
+    assert articles[1]["description"] == "Áp lực bán tập trung ở FPT và VNM."
+    # No sapo: empty description, not an error
+    assert articles[2]["description"] == ""
+    assert articles[2]["time_posted"] == "06/11/2025 - 16:45"
+
+
+def test_parse_timeline_empty_fragment():
+    assert parse_timeline(read_fixture("timelinelist_18831_4.chn"), "chung-khoan", CRAWL_DATE) == []
+
+
+def test_fetch_category_pages_until_empty():
+    fetcher = CafefListingFetcher.from_fixtures(FIXTURE_DIR)
+    articles = fetcher.fetch_category("chung-khoan", CATEGORIES["chung-khoan"], CRAWL_DATE)
+
+    # Page 1, then timeline pages 2-3; page 4 is empty and ends paging.
+    # The article repeated on page 2 is kept once, at its first position.
+    assert [a["link"].rsplit("-", 1)[-1] for a in articles] == [
+        "188251107001.chn", "188251107002.chn", "188251106003.chn",
+        "188251106004.chn", "188251105005.chn",
+    ]
+
+
+def test_iter_pages_respects_max_load_more():
+    fetcher = CafefListingFetcher.from_fixtures(FIXTURE_DIR, max_load_more=1)
+    pages = list(fetcher.iter_pages("chung-khoan", CATEGORIES["chung-khoan"]))
+
+    assert len(pages) == 2
+    assert pages[1] == read_fixture("timelinelist_18831_2.chn")
+
+
+def test_iter_pages_discovers_zone_id_and_stops_on_fetch_error():
+    requested = []
+    fixtures = CafefListingFetcher.from_fixtures(FIXTURE_DIR)
+
+    def fetch(url):
+        requested.append(url)
+        return fixtures.fetch(url)
+
+    fetcher = CafefListingFetcher(fetch=fetch)
+    pages = list(fetcher.iter_pages("tai-chinh-quoc-te", "https://cafef.vn/tai-chinh-quoc-te.chn"))
+
+    # Zone id 18832 comes from the page; its timeline page 2 is missing -> stop
+    assert len(pages) == 1
+    assert requested == [
+        "https://cafef.vn/tai-chinh-quoc-te.chn",
+        "https://cafef.vn/timelinelist/18832/2.chn",
+    ]
+
+
+def test_from_fixtures_missing_page_raises():
+    fetcher = CafefListingFetcher.from_fixtures(FIXTURE_DIR)
+    with pytest.raises(FileNotFoundError):
+        fetcher.fetch("https://cafef.vn/bat-dong-san.chn")
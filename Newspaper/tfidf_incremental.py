@@ -0,0 +1,209 @@
+import os
+import json
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "data", "_tfidf")
+N_FEATURES = 2 ** 20
+NGRAM_RANGE = (1, 2)
+
+
+def build_hashing_vectorizer(n_features: int = N_FEATURES, ngram_range=NGRAM_RANGE):
+    """
+    Stateless term-count vectorizer with the same analyzer as the notebook's
+    TfidfVectorizer (lowercase, default token pattern, ngram_range=(1, 2)).
+    """
+    return HashingVectorizer(
+        n_features=n_features,
+        ngram_range=tuple(ngram_range),
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
+class IncrementalTfidfStore():
+    """
+    Append-only TF-IDF store for one text field (e.g. title_tok, content_tok).
+
+    Each append vectorizes only the new documents with a hashing
+    vectorizer (no vocabulary to refit), adds them to the running
+    document-frequency counts and writes them as a new CSR shard of raw
+    term counts (data/indices/indptr .npy files). IDF weighting is
+    applied when reading, so old shards never need rewriting. `load_shards`
+    opens each shard as a CSR matrix over np.load(mmap_mode="r") arrays,
+    so nothing is decompressed or copied; `load_counts` / `load_tfidf`
+    stack shards in RAM. Each shard keeps its own ids; meta.json only
+    lists shard names and row counts, so an append writes O(new docs).
+
+    Layout:
+        <store_dir>/<field>/meta.json              (n_docs, shards, shard_rows)
+        <store_dir>/<field>/df.npy
+        <store_dir>/<field>/shard_00000/{data,indices,indptr}.npy, ids.json
+
+    Usage:
+        store = IncrementalTfidfStore("content_tok")
+        store.append(df["content_tok"], ids=df["link"])
+        X = store.load_tfidf()                     # all documents, in RAM
+        for ids, X in store.iter_tfidf():          # or one shard at a time
+            index.add(X, ids, source="cafef")
+        q = store.transform(["lãi ròng quý"])      # query vectors, same space
+    """
+    def __init__(self,
+        field: str,
+        store_dir: str = STORE_DIR,
+        n_features: int = N_FEATURES,
+        ngram_range=NGRAM_RANGE,
+        sublinear_tf: bool = True,
+        min_df: int = 2
+    ):
+        """
+        Arguments:
+            field [str]: Sub-folder name of this store.
+            n_features [int]: Hashing space size (fixed once the store exists).
+            sublinear_tf [bool]: Use 1 + log(tf), as in build_tfidf.
+            min_df [int]: Features seen in fewer documents get zero weight.
+        """
+        self.path = os.path.join(store_dir, field)
+        os.makedirs(self.path, exist_ok=True)
+        self.meta_path = os.path.join(self.path, "meta.json")
+        self.df_path = os.path.join(self.path, "df.npy")
+        self.sublinear_tf = sublinear_tf
+        self.min_df = min_df
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            self.doc_freq = np.load(self.df_path)
+        else:
+            self.meta = {"n_features": n_features, "ngram_range": list(ngram_range), "n_docs": 0,
+                         "shards": [], "shard_rows": []}
+            self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self._known = None      # stored ids, read from the shards on the first append
+
+        self.vectorizer = build_hashing_vectorizer(self.meta["n_features"], self.meta["ngram_range"])
+
+    @property
+    def n_docs(self):
+        return self.meta["n_docs"]
+
+    def _shard_ids(self, shard: str):
+        with open(os.path.join(self.path, shard, "ids.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def stored_ids(self):
+        """Ids of all stored documents (as str), in row order."""
+        return [i for shard in self.meta["shards"] for i in self._shard_ids(shard)]
+
+    def append(self, texts, ids=None):
+        """
+        Vectorize and store new documents; ids already in the store are skipped.
+
+        Arguments:
+            texts [iterable[str]]: Tokenized texts.
+            ids [iterable | None]: Document ids (e.g. article links);
+                defaults to running row numbers.
+
+        Returns:
+            n_added [int]: Number of documents written.
+        """
+        texts = ["" if not isinstance(t, str) else t for t in texts]
+        if self._known is None:
+            self._known = set(self.stored_ids())
+        if ids is None:
+            ids = [str(i) for i in range(self.n_docs, self.n_docs + len(texts))]
+        else:
+            ids = [str(i) for i in ids]
+            known, keep = set(), []
+            for k, doc_id in enumerate(ids):
+                if doc_id not in self._known and doc_id not in known:
+                    known.add(doc_id)
+                    keep.append(k)
+            texts, ids = [texts[k] for k in keep], [ids[k] for k in keep]
+        if not texts:
+            return 0
+
+        counts = self.vectorizer.transform(texts).tocsr()
+        counts.sum_duplicates()
+        self.doc_freq += np.bincount(counts.indices, minlength=self.meta["n_features"])
+
+        shard = f"shard_{len(self.meta['shards']):05d}"
+        shard_dir = os.path.join(self.path, shard)
+        os.makedirs(shard_dir, exist_ok=True)
+        np.save(os.path.join(shard_dir, "data.npy"), counts.data.astype(np.float32))
+        # indptr shares the indices dtype, so scipy wraps the mmaps without upcasting a copy
+        index_dtype = np.int32 if counts.nnz < 2 ** 31 else np.int64
+        np.save(os.path.join(shard_dir, "indices.npy"), counts.indices.astype(index_dtype))
+        np.save(os.path.join(shard_dir, "indptr.npy"), counts.indptr.astype(index_dtype))
+        with open(os.path.join(shard_dir, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump(ids, f, ensure_ascii=False)
+
+        # Statistics are written last so a crash never leaves them ahead of the shards
+        self.meta["shards"].append(shard)
+        self.meta["shard_rows"].append(len(texts))
+        self.meta["n_docs"] += len(texts)
+        self._known.update(ids)
+        np.save(self.df_path, self.doc_freq)
+        with open(self.meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+        return len(texts)
+
+    def load_shard(self, shard: str):
+        """Raw term counts of one shard as a CSR matrix over memory-mapped data / indices (no copy)."""
+        shard_dir = os.path.join(self.path, shard)
+        n_rows = self.meta["shard_rows"][self.meta["shards"].index(shard)]
+        data = np.load(os.path.join(shard_dir, "data.npy"), mmap_mode="r")
+        indices = np.load(os.path.join(shard_dir, "indices.npy"), mmap_mode="r")
+        indptr = np.load(os.path.join(shard_dir, "indptr.npy"), mmap_mode="r")
+        return sp.csr_matrix((data, indices, indptr), shape=(n_rows, self.meta["n_features"]), copy=False)
+
+    def load_shards(self, shards: list[str] = None):
+        """One memory-mapped count matrix per shard (all by default), in order."""
+        shards = self.meta["shards"] if shards is None else shards
+        return [self.load_shard(shard) for shard in shards]
+
+    def load_counts(self, shards: list[str] = None):
+        """Raw term-count matrix of the given shards (all by default), stacked in RAM."""
+        blocks = self.load_shards(shards)
+        if not blocks:
+            return sp.csr_matrix((0, self.meta["n_features"]), dtype=np.float32)
+        return blocks[0].copy() if len(blocks) == 1 else sp.vstack(blocks, format="csr")
+
+    def idf(self):
+        """Smoothed IDF from the running statistics (TfidfVectorizer formula)."""
+        n = self.n_docs
+        idf = np.log((1.0 + n) / (1.0 + self.doc_freq)) + 1.0
+        idf[self.doc_freq < self.min_df] = 0.0
+        return idf.astype(np.float32)
+
+    def weight(self, counts: sp.csr_matrix):
+        """Apply sublinear TF, current IDF and L2 normalization to count rows."""
+        X = counts.astype(np.float32, copy=True)
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1.0
+        X.data *= self.idf()[X.indices]
+        X.eliminate_zeros()
+        return normalize(X, norm="l2", copy=False)
+
+    def load_tfidf(self, shards: list[str] = None):
+        """TF-IDF rows of the given shards (all by default), stacked in RAM."""
+        blocks = [self.weight(counts) for counts in self.load_shards(shards)]
+        if not blocks:
+            return sp.csr_matrix((0, self.meta["n_features"]), dtype=np.float32)
+        return blocks[0] if len(blocks) == 1 else sp.vstack(blocks, format="csr")
+
+    def iter_tfidf(self, shards: list[str] = None):
+        """Yield (ids, TF-IDF rows) one shard at a time, so only one shard is weighted in RAM."""
+        for shard in (self.meta["shards"] if shards is None else shards):
+            yield self._shard_ids(shard), self.weight(self.load_shard(shard))
+
+    def transform(self, texts):
+        """Vectorize texts into the store's TF-IDF space without storing them."""
+        texts = ["" if not isinstance(t, str) else t for t in texts]
+        return self.weight(self.vectorizer.transform(texts).tocsr())
@@ -0,0 +1,156 @@
+import os
+import hashlib
+import sqlite3
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ======== Stopword removal (same list as preprocessing_cafef.ipynb) ==========
+STOPWORDS = set([
+    "và", "là", "của", "có", "cho", "với", "được", "này", "đã", "trong", "khi",
+    "tại", "một", "các", "những", "đến", "để", "về", "ra", "thì", "cũng", "như",
+    "rằng", "theo", "từ", "vào", "nên", "sẽ", "đang", "vì", "nếu", "hơn"
+])
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "_cache", "tokenize_cache.sqlite")
+BATCH_SIZE = 256
+
+
+def remove_stopwords(text, stopwords=STOPWORDS):
+    return " ".join([t for t in text.split() if t not in stopwords])
+
+
+def tokenize_vietnamese(text):
+    import underthesea
+    try:
+        return underthesea.word_tokenize(text, format="text")
+    except Exception:
+        return text
+
+
+def normalize_text(text):
+    """NFC + collapsed whitespace: the form used for cache keys."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text, remove_stop: bool = True):
+    prefix = "stop:" if remove_stop else "raw:"
+    return hashlib.sha1((prefix + normalize_text(text)).encode("utf-8")).hexdigest()
+
+
+# -- Process-pool worker --
+def _warm_up():
+    # Load the CRF model once per worker instead of on the first real row
+    tokenize_vietnamese("khởi động mô hình")
+
+
+def _tokenize_batch(args):
+    texts, remove_stop = args
+    if remove_stop:
+        texts = [remove_stopwords(t) for t in texts]
+    return [tokenize_vietnamese(t) for t in texts]
+
+
+class TokenCache():
+    """
+    Persistent text-hash -> tokenized text store (SQLite, one file).
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get_many(self, keys: list[str]):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 900):   # SQLite parameter limit
+            chunk = unique[i:i + 900]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM tokens WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, items: dict):
+        self.conn.executemany("INSERT OR REPLACE INTO tokens VALUES (?, ?)", items.items())
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class Tokenizer():
+    """
+    Cached, batched Vietnamese word tokenization with stopword removal
+    fused into the same pass (remove_stopwords -> tokenize_vietnamese,
+    as in preprocessing_cafef.ipynb).
+
+    Only texts missing from the cache are tokenized; they are sent in
+    batches to a process pool whose workers load the underthesea model
+    once at start-up.
+
+    Usage:
+        tokenizer = Tokenizer()
+        df["title_tok"] = tokenizer.tokenize_series(df["title_clean"])
+        df["content_tok"] = tokenizer.tokenize_series(df["content_clean"])
+    """
+    def __init__(self,
+        cache: TokenCache = None,
+        n_jobs: int = None,
+        batch_size: int = BATCH_SIZE,
+        remove_stop: bool = True
+    ):
+        """
+        Arguments:
+            cache [TokenCache]: Persistent cache (default file under data/_cache/).
+            n_jobs [int]: Worker processes (os.cpu_count() if None, 1 = in-process).
+            batch_size [int]: Texts per worker task.
+            remove_stop [bool]: Remove STOPWORDS before tokenizing.
+        """
+        self.cache = cache or TokenCache()
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.remove_stop = remove_stop
+
+    def tokenize(self, texts: list[str]):
+        """
+        Returns:
+            tokens [list[str]]: Tokenized text for each input, in order.
+        """
+        texts = ["" if not isinstance(t, str) else t for t in texts]
+        keys = [text_key(t, self.remove_stop) for t in texts]
+        cached = self.cache.get_many(keys)
+
+        # Tokenize each missing text once, even if it appears many times. The
+        # normalized form is tokenized, since that is what the cache key covers
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = normalize_text(text)
+
+        if missing:
+            print(f"🔤 Tokenize {len(missing)} / {len(texts)} texts (còn lại lấy từ cache)")
+            results = self._run(list(missing.values()))
+            computed = dict(zip(missing.keys(), results))
+            self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def tokenize_series(self, series: pd.Series):
+        return pd.Series(self.tokenize(series.tolist()), index=series.index)
+
+    def _run(self, texts: list[str]):
+        batches = [
+            (texts[i:i + self.batch_size], self.remove_stop)
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        if self.n_jobs == 1 or len(batches) == 1:
+            results = [_tokenize_batch(batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_warm_up) as pool:
+                results = list(pool.map(_tokenize_batch, batches))
+        return [token for batch in results for token in batch]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from sentiment_engine import SentimentEngine, MODEL_VI, normalize_label
+from youtube_store import read_comments
+
+
+def normalize_comment_series(texts: pd.Series):
+    """
+    Duplicate key of each comment: NFC, lowercase, punctuation / emoji
+    removed and whitespace collapsed, so "Mua ở đâu ạ!!" and "mua ở đâu ạ"
+    collapse to the same text.
+    """
+    s = texts.fillna("").astype(str).str.normalize("NFC").str.lower()
+    s = s.str.replace(r"[^\w\s]|_", " ", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def score_comments(comments: pd.DataFrame, engine: SentimentEngine, text_col: str = "text"):
+    """
+    Per-comment sentiment where each distinct normalized text is scored once.
+
+    Arguments:
+        comments [pd.DataFrame]: One row per comment / reply (needs `text_col`).
+        engine [SentimentEngine]: Scoring engine.
+
+    Returns:
+        comments [pd.DataFrame]: Copy with norm_key, sentiment,
+            sentiment_score and polarity (P(positive) - P(negative)) columns.
+    """
+    out = comments.copy()
+    out["norm_key"] = normalize_comment_series(out[text_col])
+
+    # One representative (first occurrence) per normalized text
+    codes, uniques = pd.factorize(out["norm_key"])
+    first_pos = pd.Series(np.arange(len(out))).groupby(codes).first().values
+    representatives = out[text_col].iloc[first_pos].fillna("").astype(str)
+    # Texts that normalize to nothing (emoji only, ...) are not sent to the model
+    representatives = representatives.where(np.asarray(uniques) != "", "")
+    print(f"💬 {len(out)} comments -> {len(uniques)} unique texts")
+
+    results = engine.predict(representatives.tolist())
+    unique_label = np.array([normalize_label(r["label"]) if r else "neutral" for r in results], dtype=object)
+    unique_score = np.array([r["score"] if r else np.nan for r in results], dtype=float)
+    unique_polarity = np.array([
+        sum(p for lbl, p in r["scores"].items() if normalize_label(lbl) == "positive")
+        - sum(p for lbl, p in r["scores"].items() if normalize_label(lbl) == "negative")
+        if r else 0.0
+        for r in results
+    ], dtype=float)
+
+    out["sentiment"] = unique_label[codes]
+    out["sentiment_score"] = unique_score[codes]
+    out["polarity"] = unique_polarity[codes]
+    return out
+
+
+def aggregate_video_sentiment(scored: pd.DataFrame, video_col: str = "video_id", text_col: str = "text"):
+    """
+    Per-video sentiment features from scored comments:
+    n_comments, mean_polarity, share_negative, share_positive,
+    exact_duplicate_ratio and duplicate_ratio (normalized text).
+    """
+    g = scored.assign(
+        is_negative=scored["sentiment"].eq("negative"),
+        is_positive=scored["sentiment"].eq("positive"),
+    ).groupby(video_col, sort=False)
+    n = g.size()
+    stats = pd.DataFrame({
+        "n_comments": n,
+        "mean_polarity": g["polarity"].mean(),
+        "share_negative": g["is_negative"].mean(),
+        "share_positive": g["is_positive"].mean(),
+        "exact_duplicate_ratio": 1 - g[text_col].nunique(dropna=False) / n,
+        "duplicate_ratio": 1 - g["norm_key"].nunique() / n,
+    })
+    stats.index.name = video_col
+    return stats.reset_index()
+
+
+def video_comment_sentiment(save_dir, engine: SentimentEngine = None, video_ids=None):
+    """
+    Per-comment scoring over a normalized playlist partition (youtube_store),
+    or a list of partitions oldest first; `video_ids` limits it to some videos.
+
+    Usage:
+        engine = SentimentEngine(MODEL_VI, backend="int8")
+        scored, per_video = video_comment_sentiment("data/2025-10-31", engine)
+        df = df.merge(per_video, on="video_id", how="left")
+    """
+    engine = engine or SentimentEngine(MODEL_VI)
+    comments = read_comments(save_dir, columns=["author", "publishedAt"], video_ids=video_ids)
+    scored = score_comments(comments, engine)
+    return scored, aggregate_video_sentiment(scored)
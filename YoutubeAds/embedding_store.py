@@ -0,0 +1,149 @@
+import os
+import re
+import json
+import hashlib
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "data", "_embeddings")
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"   # as in model_v0.ipynb
+BATCH_SIZE = 64
+APPEND_BATCH = 1024     # texts encoded and flushed to disk at a time
+
+
+def embedding_key(model_name: str, text: str):
+    return hashlib.sha1((model_name + "\x1f" + text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore():
+    """
+    Content-addressed, append-only store of sentence embeddings for one model.
+
+    A text is keyed by sha1(model name + text), so the same text is encoded
+    once across runs, datasets and stages. Vectors are appended as raw rows
+    of one float32 (or float16) file and read back through np.memmap; the
+    key -> row index is a plain append-only text file kept in memory as a dict.
+
+    Layout:
+        <store_dir>/<model slug>/meta.json
+        <store_dir>/<model slug>/vectors.bin     (n_rows x dim)
+        <store_dir>/<model slug>/keys.txt        (row i = key of vector i)
+
+    Usage:
+        store = EmbeddingStore()
+        embeddings = store.encode(df["combined_text"])    # only new texts hit the model
+    """
+    def __init__(self,
+        model_name: str = MODEL_NAME,
+        store_dir: str = STORE_DIR,
+        dtype: str = "float32",
+        batch_size: int = BATCH_SIZE,
+        model=None
+    ):
+        """
+        Arguments:
+            model_name [str]: SentenceTransformer model id (part of the key).
+            dtype [str]: "float32" or "float16" storage (fixed once the store exists).
+            batch_size [int]: Encoder batch size.
+            model: Already loaded encoder with a SentenceTransformer-like `encode`.
+        """
+        self.model_name = model_name
+        self.path = os.path.join(store_dir, re.sub(r"[^\w.-]+", "__", model_name))
+        os.makedirs(self.path, exist_ok=True)
+        self.meta_path = os.path.join(self.path, "meta.json")
+        self.vectors_path = os.path.join(self.path, "vectors.bin")
+        self.keys_path = os.path.join(self.path, "keys.txt")
+        self.batch_size = batch_size
+        self.model = model
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"model_name": model_name, "dtype": dtype, "dim": None}
+        self.dtype = np.dtype(self.meta["dtype"])
+
+        self.index = {}
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                keys = f.read().split()
+            keys = keys[:self._rows_on_disk()]
+            self.index = {k: i for i, k in enumerate(keys)}
+        if self._rows_on_disk() > len(self.index):
+            # A crash between the two appends left vectors without keys: drop them
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(len(self.index) * self.meta["dim"] * self.dtype.itemsize)
+
+    def __len__(self):
+        return len(self.index)
+
+    def _rows_on_disk(self):
+        if not self.meta["dim"] or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.meta["dim"] * self.dtype.itemsize)
+
+    def _load_model(self):
+        if self.model is None:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(self.model_name)
+        return self.model
+
+    def vectors(self):
+        """All stored vectors as a read-only memmap (n_rows, dim)."""
+        if not self.index:
+            return np.zeros((0, self.meta["dim"] or 0), dtype=self.dtype)
+        return np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(len(self.index), self.meta["dim"]))
+
+    def keys(self, texts):
+        return [embedding_key(self.model_name, t if isinstance(t, str) else "") for t in texts]
+
+    def contains(self, texts):
+        return np.array([k in self.index for k in self.keys(texts)], dtype=bool)
+
+    def _append(self, keys: list[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        if self.meta["dim"] is None:
+            self.meta["dim"] = int(vectors.shape[1])
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump(self.meta, f, ensure_ascii=False, indent=4)
+        elif vectors.shape[1] != self.meta["dim"]:
+            raise ValueError(f"Vector size {vectors.shape[1]} does not match store size {self.meta['dim']}")
+        # Vectors first, keys second: a key on disk always has its vector
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, "a", encoding="utf-8") as f:
+            f.write("".join(k + "\n" for k in keys))
+        for k in keys:
+            self.index[k] = len(self.index)
+
+    def add_missing(self, texts):
+        """Encode and store texts not in the store yet; returns the number encoded."""
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        missing = {}
+        for key, text in zip(self.keys(texts), texts):
+            if key not in self.index and key not in missing:
+                missing[key] = text
+        if not missing:
+            return 0
+
+        print(f"🧮 Encode {len(missing)} / {len(texts)} texts (còn lại lấy từ store)")
+        model = self._load_model()
+        keys, values = list(missing.keys()), list(missing.values())
+        for start in range(0, len(keys), APPEND_BATCH):
+            batch = values[start:start + APPEND_BATCH]
+            vectors = model.encode(batch, batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False)
+            self._append(keys[start:start + APPEND_BATCH], vectors)
+        return len(missing)
+
+    def encode(self, texts, dtype=np.float32):
+        """
+        Embeddings of texts in input order (drop-in for `embed_model.encode`).
+
+        Returns:
+            embeddings [np.ndarray]: (len(texts), dim) array of `dtype`.
+        """
+        texts = list(texts)
+        self.add_missing(texts)
+        rows = np.fromiter((self.index[k] for k in self.keys(texts)), dtype=np.int64, count=len(texts))
+        return np.asarray(self.vectors()[rows], dtype=dtype)
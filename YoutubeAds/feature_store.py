@@ -0,0 +1,201 @@
+import os
+import json
+import importlib.util
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "data", "_features")
+KEY = "video_id"
+CHUNKSIZE = 50_000
+# Parquet needs pyarrow or fastparquet; without them families are stored as CSV
+DEFAULT_FORMAT = "parquet" if (importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")) else "csv"
+
+# Column families written by each YouTube stage (see import_legacy)
+STAGE_FAMILIES = {
+    "raw": ["title", "description", "publishedAt", "channelId", "channelTitle", "tags", "viewCount",
+            "likeCount", "commentCount", "duration", "caption", "transcript", "comments"],
+    "clean": ["title_clean", "description_clean", "tags_text", "comments_text", "combined_text"],
+    "sentiment": ["sentiment"],
+    "cluster": ["cluster"],
+    "ad_type": ["ad_type"],
+}
+
+
+class FeatureStore():
+    """
+    Column-family store keyed by video_id.
+
+    Each stage writes only its own family (e.g. "sentiment" -> [sentiment]);
+    a write appends one part file holding the key and that family's columns,
+    so its cost scales with the new columns, not the whole table. Reads open
+    only the families owning the requested columns and join them by key.
+    Within a family the last written row of a video wins.
+
+    Layout:
+        <store_dir>/<family>/meta.json          columns, format, parts
+        <store_dir>/<family>/part-00000.parquet (or .csv)
+
+    Usage:
+        store = FeatureStore()
+        store.write("sentiment", df[["video_id", "sentiment"]])
+        df = store.read(["combined_text", "sentiment", "cluster"])
+    """
+    def __init__(self, store_dir: str = STORE_DIR, fmt: str = DEFAULT_FORMAT):
+        self.store_dir = store_dir
+        self.fmt = fmt
+        os.makedirs(store_dir, exist_ok=True)
+
+    # -- Metadata --
+    def families(self):
+        return sorted(
+            name for name in os.listdir(self.store_dir)
+            if os.path.exists(os.path.join(self.store_dir, name, "meta.json"))
+        )
+
+    def _meta(self, family: str):
+        path = os.path.join(self.store_dir, family, "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_meta(self, family: str, meta: dict):
+        path = os.path.join(self.store_dir, family, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=4)
+        os.replace(path + ".tmp", path)
+
+    def column_families(self):
+        """column -> family, over every family in the store."""
+        owners = {}
+        for family in self.families():
+            for col in self._meta(family)["columns"]:
+                owners[col] = family
+        return owners
+
+    # -- Writes --
+    def write(self, family: str, df: pd.DataFrame):
+        """
+        Upsert one family's columns for the videos in df (key column + family columns).
+        """
+        if KEY not in df.columns:
+            raise ValueError(f"Missing key column {KEY!r}")
+        columns = [c for c in df.columns if c != KEY]
+        meta = self._meta(family)
+        if meta is None:
+            owners = self.column_families()
+            taken = [c for c in columns if c in owners]
+            if taken:
+                raise ValueError(f"Columns {taken} already belong to families {[owners[c] for c in taken]}")
+            os.makedirs(os.path.join(self.store_dir, family), exist_ok=True)
+            meta = {"columns": columns, "format": self.fmt, "parts": [], "n_written": 0}
+        elif set(columns) != set(meta["columns"]):
+            raise ValueError(f"Family {family!r} has columns {meta['columns']}, got {columns}")
+
+        part = self._next_part(meta)
+        self._write_part(os.path.join(self.store_dir, family, part), df[[KEY] + meta["columns"]], meta["format"])
+        meta["parts"].append(part)
+        self._save_meta(family, meta)
+        return part
+
+    def compact(self, family: str):
+        """Rewrite a family as one part with the last row of every video."""
+        meta = self._meta(family)
+        df = self.read_family(family)
+        old_parts = meta["parts"]
+        part = self._next_part(meta)
+        self._write_part(os.path.join(self.store_dir, family, part), df, meta["format"])
+        meta["parts"] = [part]
+        self._save_meta(family, meta)
+        for p in old_parts:
+            os.remove(os.path.join(self.store_dir, family, p))
+
+    # -- Reads --
+    def read_family(self, family: str, columns: list[str] = None, video_ids=None):
+        meta = self._meta(family)
+        if meta is None:
+            raise KeyError(f"Unknown family {family!r}")
+        columns = [KEY] + [c for c in (columns or meta["columns"]) if c != KEY]
+        if video_ids is not None:
+            video_ids = list(dict.fromkeys(str(v) for v in video_ids))
+        parts = [
+            self._read_part(os.path.join(self.store_dir, family, p), columns, meta["format"], video_ids)
+            for p in meta["parts"]
+        ]
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        return df.drop_duplicates(KEY, keep="last").reset_index(drop=True)
+
+    def read(self, columns: list[str], video_ids=None, how: str = "left"):
+        """
+        Join the requested columns by video_id, opening only their families.
+        Rows follow `video_ids` when given, otherwise the first family's rows.
+        """
+        owners = self.column_families()
+        missing = [c for c in columns if c != KEY and c not in owners]
+        if missing:
+            raise KeyError(f"Unknown columns {missing}")
+        wanted = {}
+        for col in columns:
+            if col != KEY:
+                wanted.setdefault(owners[col], []).append(col)
+
+        if video_ids is not None:
+            result = pd.DataFrame({KEY: list(video_ids)})
+        else:
+            result = None
+        for family, cols in wanted.items():
+            part = self.read_family(family, cols, video_ids)
+            result = part if result is None else result.merge(part, on=KEY, how=how)
+        return result[[KEY] + [c for c in columns if c != KEY]]
+
+    # -- Part files --
+    @staticmethod
+    def _next_part(meta: dict):
+        meta["n_written"] = meta.get("n_written", len(meta["parts"])) + 1
+        return f"part-{meta['n_written'] - 1:05d}.{meta['format']}"
+
+    @staticmethod
+    def _write_part(path: str, df: pd.DataFrame, fmt: str):
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False, encoding="utf-8-sig")
+
+    @staticmethod
+    def _read_part(path: str, columns: list[str], fmt: str, video_ids: list[str] = None):
+        # Rows of other videos are dropped while reading, never materialized in full
+        if fmt == "parquet":
+            filters = None if video_ids is None else [(KEY, "in", video_ids)]
+            return pd.read_parquet(path, columns=columns, filters=filters)
+        if video_ids is None:
+            return pd.read_csv(path, usecols=columns, encoding="utf-8-sig", dtype={KEY: str})
+        wanted = set(video_ids)
+        chunks = pd.read_csv(path, usecols=columns, encoding="utf-8-sig", dtype={KEY: str}, chunksize=CHUNKSIZE)
+        frames = [chunk[chunk[KEY].isin(wanted)] for chunk in chunks]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def import_legacy(data_dir: str, store: FeatureStore = None):
+    """
+    Split the legacy CSV chain of a partition (playlist_data.csv,
+    _clean.csv, _sentiment.csv, _clustered.csv) into column families.
+    Cleaned title / description are stored as title_clean / description_clean.
+    """
+    store = store or FeatureStore()
+    path = lambda name: os.path.join(data_dir, name)
+
+    raw = pd.read_csv(path("playlist_data.csv"), dtype={KEY: str})
+    store.write("raw", raw[[KEY] + STAGE_FAMILIES["raw"]])
+
+    clean = pd.read_csv(path("playlist_data_clean.csv"), dtype={KEY: str})
+    clean = clean.rename(columns={"title": "title_clean", "description": "description_clean"})
+    store.write("clean", clean[[KEY] + STAGE_FAMILIES["clean"]])
+
+    if os.path.exists(path("playlist_data_sentiment.csv")):
+        store.write("sentiment", pd.read_csv(path("playlist_data_sentiment.csv"), usecols=[KEY, "sentiment"], dtype={KEY: str}))
+    if os.path.exists(path("playlist_data_clustered.csv")):
+        clustered = pd.read_csv(path("playlist_data_clustered.csv"), usecols=[KEY, "cluster", "ad_type"], dtype={KEY: str})
+        store.write("cluster", clustered[[KEY, "cluster"]])
+        store.write("ad_type", clustered[[KEY, "ad_type"]])
+    return store
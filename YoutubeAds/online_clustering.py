@@ -0,0 +1,249 @@
+import os
+import json
+import math
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import KMeans, kmeans_plusplus
+from sklearn.feature_extraction.text import CountVectorizer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(BASE_DIR, "data", "_clusters")
+NUM_CLUSTERS = 2            # 2 cụm: quảng cáo thật / giả
+REFIT_EVERY = 5000          # videos assigned online before a full refit is due
+MAX_TERMS = 200_000         # running term statistics are pruned above this size
+
+# Keywords of infer_ad_label (model_v0.ipynb)
+AD_KEYWORDS = ["mua", "shop", "link", "giảm", "sale", "đặt hàng", "sản phẩm", "official", "giá"]
+FAKE_KEYWORDS = ["giả", "fake", "lừa"]
+
+
+def infer_ad_labels(texts, clusters):
+    """Vectorized infer_ad_label over a text Series and cluster ids."""
+    text_lower = pd.Series(texts).astype(str).str.lower()
+    clusters = np.asarray(clusters)
+    has_ad = np.zeros(len(text_lower), dtype=bool)
+    for k in AD_KEYWORDS:
+        has_ad |= text_lower.str.contains(k, regex=False).values
+    has_fake = np.zeros(len(text_lower), dtype=bool)
+    for k in FAKE_KEYWORDS:
+        has_fake |= text_lower.str.contains(k, regex=False).values
+    fallback = np.where(clusters == 0, "ad_real", "ad_fake")
+    return np.where(has_ad, "ad_real", np.where(has_fake, "ad_fake", fallback))
+
+
+class OnlineAdClusterer():
+    """
+    Mini-batch k-means with persisted centroids for the ad-type clusters.
+
+    - `partial_fit` assigns new videos to the nearest centroid and moves each
+      centroid towards the mean of its new members (per-centroid learning
+      rate 1 / count, as in MiniBatchKMeans). Given `rows` (the items' row
+      numbers in the append-only EmbeddingStore), rows already absorbed are
+      only assigned, so rerunning a batch moves nothing twice. Absorbed rows
+      are one bit each, not a set of ids.
+    - `refit` runs the notebook's full KMeans(n_init=10) over a given matrix;
+      call it when `refit_due` (REFIT_EVERY online updates) or on your own
+      schedule. New clusters are matched to the old ones so cluster ids
+      keep their meaning across refits.
+    - Per-cluster document frequencies of terms are kept as running counts,
+      so `top_terms` needs no TF-IDF refit.
+
+    Usage:
+        clusterer = OnlineAdClusterer()
+        X = store.encode(df["combined_text"])
+        rows = [store.index[k] for k in store.keys(df["combined_text"])]
+        if clusterer.refit_due:
+            df["cluster"] = clusterer.refit(X, df["combined_text"], rows=rows)          # df: every stored video
+        else:
+            df["cluster"] = clusterer.partial_fit(X, df["combined_text"], rows=rows)    # df: new videos
+        clusterer.save()
+    """
+    def __init__(self,
+        n_clusters: int = NUM_CLUSTERS,
+        state_dir: str = STATE_DIR,
+        random_state: int = 42,
+        refit_every: int = REFIT_EVERY
+    ):
+        self.n_clusters = n_clusters
+        self.state_dir = state_dir
+        self.random_state = random_state
+        self.refit_every = refit_every
+        self.analyzer = CountVectorizer().build_analyzer()
+
+        self.centroids = None
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.meta = {"n_seen": 0, "updates_since_refit": 0, "last_refit_at": None}
+        self.doc_freq = Counter()
+        self.cluster_doc_freq = [Counter() for _ in range(n_clusters)]
+        self.cluster_docs = np.zeros(n_clusters, dtype=np.int64)
+        self.absorbed = np.zeros(0, dtype=bool)    # per EmbeddingStore row: already in the centroids
+        self._load()
+
+    @property
+    def refit_due(self):
+        return self.centroids is None or self.meta["updates_since_refit"] >= self.refit_every
+
+    # -- Assignment / updates --
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        d = (X ** 2).sum(axis=1)[:, None] - 2 * X @ self.centroids.T + (self.centroids ** 2).sum(axis=1)[None, :]
+        return d.argmin(axis=1)
+
+    def _check_size(self, X):
+        if len(X) < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} items to initialise {self.n_clusters} clusters, got {len(X)}")
+
+    def _mark_absorbed(self, rows):
+        """Flag rows as absorbed; returns which of them were new (first occurrence only)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and rows.max() >= len(self.absorbed):
+            self.absorbed = np.concatenate([self.absorbed, np.zeros(rows.max() + 1 - len(self.absorbed), dtype=bool)])
+        new = ~self.absorbed[rows]
+        _, first = np.unique(rows, return_index=True)
+        new &= np.isin(np.arange(len(rows)), first)
+        self.absorbed[rows] = True
+        return new
+
+    def partial_fit(self, X, texts=None, rows=None):
+        """
+        Assign a batch of items and update the centroids; returns their cluster ids.
+
+        Arguments:
+            rows [list[int]]: EmbeddingStore row of each item. Rows absorbed
+                before, by an earlier call or refit, are assigned but do not
+                move the centroids or term counts again. Without rows every
+                item counts.
+
+        Raises:
+            ValueError: First batch (no centroids yet) smaller than n_clusters.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if self.centroids is None:
+            self._check_size(X)
+            self.centroids, _ = kmeans_plusplus(X, self.n_clusters, random_state=self.random_state)
+        labels = self.predict(X)
+        new = np.ones(len(X), dtype=bool) if rows is None else self._mark_absorbed(rows)
+
+        sums = np.zeros_like(self.centroids)
+        np.add.at(sums, labels[new], X[new])
+        batch_counts = np.bincount(labels[new], minlength=self.n_clusters)
+        self.counts += batch_counts
+        moved = batch_counts > 0
+        self.centroids[moved] += (sums[moved] - batch_counts[moved, None] * self.centroids[moved]) / self.counts[moved, None]
+
+        self.meta["n_seen"] += int(new.sum())
+        self.meta["updates_since_refit"] += int(new.sum())
+        if texts is not None:
+            self._update_terms([t for t, is_new in zip(texts, new) if is_new], labels[new])
+        return labels
+
+    def refit(self, X, texts=None, n_init: int = 10, rows=None):
+        """Full KMeans over X (e.g. every stored embedding); resets the running statistics and absorbed rows."""
+        X = np.asarray(X, dtype=np.float32)
+        self._check_size(X)
+        kmeans = KMeans(n_clusters=self.n_clusters, random_state=self.random_state, n_init=n_init)
+        labels = kmeans.fit_predict(X)
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        if self.centroids is not None:
+            # Keep cluster ids stable: match new centroids to the previous ones
+            cost = ((self.centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            _, new_for_old = linear_sum_assignment(cost)
+            centroids = centroids[new_for_old]
+            labels = np.argsort(new_for_old)[labels]
+
+        self.centroids = centroids
+        self.counts = np.bincount(labels, minlength=self.n_clusters).astype(np.int64)
+        self.absorbed = np.zeros(0, dtype=bool)
+        if rows is not None:
+            self._mark_absorbed(rows)
+        self.meta.update({
+            "n_seen": len(X),
+            "updates_since_refit": 0,
+            "last_refit_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        if texts is not None:
+            self.doc_freq = Counter()
+            self.cluster_doc_freq = [Counter() for _ in range(self.n_clusters)]
+            self.cluster_docs = np.zeros(self.n_clusters, dtype=np.int64)
+            self._update_terms(texts, labels)
+        return labels
+
+    # -- Top terms from running statistics --
+    def _update_terms(self, texts, labels):
+        for text, label in zip(texts, labels):
+            terms = set(self.analyzer(text if isinstance(text, str) else ""))
+            self.doc_freq.update(terms)
+            self.cluster_doc_freq[label].update(terms)
+            self.cluster_docs[label] += 1
+        if len(self.doc_freq) > MAX_TERMS:
+            rare = [t for t, c in self.doc_freq.items() if c < 2]
+            for t in rare:
+                del self.doc_freq[t]
+                for counter in self.cluster_doc_freq:
+                    counter.pop(t, None)
+
+    def top_terms(self, n: int = 15):
+        """
+        Per cluster: terms ranked by (share of the cluster's documents
+        containing the term) x idf over all documents.
+        """
+        n_docs = int(self.cluster_docs.sum())
+        result = []
+        for c in range(self.n_clusters):
+            size = max(int(self.cluster_docs[c]), 1)
+            scores = {
+                t: (cnt / size) * (math.log((1 + n_docs) / (1 + self.doc_freq[t])) + 1)
+                for t, cnt in self.cluster_doc_freq[c].items()
+            }
+            result.append([t for t, _ in sorted(scores.items(), key=lambda kv: -kv[1])[:n]])
+        return result
+
+    # -- Persistence --
+    def _replace(self, name: str, write):
+        path = os.path.join(self.state_dir, name)
+        with open(path + ".tmp", "wb") as f:
+            write(f)
+        os.replace(path + ".tmp", path)
+
+    def save(self):
+        # Centroids, counts and absorbed rows share state.npz, so they are replaced together
+        os.makedirs(self.state_dir, exist_ok=True)
+        terms = {"doc_freq": self.doc_freq, "cluster_doc_freq": self.cluster_doc_freq}
+        self._replace("terms.json", lambda f: f.write(json.dumps(terms, ensure_ascii=False).encode("utf-8")))
+        state = {
+            "counts": self.counts,
+            "cluster_docs": self.cluster_docs,
+            "absorbed": np.packbits(self.absorbed),
+            "n_rows": np.int64(len(self.absorbed)),
+        }
+        if self.centroids is not None:
+            state["centroids"] = self.centroids
+        self._replace("state.npz", lambda f: np.savez(f, **state))
+        meta = {**self.meta, "n_clusters": self.n_clusters, "random_state": self.random_state}
+        self._replace("meta.json", lambda f: f.write(json.dumps(meta, indent=4).encode("utf-8")))
+
+    def _load(self):
+        meta_path = os.path.join(self.state_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["n_clusters"] != self.n_clusters:
+            raise ValueError(f"State in {self.state_dir} has {meta['n_clusters']} clusters, not {self.n_clusters}")
+        self.meta = {k: meta[k] for k in ("n_seen", "updates_since_refit", "last_refit_at")}
+        with np.load(os.path.join(self.state_dir, "state.npz")) as state:
+            self.counts = state["counts"].astype(np.int64)
+            self.cluster_docs = state["cluster_docs"].astype(np.int64)
+            self.absorbed = np.unpackbits(state["absorbed"], count=int(state["n_rows"])).astype(bool)
+            if "centroids" in state:
+                self.centroids = state["centroids"].astype(np.float32)
+        terms_path = os.path.join(self.state_dir, "terms.json")
+        if os.path.exists(terms_path):
+            with open(terms_path, "r", encoding="utf-8") as f:
+                terms = json.load(f)
+            self.doc_freq = Counter(terms["doc_freq"])
+            self.cluster_doc_freq = [Counter(c) for c in terms["cluster_doc_freq"]]
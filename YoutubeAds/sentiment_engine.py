@@ -0,0 +1,208 @@
+import os
+import json
+import hashlib
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "_cache", "sentiment_cache.sqlite")
+
+# Models used in model_v0.ipynb
+MODEL_EN = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+MODEL_VI = "manhthang/vietnamese-sentiment-analysis"
+BACKENDS = ("torch", "int8", "onnx")
+BATCH_SIZE = 32
+MAX_LENGTH = 512        # tokens (the notebook cut x[:512] characters)
+
+
+def normalize_label(label: str):
+    """Model label -> positive / negative / neutral, as analyze_sentiment does."""
+    res = str(label).lower()
+    if "pos" in res:
+        return "positive"
+    elif "neg" in res:
+        return "negative"
+    else:
+        return "neutral"
+
+
+def score_key(text: str, model_key: str):
+    return hashlib.sha1((model_key + "\x1f" + text).encode("utf-8")).hexdigest()
+
+
+class ScoreCache():
+    """
+    Persistent (model, text) hash -> sentiment result store (SQLite, one file).
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get_many(self, keys: list[str]):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 900):   # SQLite parameter limit
+            chunk = unique[i:i + 900]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((k, json.loads(v)) for k, v in rows)
+        return found
+
+    def put_many(self, items: dict):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO scores VALUES (?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False)) for k, v in items.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class SentimentEngine():
+    """
+    Batched CPU inference for the sequence-classification sentiment models.
+
+    Replaces `df[col].apply(lambda x: sentiment_model(x[:512]))`:
+    - texts already scored (same model, backend and max_length) come from
+      the cache, and each distinct text is scored once;
+    - the rest are tokenized once, truncated to `max_length` tokens, sorted
+      by token length and run in batches padded only to the longest text
+      of the batch;
+    - backend "int8" applies dynamic int8 quantization to the Linear layers,
+      "onnx" runs the model exported to ONNX Runtime (needs `optimum`).
+
+    Usage:
+        engine = SentimentEngine(MODEL_VI, backend="int8")
+        df["sentiment"] = engine.labels(df["combined_text"])
+    """
+    def __init__(self,
+        model_name: str = MODEL_EN,
+        backend: str = "torch",
+        batch_size: int = BATCH_SIZE,
+        max_length: int = MAX_LENGTH,
+        cache: ScoreCache = None,
+        n_threads: int = None,
+        tokenizer=None,
+        model=None
+    ):
+        """
+        Arguments:
+            model_name [str]: Hugging Face model id or local path.
+            backend [str]: "torch", "int8" or "onnx".
+            batch_size [int]: Texts per forward pass.
+            max_length [int]: Token truncation length.
+            cache [ScoreCache]: Persistent cache (default file under data/_cache/).
+            n_threads [int]: torch intra-op threads (torch default if None).
+            tokenizer, model: Already loaded objects (skip from_pretrained). A torch
+                model is quantized for "int8"; "onnx" needs an ONNX Runtime model.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if backend == "onnx" and model is not None:
+            import torch
+            if isinstance(model, torch.nn.Module):
+                raise ValueError("backend 'onnx' needs an ONNX Runtime model, got a torch model")
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache = cache or ScoreCache()
+        self.n_threads = n_threads
+        self.tokenizer = tokenizer
+        self.model = model
+        self.model_key = f"{model_name}|{backend}|{max_length}"
+        self._prepared = False
+
+    def _load(self):
+        import torch
+        if self.n_threads:
+            torch.set_num_threads(self.n_threads)
+        if self.tokenizer is None:
+            from transformers import AutoTokenizer
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if self._prepared:
+            return
+        if self.model is None:
+            if self.backend == "onnx":
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                self.model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+            else:
+                from transformers import AutoModelForSequenceClassification
+                self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        if self.backend != "onnx":
+            # Loaded or injected alike, so "int8" cache entries only ever hold int8 scores
+            self.model.eval()
+            if self.backend == "int8":
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        self._prepared = True
+
+    def _score(self, texts: list[str]):
+        """Model outputs for texts (no cache), in input order."""
+        import torch
+        self._load()
+        encodings = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = np.array([len(ids) for ids in encodings["input_ids"]])
+        order = np.argsort(lengths, kind="stable")
+        id2label = self.model.config.id2label
+
+        results = [None] * len(texts)
+        for start in range(0, len(texts), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            features = [{k: encodings[k][i] for k in encodings.keys()} for i in idx]
+            batch = self.tokenizer.pad(features, padding="longest", return_tensors="pt")
+            with torch.inference_mode():
+                logits = self.model(**batch).logits
+            probs = torch.softmax(logits.float(), dim=-1).numpy()
+            for i, p in zip(idx, probs):
+                best = int(p.argmax())
+                results[i] = {
+                    "label": id2label[best],
+                    "score": float(p[best]),
+                    "scores": {id2label[j]: float(p[j]) for j in range(len(p))},
+                }
+        return results
+
+    def predict(self, texts):
+        """
+        Returns:
+            results [list[dict | None]]: {label, score, scores} per text, in
+                order; None for empty / non-string texts.
+        """
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        keys = [score_key(t, self.model_key) if t.strip() else None for t in texts]
+        cached = self.cache.get_many([k for k in keys if k])
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key and key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            print(f"🧠 Score {len(missing)} / {len(texts)} texts (còn lại lấy từ cache)")
+            computed = dict(zip(missing.keys(), self._score(list(missing.values()))))
+            self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [cached[k] if k else None for k in keys]
+
+    def labels(self, texts):
+        """positive / negative / neutral per text ("neutral" for empty text)."""
+        return [normalize_label(r["label"]) if r else "neutral" for r in self.predict(texts)]
+
+    def predict_frame(self, texts):
+        """label / score / score_<label> columns, one row per text."""
+        results = self.predict(texts)
+        index = texts.index if isinstance(texts, pd.Series) else None
+        df = pd.DataFrame({
+            "sentiment": [normalize_label(r["label"]) if r else "neutral" for r in results],
+            "sentiment_score": [r["score"] if r else np.nan for r in results],
+        }, index=index)
+        scores = pd.DataFrame([r["scores"] if r else {} for r in results], index=index)
+        scores.columns = [f"score_{str(c).lower()}" for c in scores.columns]
+        return pd.concat([df, scores], axis=1)
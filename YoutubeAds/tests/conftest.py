@@ -0,0 +1,5 @@
+import os
+import sys
+
+# YoutubeAds modules import each other by plain name (from youtube_api import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
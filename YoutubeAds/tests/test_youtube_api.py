@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import youtube_api
+from youtube_api import LocalYouTubeService, QuotaExceededError, QuotaTracker, YouTubeClient
+
+
+def make_video(video_id):
+    return {
+        "id": video_id,
+        "snippet": {"title": f"Video {video_id}", "publishedAt": "2025-11-01T00:00:00Z", "channelId": "UC1"},
+        "statistics": {"viewCount": "10", "commentCount": "2"},
+        "contentDetails": {"duration": "PT1M", "caption": "false"},
+    }
+
+
+class FrozenClock():
+    """Stands in for youtube_api.datetime; `utc` is the current instant."""
+    def __init__(self, utc):
+        self.utc = utc
+
+    def now(self, tz=None):
+        return self.utc.astimezone(tz) if tz else self.utc
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    frozen = FrozenClock(datetime(2025, 11, 7, 12, 0, tzinfo=timezone.utc))
+    monkeypatch.setattr(youtube_api, "datetime", frozen)
+    return frozen
+
+
+@pytest.fixture
+def service():
+    videos = {f"v{i:03d}": make_video(f"v{i:03d}") for i in range(120)}
+    return LocalYouTubeService(videos, {"PL1": list(videos)}, page_size=50)
+
+
+def test_get_videos_batches_by_50(service):
+    client = YouTubeClient(service=service, quota=QuotaTracker(path=""))
+    ids = [f"v{i:03d}" for i in range(120)] + ["v000", "deleted"]
+
+    videos = client.get_videos(ids)
+
+    batches = [call[1] for call in service.calls if call[0] == "videos.list"]
+    assert [len(b) for b in batches] == [50, 50, 21]    # 120 known + 1 unknown id, duplicate dropped
+    assert list(videos) == [f"v{i:03d}" for i in range(120)]
+    assert client.quota.by_call == {"videos.list": 3}
+
+
+def test_local_service_rejects_more_than_50_ids(service):
+    with pytest.raises(ValueError):
+        service.videos().list(part="snippet", id=",".join(f"v{i:03d}" for i in range(51))).execute()
+
+
+def test_playlist_paging_charges_one_unit_per_page(service):
+    client = YouTubeClient(service=service, quota=QuotaTracker(path=""))
+
+    video_ids = client.get_playlist_video_ids("PL1")
+
+    assert len(video_ids) == 120
+    assert [call[2] for call in service.calls] == [None, "50", "100"]
+    assert client.quota.summary()["by_call"] == {"playlistItems.list": 3}
+    assert client.quota.used == 3
+
+
+def test_quota_exceeded_before_the_call(service):
+    client = YouTubeClient(service=service, quota=QuotaTracker(daily_budget=2, path=""))
+
+    with pytest.raises(QuotaExceededError):
+        client.get_videos([f"v{i:03d}" for i in range(120)])
+
+    # The third batch is refused before reaching the service
+    assert len(service.calls) == 2
+    assert client.quota.used == 2 and client.quota.remaining == 0
+
+
+def test_quota_costs_per_call_type():
+    quota = QuotaTracker(daily_budget=250, path="")
+    quota.charge("search.list", calls=2)
+    quota.charge("videos.list")
+
+    assert quota.by_call == {"search.list": 200, "videos.list": 1}
+    with pytest.raises(QuotaExceededError):
+        quota.charge("search.list")
+    assert quota.used == 201
+
+
+def test_quota_persisted_within_the_pacific_day(tmp_path, clock):
+    path = str(tmp_path / "quota.json")
+    QuotaTracker(path=path).charge("videos.list", calls=5)
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["day"] == "2025-11-07"
+    assert QuotaTracker(path=path).used == 5
+
+
+def test_quota_resets_at_pacific_midnight(tmp_path, clock):
+    path = str(tmp_path / "quota.json")
+    # 07:30 UTC on Nov 7 is still Nov 6 in Los Angeles (PST, UTC-8)
+    clock.utc = datetime(2025, 11, 7, 7, 30, tzinfo=timezone.utc)
+    quota = QuotaTracker(path=path)
+    quota.charge("videos.list", calls=7)
+    assert quota.day == "2025-11-06"
+
+    # 08:30 UTC is 00:30 Pacific: a new quota day, even though the UTC date is unchanged
+    clock.utc = datetime(2025, 11, 7, 8, 30, tzinfo=timezone.utc)
+    quota.charge("videos.list")
+    assert quota.summary() == {"day": "2025-11-07", "used": 1, "remaining": 9_999, "by_call": {"videos.list": 1}}
+
+    # A saved counter of an earlier Pacific day is not carried over
+    clock.utc = datetime(2025, 11, 8, 9, 0, tzinfo=timezone.utc)
+    assert QuotaTracker(path=path).used == 0
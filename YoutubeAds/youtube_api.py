@@ -0,0 +1,233 @@
+import os
+import json
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# ========================
+# CONFIG
+# ========================
+API_KEY = os.environ.get("YOUTUBE_API_KEY", "")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(BASE_DIR, "data", "_state")
+DAILY_QUOTA = 10_000            # default YouTube Data API v3 project quota
+MAX_IDS_PER_CALL = 50           # videos.list accepts up to 50 ids
+VIDEO_PARTS = "snippet,statistics,contentDetails,status"
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")   # quota resets at midnight Pacific time
+
+# Quota units per call type (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "videos.list": 1,
+    "playlistItems.list": 1,
+    "commentThreads.list": 1,
+    "comments.list": 1,
+    "channels.list": 1,
+    "search.list": 100,
+}
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised before a call that would go over the daily quota budget."""
+
+
+class QuotaTracker():
+    """
+    Counts quota units per call type against a daily budget and persists
+    the running total, so separate runs on the same day share one budget.
+    The counter resets when the Pacific-time date changes, like the API quota.
+    """
+    def __init__(self, daily_budget: int = DAILY_QUOTA, path: str = None):
+        self.daily_budget = daily_budget
+        self.path = path if path is not None else os.path.join(STATE_DIR, "quota.json")
+        self._lock = threading.Lock()
+        self.day = self._today()
+        self.used = 0
+        self.by_call = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("day") == self.day:
+                self.used = state.get("used", 0)
+                self.by_call = state.get("by_call", {})
+
+    @property
+    def remaining(self):
+        return self.daily_budget - self.used
+
+    def charge(self, call_type: str, calls: int = 1):
+        """Reserve quota for `calls` calls of `call_type`, or raise QuotaExceededError."""
+        units = QUOTA_COSTS.get(call_type, 1) * calls
+        with self._lock:
+            if self._today() != self.day:
+                self.day, self.used, self.by_call = self._today(), 0, {}
+            if self.used + units > self.daily_budget:
+                raise QuotaExceededError(
+                    f"{call_type} needs {units} units, {self.daily_budget - self.used} left today"
+                )
+            self.used += units
+            self.by_call[call_type] = self.by_call.get(call_type, 0) + units
+            self._save()
+
+    def summary(self):
+        return {"day": self.day, "used": self.used, "remaining": self.remaining, "by_call": dict(self.by_call)}
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"day": self.day, "used": self.used, "by_call": self.by_call}, f, indent=4)
+
+    @staticmethod
+    def _today():
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def video_record(video_id: str, video_info: dict):
+    """Flatten a videos.list item into the playlist_data.json video fields."""
+    snippet = video_info["snippet"]
+    statistics = video_info.get("statistics", {})
+    content_details = video_info.get("contentDetails", {})
+    return {
+        "video_id": video_id,
+        "title": snippet.get("title"),
+        "description": snippet.get("description"),
+        "publishedAt": snippet.get("publishedAt"),
+        "channelId": snippet.get("channelId"),
+        "channelTitle": snippet.get("channelTitle"),
+        "tags": snippet.get("tags", []),
+        "viewCount": statistics.get("viewCount"),
+        "likeCount": statistics.get("likeCount"),
+        "commentCount": statistics.get("commentCount"),
+        "duration": content_details.get("duration"),
+        "caption": content_details.get("caption"),
+    }
+
+
+class YouTubeClient():
+    """
+    YouTube Data API fetch layer: one discovery client for the whole run,
+    videos.list batched by 50 ids, and quota accounting on every call.
+
+    Usage:
+        client = YouTubeClient(API_KEY)
+        video_ids = client.get_playlist_video_ids(PLAYLIST_ID)
+        videos = client.get_videos(video_ids)        # {video_id: item}
+        print(client.quota.summary())
+
+    `service` can be any object with the googleapiclient call shape
+    (e.g. LocalYouTubeService) to run without network or quota.
+    """
+    def __init__(self, api_key: str = API_KEY, quota: QuotaTracker = None, service=None):
+        if service is None:
+            from googleapiclient.discovery import build
+            service = build("youtube", "v3", developerKey=api_key, cache_discovery=False)
+        self.api_key = api_key
+        self.service = service
+        self.quota = quota or QuotaTracker()
+
+    def get_playlist_video_ids(self, playlist_id: str):
+        videos = []
+        next_page_token = None
+        while True:
+            self.quota.charge("playlistItems.list")
+            response = self.service.playlistItems().list(
+                part="contentDetails",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=next_page_token
+            ).execute()
+
+            for item in response["items"]:
+                videos.append(item["contentDetails"]["videoId"])
+
+            next_page_token = response.get("nextPageToken")
+            if not next_page_token:
+                break
+        return videos
+
+    def get_videos(self, video_ids: list[str], part: str = VIDEO_PARTS):
+        """
+        Fetch video resources in batches of 50 ids per videos.list call.
+
+        Returns:
+            videos [dict]: video_id -> item, in input order; ids the API
+                does not return (deleted / private) are left out.
+        """
+        found = {}
+        unique_ids = list(dict.fromkeys(video_ids))
+        for i in range(0, len(unique_ids), MAX_IDS_PER_CALL):
+            batch = unique_ids[i:i + MAX_IDS_PER_CALL]
+            self.quota.charge("videos.list")
+            response = self.service.videos().list(part=part, id=",".join(batch), maxResults=len(batch)).execute()
+            for item in response.get("items", []):
+                found[item["id"]] = item
+        return {vid: found[vid] for vid in unique_ids if vid in found}
+
+    def get_video_info(self, video_id: str, part: str = VIDEO_PARTS):
+        """Single-video helper with the notebook's signature semantics (None if missing)."""
+        return self.get_videos([video_id], part).get(video_id)
+
+    def get_video_records(self, video_ids: list[str]):
+        videos = self.get_videos(video_ids)
+        return [video_record(vid, item) for vid, item in videos.items()]
+
+
+# ========================
+# Local stand-in of the API
+# ========================
+class _Request():
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class _Resource():
+    def __init__(self, handler):
+        self._handler = handler
+
+    def list(self, **kwargs):
+        return _Request(self._handler(**kwargs))
+
+
+class LocalYouTubeService():
+    """
+    In-memory stand-in for `build("youtube", "v3", ...)` serving
+    videos.list and playlistItems.list from local data, e.g.
+
+        videos = {v["id"]: v for v in items}     # videos.list items
+        service = LocalYouTubeService(videos, {"PL...": list(videos)})
+        client = YouTubeClient(service=service, quota=QuotaTracker(path=""))
+
+    `calls` records every request so tests can check batching.
+    """
+    def __init__(self, videos: dict, playlists: dict = None, page_size: int = 50):
+        self.videos_data = videos
+        self.playlists = playlists or {}
+        self.page_size = page_size
+        self.calls = []
+
+    def videos(self):
+        return _Resource(self._videos_list)
+
+    def playlistItems(self):
+        return _Resource(self._playlist_items_list)
+
+    def _videos_list(self, part, id, **kwargs):
+        ids = id.split(",")
+        if len(ids) > MAX_IDS_PER_CALL:
+            raise ValueError("videos.list accepts at most 50 ids")
+        self.calls.append(("videos.list", ids))
+        return {"items": [self.videos_data[i] for i in ids if i in self.videos_data]}
+
+    def _playlist_items_list(self, part, playlistId, maxResults=50, pageToken=None, **kwargs):
+        self.calls.append(("playlistItems.list", playlistId, pageToken))
+        ids = self.playlists.get(playlistId, [])
+        start = int(pageToken or 0)
+        page = ids[start:start + min(maxResults, self.page_size)]
+        response = {"items": [{"contentDetails": {"videoId": vid}} for vid in page]}
+        if start + len(page) < len(ids):
+            response["nextPageToken"] = str(start + len(page))
+        return response
@@ -0,0 +1,220 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from youtube_api import API_KEY, QuotaExceededError, QuotaTracker
+
+# ========================
+# CONFIG
+# ========================
+COMMENT_THREADS_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
+MAX_WORKERS = 8             # số video crawl song song
+REQUESTS_PER_SECOND = 10    # giới hạn tốc độ chung cho mọi luồng
+MAX_RETRIES = 5
+RETRY_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}   # quotaExceeded is not retried: it lasts until the daily reset
+NO_COMMENTS_REASONS = {"commentsDisabled", "videoNotFound"}
+
+
+class CommentFetchError(RuntimeError):
+    """A commentThreads page could not be fetched (non-retryable error, or retries exhausted)."""
+    def __init__(self, video_id: str, message: str, status: int = None, reason: str = None):
+        super().__init__(f"Error fetching comments for {video_id}: {message}")
+        self.video_id = video_id
+        self.status = status
+        self.reason = reason
+
+
+class RateLimiter():
+    """Token bucket shared by all worker threads."""
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_comment_threads(data: dict):
+    """commentThreads.list page -> notebook comment dicts (with nested replies)."""
+    comments = []
+    for item in data.get("items", []):
+        top_comment_snippet = item["snippet"]["topLevelComment"]["snippet"]
+        top_comment = {
+            "id": item["snippet"]["topLevelComment"].get("id") or item.get("id"),
+            "author": top_comment_snippet.get("authorDisplayName"),
+            "text": top_comment_snippet.get("textDisplay"),
+            "likeCount": top_comment_snippet.get("likeCount"),
+            "publishedAt": top_comment_snippet.get("publishedAt"),
+            "replies": []
+        }
+
+        # Get replies
+        replies = item.get("replies", {}).get("comments", [])
+        for reply in replies:
+            reply_snippet = reply["snippet"]
+            top_comment["replies"].append({
+                "id": reply.get("id"),
+                "author": reply_snippet.get("authorDisplayName"),
+                "text": reply_snippet.get("textDisplay"),
+                "likeCount": reply_snippet.get("likeCount"),
+                "publishedAt": reply_snippet.get("publishedAt"),
+            })
+
+        comments.append(top_comment)
+    return comments
+
+
+def _error_reason(response):
+    try:
+        return response.json()["error"]["errors"][0]["reason"]
+    except Exception:
+        return ""
+
+
+class CommentCrawler():
+    """
+    Concurrent commentThreads crawler: many videos are paged in parallel
+    over one pooled session, under a global request rate and the shared
+    daily quota. 5xx and 403 rate-limit errors are retried with
+    exponential backoff. An exhausted quota (quotaExceeded) fails fast with
+    QuotaExceededError and stops the whole crawl; any other failed page
+    raises CommentFetchError for that video only.
+
+    Usage:
+        crawler = CommentCrawler(API_KEY)
+        comments_by_video, errors = crawler.crawl(video_ids)   # {video_id: [comment, ...]}, {video_id: error}
+    """
+    def __init__(self,
+        api_key: str = API_KEY,
+        quota: QuotaTracker = None,
+        session: requests.Session = None,
+        max_workers: int = MAX_WORKERS,
+        rate: float = REQUESTS_PER_SECOND,
+        max_retries: int = MAX_RETRIES,
+        timeout: int = 10
+    ):
+        self.api_key = api_key
+        self.quota = quota or QuotaTracker()
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def fetch_page(self, video_id: str, page_token: str = None, max_results: int = 100, order: str = None):
+        """
+        One commentThreads.list page (raw JSON); an empty page when the video
+        has no accessible comments (disabled or not found).
+
+        Raises:
+            QuotaExceededError: the daily quota is exhausted.
+            CommentFetchError: any other error, or retries exhausted.
+        """
+        params = {
+            "part": "snippet,replies",
+            "videoId": video_id,
+            "maxResults": max_results,
+            "textFormat": "plainText",
+            "key": self.api_key
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        if order:
+            params["order"] = order
+
+        for attempt in range(self.max_retries + 1):
+            self.quota.charge("commentThreads.list")
+            self.limiter.acquire()
+            try:
+                response = self.session.get(COMMENT_THREADS_URL, params=params, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                if attempt == self.max_retries:
+                    raise CommentFetchError(video_id, str(e)) from e
+                time.sleep(2 ** attempt)
+                continue
+
+            if response.status_code == 200:
+                return response.json()
+
+            reason = _error_reason(response)
+            if reason == "quotaExceeded":
+                raise QuotaExceededError(f"API quota exhausted while crawling {video_id}")
+            if reason in NO_COMMENTS_REASONS:
+                return {"items": []}
+            retryable = response.status_code >= 500 or (response.status_code == 403 and reason in RETRY_REASONS)
+            if not retryable or attempt == self.max_retries:
+                raise CommentFetchError(video_id, response.text, response.status_code, reason)
+            time.sleep(2 ** attempt)
+
+    def iter_pages(self, video_id: str, page_token: str = None, order: str = None):
+        """Yield (page_json, next_page_token) until the last page; fetch errors are raised."""
+        while True:
+            data = self.fetch_page(video_id, page_token, order=order)
+            page_token = data.get("nextPageToken")
+            yield data, page_token
+            if not page_token:
+                return
+
+    def get_video_comments(self, video_id: str):
+        """All comments of one video, same structure as the notebook."""
+        comments = []
+        for data, _ in self.iter_pages(video_id):
+            comments.extend(parse_comment_threads(data))
+        return comments
+
+    def crawl(self, video_ids: list[str], fetch=None):
+        """
+        Crawl many videos concurrently.
+
+        A video whose fetch fails is reported in `errors` and the others go
+        on; a QuotaExceededError also cancels the videos not started yet.
+        Either way the results of the finished videos are returned.
+
+        Arguments:
+            video_ids [list[str]]: Videos to crawl.
+            fetch [callable]: Per-video function (default get_video_comments).
+
+        Returns:
+            results [dict]: video_id -> fetch(video_id) result of the finished videos, in input order.
+            errors [dict]: video_id -> QuotaExceededError / CommentFetchError of the failed videos.
+        """
+        fetch = fetch or self.get_video_comments
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(fetch, vid): vid for vid in video_ids}
+            for done, future in enumerate(as_completed(futures), 1):
+                vid = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    results[vid] = future.result()
+                except (QuotaExceededError, CommentFetchError) as e:
+                    errors[vid] = e
+                    print(f"❌ {done}/{len(video_ids)} video: {vid} ({e})")
+                    if isinstance(e, QuotaExceededError):
+                        for other in futures:
+                            other.cancel()
+                    continue
+                print(f"💬 {done}/{len(video_ids)} video: {vid} ({len(results[vid])} comments)")
+        if len(results) + len(errors) < len(video_ids):
+            print(f"⏹️ {len(video_ids) - len(results) - len(errors)} video(s) cancelled")
+        return {vid: results[vid] for vid in video_ids if vid in results}, errors
@@ -0,0 +1,296 @@
+import os
+import csv
+import json
+import hashlib
+
+import pandas as pd
+
+# ========================
+# Layout of one date partition (e.g. data/2025-10-31/)
+# ========================
+VIDEOS_FILE = "videos.ndjson"       # one JSON object per line, video fields without comments (n_comments is derived)
+COMMENTS_FILE = "comments.csv"
+REPLIES_FILE = "replies.csv"
+COMMENT_COLUMNS = ["comment_id", "video_id", "position", "author", "text", "likeCount", "publishedAt", "n_replies"]
+REPLY_COLUMNS = ["reply_id", "comment_id", "video_id", "position", "author", "text", "likeCount", "publishedAt"]
+CHUNKSIZE = 50_000
+
+
+def comment_key(parent: str, comment: dict):
+    """
+    Stable id of a comment (parent = video_id) or reply (parent = comment_id):
+    the YouTube comment id when the crawl kept it, so edited comments keep
+    their id. Legacy playlist_data.json files carry no API ids and fall
+    back to a hash of author, date and text.
+    """
+    if comment.get("id"):
+        return str(comment["id"])
+    raw = "\x1f".join([parent, str(comment.get("author")), str(comment.get("publishedAt")), str(comment.get("text"))])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _csv_writer(filepath: str, fieldnames: list[str]):
+    is_new = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    f = open(filepath, "a", newline="", encoding="utf-8-sig" if is_new else "utf-8")
+    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+    if is_new:
+        writer.writeheader()
+    return f, writer
+
+
+class PlaylistStoreWriter():
+    """
+    Incremental writer of the normalized playlist format: each video is
+    appended as one NDJSON line and its comments / replies as rows of the
+    comments and replies tables, so nothing is held in memory and an
+    interrupted crawl keeps every video written so far.
+
+    Appending the same video again (e.g. an incremental sync delta) is
+    allowed: readers merge its record into the earlier ones field by field
+    and keep the last row of every comment / reply key. Comments appended
+    later are newer (sync deltas come newest first, like a full crawl), so
+    they are numbered before the stored ones and every video's thread
+    stays in one newest-first order.
+
+    Usage:
+        with PlaylistStoreWriter("data/2025-10-31") as store:
+            for data in records:          # playlist_data.json-style dicts
+                store.write_video(data)
+    """
+    def __init__(self, save_dir: str):
+        os.makedirs(save_dir, exist_ok=True)
+        self.save_dir = save_dir
+        # First (lowest) comment position already stored for each video
+        self._first_position = {}
+        for chunk in iter_comment_chunks(save_dir, "comments", ["video_id", "position"]):
+            for vid, position in chunk.groupby("video_id")["position"].min().items():
+                self._first_position[vid] = min(int(position), self._first_position.get(vid, int(position)))
+        self._videos = open(os.path.join(save_dir, VIDEOS_FILE), "a", encoding="utf-8")
+        self._comments_file, self._comments = _csv_writer(os.path.join(save_dir, COMMENTS_FILE), COMMENT_COLUMNS)
+        self._replies_file, self._replies = _csv_writer(os.path.join(save_dir, REPLIES_FILE), REPLY_COLUMNS)
+
+    def write_video(self, data: dict):
+        video_id = data["video_id"]
+        comments = data.get("comments") or []
+        video = {k: v for k, v in data.items() if k not in ("comments", "n_comments")}
+        self._videos.write(json.dumps(video, ensure_ascii=False) + "\n")
+
+        start = self._first_position.get(video_id, len(comments)) - len(comments)
+        if comments:
+            self._first_position[video_id] = start
+        comment_rows, reply_rows = [], []
+        for position, c in enumerate(comments, start):
+            comment_id = comment_key(video_id, c)
+            replies = c.get("replies") or []
+            comment_rows.append({**c, "comment_id": comment_id, "video_id": video_id,
+                                 "position": position, "n_replies": len(replies)})
+            for reply_position, r in enumerate(replies):
+                reply_rows.append({**r, "reply_id": comment_key(comment_id, r), "comment_id": comment_id,
+                                   "video_id": video_id, "position": reply_position})
+        self._comments.writerows(comment_rows)
+        self._replies.writerows(reply_rows)
+        self.flush()
+
+    def flush(self):
+        for f in (self._videos, self._comments_file, self._replies_file):
+            f.flush()
+
+    def close(self):
+        for f in (self._videos, self._comments_file, self._replies_file):
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_playlist_json(json_path: str, save_dir: str = None):
+    """Convert a legacy playlist_data.json into the normalized format (same folder by default)."""
+    save_dir = save_dir or os.path.dirname(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with PlaylistStoreWriter(save_dir) as store:
+        for video in data:
+            store.write_video(video)
+    return save_dir
+
+
+# ========================
+# Streaming readers
+# ========================
+def _partitions(save_dir):
+    """One partition folder or a list of them (oldest first) -> list."""
+    return [save_dir] if isinstance(save_dir, str) else list(save_dir)
+
+
+def _video_filter(video_ids):
+    if video_ids is None:
+        return None
+    video_ids = list(video_ids)
+    return lambda chunk: chunk["video_id"].isin(video_ids)
+
+
+def iter_videos(save_dir: str):
+    """Yield video dicts one line at a time."""
+    with open(os.path.join(save_dir, VIDEOS_FILE), "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _comment_counts(save_dirs: list[str], video_ids=None):
+    """Distinct comment_ids per video over the comments tables of save_dirs."""
+    seen, counts = set(), {}
+    for save_dir in save_dirs:
+        for chunk in iter_comment_chunks(save_dir, "comments", ["comment_id", "video_id"], _video_filter(video_ids)):
+            chunk = chunk.drop_duplicates("comment_id")
+            chunk = chunk[~chunk["comment_id"].isin(seen)]
+            seen.update(chunk["comment_id"])
+            for vid, n in chunk["video_id"].value_counts().items():
+                counts[vid] = counts.get(vid, 0) + int(n)
+    return pd.Series(counts, dtype="int64")
+
+
+def read_videos(save_dir, columns: list[str] = None, video_ids=None):
+    """
+    Videos table, one row per video_id. Records appended for the same video
+    are merged field by field (a delta without `transcript` keeps the stored
+    one); n_comments counts the video's rows in the comments table.
+
+    Arguments:
+        save_dir [str | list[str]]: Partition folder, or several partitions
+            oldest first (records merged across them in that order).
+        columns [list[str]]: Columns to return (all by default).
+        video_ids [list[str]]: Only these videos (all by default).
+    """
+    save_dirs = _partitions(save_dir)
+    wanted = None if video_ids is None else set(video_ids)
+    merged = {}
+    for partition in save_dirs:
+        for video in iter_videos(partition):
+            if wanted is None or video["video_id"] in wanted:
+                merged.setdefault(video["video_id"], {}).update(video)
+    df = pd.DataFrame(list(merged.values())) if merged else pd.DataFrame(columns=["video_id"])
+    df["video_id"] = df["video_id"].astype(str)
+    if columns is None or "n_comments" in columns:
+        n_comments = _comment_counts(save_dirs, wanted)
+        df["n_comments"] = df["video_id"].map(n_comments).fillna(0).astype(int)
+    return df[columns] if columns else df
+
+
+def iter_comment_chunks(save_dir: str, table: str = "comments", columns: list[str] = None,
+                        filters=None, chunksize: int = CHUNKSIZE):
+    """
+    Stream the comments or replies table in DataFrame chunks.
+
+    Arguments:
+        table [str]: "comments" or "replies".
+        columns [list[str]]: Columns to parse (all by default).
+        filters [callable]: chunk -> boolean mask, applied per chunk.
+    """
+    filename = COMMENTS_FILE if table == "comments" else REPLIES_FILE
+    path = os.path.join(save_dir, filename)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, encoding="utf-8-sig",
+                             dtype={"video_id": str, "comment_id": str, "reply_id": str, "text": str, "author": str}):
+        if filters is not None:
+            chunk = chunk[filters(chunk)]
+        yield chunk
+
+
+def _read_partition_comments(save_dir: str, include_replies: bool, columns: list[str], video_ids):
+    filters = _video_filter(video_ids)
+    comments = pd.concat(list(iter_comment_chunks(save_dir, "comments", columns, filters)) or [pd.DataFrame(columns=columns)])
+    comments = comments.drop_duplicates("comment_id", keep="last")
+    comments["reply_position"] = -1
+    comments["is_reply"] = False
+    if not include_replies:
+        return comments.sort_values(["video_id", "position"], kind="stable").reset_index(drop=True)
+
+    replies = pd.concat(list(iter_comment_chunks(save_dir, "replies", columns + ["reply_id"], filters))
+                        or [pd.DataFrame(columns=columns + ["reply_id"])])
+    replies = replies.drop_duplicates("reply_id", keep="last").drop(columns="reply_id")
+    # Replies sort right after their parent comment
+    replies = replies.rename(columns={"position": "reply_position"}).merge(
+        comments[["comment_id", "position"]], on="comment_id", how="inner"
+    )
+    replies["is_reply"] = True
+    out = pd.concat([comments, replies[comments.columns]], ignore_index=True)
+    out = out.sort_values(["video_id", "position", "reply_position"], kind="stable")
+    return out.reset_index(drop=True)
+
+
+def read_comments(save_dir, include_replies: bool = True, columns: list[str] = None, video_ids=None):
+    """
+    Comments (and replies) as one long table in thread order: each comment
+    followed by its replies, `is_reply` marks replies. Duplicate keys from
+    repeated appends keep the last row.
+
+    `save_dir` may also be a list of partitions, oldest first: newer
+    partitions hold newer comments, so their threads come first, and a
+    comment stored in several partitions is taken (with its replies) from
+    the newest one. `video_ids` restricts the tables while they are read.
+    """
+    base = ["comment_id", "video_id", "position", "text"]
+    columns = list(dict.fromkeys(base + (columns or [])))
+    save_dirs = _partitions(save_dir)
+    if len(save_dirs) == 1:
+        return _read_partition_comments(save_dirs[0], include_replies, columns, video_ids)
+
+    df = pd.concat([
+        _read_partition_comments(partition, include_replies, columns, video_ids).assign(_partition=rank)
+        for rank, partition in enumerate(save_dirs)
+    ], ignore_index=True)
+    df = df[df["_partition"] == df.groupby("comment_id")["_partition"].transform("max")]
+    df = df.sort_values(["video_id", "_partition", "position", "reply_position"],
+                        ascending=[True, False, True, True], kind="stable")
+    return df.drop(columns="_partition").reset_index(drop=True)
+
+
+def comments_text(save_dir, video_ids=None):
+    """
+    Vectorized `flatten_comments`: all comment and reply texts of each video
+    joined with spaces, in thread order. Videos without comments get "".
+    `save_dir` may be a list of partitions, as in read_comments.
+    """
+    if video_ids is None:
+        video_ids = read_videos(save_dir, ["video_id"])["video_id"]
+    df = read_comments(save_dir, video_ids=video_ids)
+    joined = df["text"].fillna("").groupby(df["video_id"], sort=False).agg(" ".join)
+    return pd.Series(video_ids).map(joined).fillna("").rename("comments_text").values
+
+
+def aggregate_comments(save_dir: str, filters=None, chunksize: int = CHUNKSIZE):
+    """
+    Per-video comment statistics computed chunk by chunk:
+    n_comments, n_replies, comment_likes, first_comment_at, last_comment_at.
+    `filters` (chunk -> mask) applies to both tables, e.g.
+    lambda c: c["publishedAt"] >= "2025-10-01".
+    Repeated keys are counted once (first occurrence).
+    """
+    parts = []
+    for table, key in (("comments", "comment_id"), ("replies", "reply_id")):
+        seen = set()
+        for chunk in iter_comment_chunks(save_dir, table, [key, "video_id", "likeCount", "publishedAt"], filters, chunksize):
+            chunk = chunk.drop_duplicates(key)
+            chunk = chunk[~chunk[key].isin(seen)]
+            seen.update(chunk[key])
+            g = chunk.groupby("video_id")
+            parts.append(pd.DataFrame({
+                "n_comments": g.size() if table == "comments" else 0,
+                "n_replies": g.size() if table == "replies" else 0,
+                "comment_likes": g["likeCount"].sum(),
+                "first_comment_at": g["publishedAt"].min(),
+                "last_comment_at": g["publishedAt"].max(),
+            }))
+    if not parts:
+        return pd.DataFrame(columns=["n_comments", "n_replies", "comment_likes", "first_comment_at", "last_comment_at"])
+    stats = pd.concat(parts).groupby(level=0).agg({
+        "n_comments": "sum", "n_replies": "sum", "comment_likes": "sum",
+        "first_comment_at": "min", "last_comment_at": "max",
+    })
+    stats.index.name = "video_id"
+    return stats
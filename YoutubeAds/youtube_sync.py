@@ -0,0 +1,263 @@
+import os
+import json
+import threading
+from datetime import datetime, timezone, timedelta
+
+from youtube_api import API_KEY, STATE_DIR, QuotaExceededError, QuotaTracker, YouTubeClient, video_record
+from youtube_comments import CommentCrawler, CommentFetchError, parse_comment_threads
+from youtube_transcripts import TranscriptStage, transcript_field
+from youtube_store import PlaylistStoreWriter
+
+# ========================
+# CONFIG
+# ========================
+PLAYLIST_IDS = ["PLqFfyQGXEX5rC-BKJpLY67PT3lDh684M0"]
+STATS_REFRESH_HOURS = 24    # videos.list costs 1 unit per 50 videos, so refresh everything at once
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyncState():
+    """
+    Per-playlist and per-video sync state, persisted as one JSON file.
+
+    Video entry:
+        record              last video_record() (metadata + statistics)
+        comment_watermark   newest top-level comment publishedAt already synced
+        page_token          commentThreads page to resume an interrupted pass from
+        pending_newest      newest publishedAt seen by the interrupted pass
+        transcript_fetched  transcript already stored (misses are retried by TranscriptStage)
+    """
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(STATE_DIR, "sync_state.json")
+        self._lock = threading.Lock()
+        self.playlists, self.videos, self.stats_refreshed_at = {}, {}, None
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.playlists = state.get("playlists", {})
+            self.videos = state.get("videos", {})
+            self.stats_refreshed_at = state.get("stats_refreshed_at")
+
+    def video(self, video_id: str):
+        return self.videos.setdefault(video_id, {
+            "record": None,
+            "comment_watermark": None,
+            "page_token": None,
+            "pending_newest": None,
+            "transcript_fetched": False,
+        })
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "playlists": self.playlists,
+                    "videos": self.videos,
+                    "stats_refreshed_at": self.stats_refreshed_at,
+                }, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.path)
+
+
+class YouTubeSync():
+    """
+    Incremental playlist sync. Each run only:
+
+    1. lists the playlists and fetches metadata for videos not seen before;
+    2. refreshes metadata/statistics of known videos in 50-id videos.list
+       batches, at most every `stats_refresh_hours`;
+    3. fetches comments newer than each video's watermark (order=time, so
+       paging stops at the first already-synced comment);
+    4. fetches transcripts only for videos without one, through the
+       cached TranscriptStage (misses are retried after their TTL).
+
+    The sync state only moves forward once the delta holding the data is
+    written: `run` stages every change (records, transcript flags, comment
+    watermarks), appends the delta to the store, then applies and saves
+    the staged state. If the comment crawl stops part-way (quota exhausted,
+    a page failing), the comments fetched so far are still written and the
+    unfinished videos keep their page token, so the next run resumes where
+    this one stopped; a failure before the delta is written saves nothing.
+
+    Note: the watermark is on top-level comments; new replies to an old
+    thread are not picked up.
+
+    Usage:
+        sync = YouTubeSync(YouTubeClient(API_KEY), CommentCrawler(API_KEY, quota=client.quota))
+        delta = sync.run("data/2025-10-31", PLAYLIST_IDS)    # changed videos, with only the new comments
+    """
+    def __init__(self,
+        client: YouTubeClient,
+        comments: CommentCrawler,
+        state: SyncState = None,
+        transcripts: TranscriptStage = None,
+        stats_refresh_hours: float = STATS_REFRESH_HOURS
+    ):
+        self.client = client
+        self.comments = comments
+        self.state = state or SyncState()
+        self.transcripts = transcripts or TranscriptStage()
+        self.stats_refresh_hours = stats_refresh_hours
+        self._comment_state = {}    # video_id -> comment state staged by sync_comments
+
+    # -- Videos --
+    def sync_playlists(self, playlist_ids: list[str]):
+        """Register playlist entries; returns ids never synced before."""
+        new_ids = []
+        for playlist_id in playlist_ids:
+            video_ids = self.client.get_playlist_video_ids(playlist_id)
+            known = self.state.playlists.get(playlist_id, [])
+            self.state.playlists[playlist_id] = list(dict.fromkeys(known + video_ids))
+            new_ids.extend(vid for vid in video_ids if self.state.videos.get(vid, {}).get("record") is None)
+        return list(dict.fromkeys(new_ids))
+
+    def refresh_due(self, now: datetime = None):
+        if self.state.stats_refreshed_at is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        last = datetime.strptime(self.state.stats_refreshed_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        return now - last >= timedelta(hours=self.stats_refresh_hours)
+
+    def fetch_videos(self, video_ids: list[str]):
+        """Batched metadata + statistics -> {video_id: video_record} (the state is not touched)."""
+        return {vid: video_record(vid, item) for vid, item in self.client.get_videos(video_ids).items()}
+
+    # -- Comments --
+    def sync_comments(self, video_id: str):
+        """
+        Comments newer than the video's watermark (notebook structure).
+
+        The new comment state is staged page by page in `_comment_state`,
+        with the comments it covers. The watermark only moves when paging
+        reached the last page or already-synced comments; if a page fails,
+        the staged state keeps the token of that page and the error is raised.
+        A saved resume token the API rejects (400, e.g. invalidPageToken once
+        it expired) is dropped and the pass restarts from the watermark.
+        """
+        video = self.state.video(video_id)
+        watermark = video["comment_watermark"]
+        staged = {
+            "comments": [],
+            "comment_watermark": watermark,
+            "page_token": video["page_token"],
+            "pending_newest": video["pending_newest"],
+        }
+        self._comment_state[video_id] = staged
+        newest = staged["pending_newest"]
+        resumed = staged["page_token"] is not None
+        while True:
+            try:
+                for data, next_token in self.comments.iter_pages(video_id, staged["page_token"], order="time"):
+                    resumed = False
+                    page = parse_comment_threads(data)
+                    fresh = [c for c in page if watermark is None or (c["publishedAt"] or "") > watermark]
+                    staged["comments"].extend(fresh)
+                    if fresh:
+                        newest = max(newest or "", max(c["publishedAt"] or "" for c in fresh)) or None
+                    staged["pending_newest"] = newest
+                    if len(fresh) < len(page):
+                        break   # reached already-synced comments
+                    staged["page_token"] = next_token
+                break
+            except CommentFetchError as e:
+                if not (resumed and e.status == 400):
+                    raise
+                # First page of a resumed pass rejected: its token is stale, start over
+                print(f"⚠️ Resume token of {video_id} rejected ({e.reason or e.status}), restarting its comment pass")
+                staged["page_token"], resumed = None, False
+        # Last page or already-synced comments reached: the pass is complete
+        staged.update(comment_watermark=newest or watermark, page_token=None, pending_newest=None)
+        return staged["comments"]
+
+    # -- Run --
+    def run(self, save_dir: str, playlist_ids: list[str] = PLAYLIST_IDS):
+        """
+        Sync the playlists and append the delta to the store in save_dir
+        (PlaylistStoreWriter), then save the sync state.
+
+        Raises:
+            QuotaExceededError: the quota ran out during the comment crawl
+                (raised after the partial delta and state are saved).
+
+        Returns:
+            delta [list[dict]]: playlist_data.json-style records of new or
+                changed videos. `comments` holds only the new comments and
+                `transcript` is present only when fetched in this run.
+        """
+        new_ids = self.sync_playlists(playlist_ids)
+        print(f"🔹 {len(new_ids)} new video(s) in {len(playlist_ids)} playlist(s)")
+        records = self.fetch_videos(new_ids)
+
+        stats_refreshed_at = None
+        if self.refresh_due():
+            known = [vid for vid, v in self.state.videos.items() if v["record"] is not None and vid not in records]
+            records.update(self.fetch_videos(known))
+            stats_refreshed_at = _utcnow()
+            print(f"📊 Refreshed statistics of {len(known)} video(s)")
+
+        synced = list(records) + [vid for vid, v in self.state.videos.items()
+                                  if v["record"] is not None and vid not in records]
+        pending = [vid for vid in synced if not self.state.video(vid)["transcript_fetched"]]
+        transcripts = self.transcripts.get_many(pending)
+
+        self._comment_state = {}
+        _, errors = self.comments.crawl(synced, fetch=self.sync_comments)
+
+        # Delta of everything fetched, including the comments of unfinished passes
+        changed = {vid: {} for vid in records}
+        for vid, transcript_text in transcripts.items():
+            if vid in changed or transcript_text:
+                changed.setdefault(vid, {})["transcript"] = transcript_field(transcript_text)
+        for vid, staged in self._comment_state.items():
+            if staged["comments"]:
+                changed.setdefault(vid, {})["comments"] = staged["comments"]
+
+        delta = []
+        for vid, extra in changed.items():
+            data = dict(records.get(vid) or self.state.videos[vid]["record"])
+            if "transcript" in extra:
+                data["transcript"] = extra["transcript"]
+            data["comments"] = extra.get("comments", [])
+            delta.append(data)
+        with PlaylistStoreWriter(save_dir) as store:
+            for data in delta:
+                store.write_video(data)
+
+        # The delta is on disk: the staged state can move forward
+        for vid, record in records.items():
+            self.state.video(vid)["record"] = record
+        if stats_refreshed_at:
+            self.state.stats_refreshed_at = stats_refreshed_at
+        for vid, transcript_text in transcripts.items():
+            self.state.video(vid)["transcript_fetched"] = transcript_text is not None
+        for vid, staged in self._comment_state.items():
+            self.state.video(vid).update({k: v for k, v in staged.items() if k != "comments"})
+        self.state.save()
+
+        if errors:
+            print(f"⚠️ {len(errors)} video(s) with unfinished comments, resumed next run")
+        for error in errors.values():
+            if isinstance(error, QuotaExceededError):
+                raise error
+        return delta
+
+
+def main():
+    quota = QuotaTracker()
+    client = YouTubeClient(API_KEY, quota=quota)
+    sync = YouTubeSync(client, CommentCrawler(API_KEY, quota=quota))
+
+    today = datetime.today().strftime("%Y-%m-%d")
+    save_dir = os.path.join("data", today)
+    delta = sync.run(save_dir, PLAYLIST_IDS)
+
+    print(f"✅ Saved {len(delta)} changed video(s) in folder: {save_dir}")
+    print(f"Quota: {quota.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "_cache", "transcripts.sqlite")
+LANGUAGES = ("en", "vi")
+MAX_WORKERS = 8
+NO_TRANSCRIPT = "No transcript available"
+
+# Retry-after for negative results; doubled on every consecutive miss, capped at MAX_RETRY_TTL
+MISSING_TTL = 7 * 24 * 3600     # no transcript in these languages / captions disabled
+ERROR_TTL = 3600                # network error, rate limit, ...
+MAX_RETRY_TTL = 30 * 24 * 3600
+MISSING_ERRORS = {"TranscriptsDisabled", "NoTranscriptFound", "VideoUnavailable", "NoTranscriptAvailable"}
+
+
+def fetch_transcript(video_id: str, languages=LANGUAGES):
+    """Transcript text joined like the notebook's get_transcript; errors are raised."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=list(languages))
+    return " ".join([line["text"] for line in transcript])
+
+
+def transcript_field(text):
+    """Value for the playlist_data `transcript` field."""
+    return text if text else NO_TRANSCRIPT
+
+
+class TranscriptCache():
+    """
+    Persistent (video_id, languages) -> transcript store (SQLite, one file).
+    Negative results are stored with a retry_after timestamp instead of
+    as transcript text.
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "video_id TEXT, languages TEXT, status TEXT, text TEXT, error TEXT, "
+            "attempts INTEGER, fetched_at REAL, retry_after REAL, "
+            "PRIMARY KEY (video_id, languages))"
+        )
+        self.conn.commit()
+
+    def get_many(self, video_ids: list[str], languages: str):
+        """video_id -> row dict for cached entries."""
+        found = {}
+        unique = list(dict.fromkeys(video_ids))
+        with self._lock:
+            for i in range(0, len(unique), 900):   # SQLite parameter limit
+                chunk = unique[i:i + 900]
+                rows = self.conn.execute(
+                    "SELECT video_id, status, text, error, attempts, fetched_at, retry_after FROM transcripts "
+                    f"WHERE languages = ? AND video_id IN ({','.join('?' * len(chunk))})", [languages] + chunk
+                )
+                for vid, status, text, error, attempts, fetched_at, retry_after in rows:
+                    found[vid] = {
+                        "status": status, "text": text, "error": error, "attempts": attempts,
+                        "fetched_at": fetched_at, "retry_after": retry_after,
+                    }
+        return found
+
+    def put(self, video_id: str, languages: str, entry: dict):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_id, languages, entry["status"], entry["text"], entry["error"],
+                 entry["attempts"], entry["fetched_at"], entry["retry_after"])
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class TranscriptStage():
+    """
+    Cached, parallel transcript fetching.
+
+    - Transcripts found once are never fetched again.
+    - A failure is stored with a retry-after time (MISSING_TTL when the
+      video has no transcript in `languages`, ERROR_TTL for other errors,
+      doubled per consecutive failure) and the video is skipped until then.
+    - Remaining videos are fetched by a thread pool; each result is
+      written to the cache as soon as it arrives.
+
+    Usage:
+        stage = TranscriptStage()
+        transcripts = stage.get_many(video_ids)       # {video_id: text | None}
+        data["transcript"] = transcript_field(transcripts[vid])
+    """
+    def __init__(self,
+        cache: TranscriptCache = None,
+        fetcher=fetch_transcript,
+        languages=LANGUAGES,
+        max_workers: int = MAX_WORKERS
+    ):
+        """
+        Arguments:
+            cache [TranscriptCache]: Persistent cache (default file under data/_cache/).
+            fetcher [callable]: fetcher(video_id, languages) -> text, raising on failure.
+            languages [tuple[str]]: Preferred languages, part of the cache key.
+            max_workers [int]: Parallel fetches.
+        """
+        self.cache = cache or TranscriptCache()
+        self.fetcher = fetcher
+        self.languages = tuple(languages)
+        self.languages_key = ",".join(self.languages)
+        self.max_workers = max_workers
+
+    def _fetch(self, video_id: str):
+        try:
+            return self.fetcher(video_id, self.languages), None
+        except Exception as e:
+            return None, e
+
+    def _entry(self, text, error, previous: dict, now: float):
+        if error is None and text:
+            return {"status": "ok", "text": text, "error": None, "attempts": 0, "fetched_at": now, "retry_after": None}
+        status = "missing" if error is None or type(error).__name__ in MISSING_ERRORS else "error"
+        attempts = (previous or {}).get("attempts", 0) + 1
+        ttl = min((MISSING_TTL if status == "missing" else ERROR_TTL) * 2 ** (attempts - 1), MAX_RETRY_TTL)
+        return {
+            "status": status, "text": None, "error": type(error).__name__ if error else None,
+            "attempts": attempts, "fetched_at": now, "retry_after": now + ttl,
+        }
+
+    def get_many(self, video_ids: list[str], now: float = None):
+        """
+        Returns:
+            transcripts [dict]: video_id -> text, or None when there is no
+                transcript (yet), in input order.
+        """
+        now = time.time() if now is None else now
+        cached = self.cache.get_many(video_ids, self.languages_key)
+        results, todo = {}, []
+        for vid in dict.fromkeys(video_ids):
+            entry = cached.get(vid)
+            if entry and (entry["status"] == "ok" or entry["retry_after"] > now):
+                results[vid] = entry["text"]
+            else:
+                todo.append(vid)
+
+        if todo:
+            print(f"📝 Fetch {len(todo)} / {len(results) + len(todo)} transcripts (còn lại lấy từ cache)")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._fetch, vid): vid for vid in todo}
+                for future in as_completed(futures):
+                    vid = futures[future]
+                    text, error = future.result()
+                    entry = self._entry(text, error, cached.get(vid), now)
+                    self.cache.put(vid, self.languages_key, entry)
+                    results[vid] = entry["text"]
+
+        return {vid: results[vid] for vid in dict.fromkeys(video_ids)}
+
+    def get(self, video_id: str):
+        return self.get_many([video_id])[video_id]
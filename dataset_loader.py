@@ -0,0 +1,239 @@
+import os
+import re
+import glob
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pandas as pd
+
+# Partition folders follow the crawler layout: <pipeline>/<root>/YYYY-MM-DD/<file>
+PARTITION_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Supported row filter operators: (column, op, value)
+FILTER_OPS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+    "contains": lambda s, v: s.astype(str).str.contains(v, regex=False, na=False),
+}
+
+
+def _to_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+class DatasetLoader():
+    """
+    Loader for the date-partitioned data folders shared by the pipelines
+    (e.g. JobAds/data/2025-11-07/, YoutubeAds/data/2025-10-31/).
+    Only partitions inside the requested date range are opened, only the
+    requested columns are parsed, and row filters are applied chunk by chunk
+    while reading so filtered-out rows are never materialized.
+
+    Usage:
+        loader = DatasetLoader("YoutubeAds")
+        df = loader.load(
+            "playlist_data_clean.csv",
+            start="2025-10-01", end="2025-10-31",
+            columns=["video_id", "combined_text"],
+            filters=[("viewCount", ">", 1000)],
+        )
+    """
+    def __init__(self,
+        base_dir: str,
+        root: str = "data",
+        max_workers: int = 4,
+        cache_size: int = 32,
+        chunksize: int = 50_000
+    ):
+        """
+        Arguments:
+            base_dir [str]: Pipeline folder (JobAds, YoutubeAds, ...).
+            root [str]: Sub-folder holding the YYYY-MM-DD partitions
+                ("data" or "merged_data").
+            max_workers [int]: Number of partitions read in parallel.
+            cache_size [int]: Number of parsed partitions kept in memory.
+            chunksize [int]: Rows per CSV chunk when filters are pushed down.
+        """
+        self.base_dir = base_dir
+        self.root = root
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.chunksize = chunksize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def list_partitions(self, start=None, end=None):
+        """
+        List partition dates available on disk, pruned to [start, end].
+
+        Arguments:
+            start [str | date | None]: First date to include (YYYY-MM-DD).
+            end [str | date | None]: Last date to include (YYYY-MM-DD).
+
+        Returns:
+            partitions [list[str]]: Sorted partition folder names.
+        """
+        start, end = _to_date(start), _to_date(end)
+        root_dir = os.path.join(self.base_dir, self.root)
+        if not os.path.isdir(root_dir):
+            return []
+
+        partitions = []
+        for name in os.listdir(root_dir):
+            if not PARTITION_RE.match(name) or not os.path.isdir(os.path.join(root_dir, name)):
+                continue
+            day = _to_date(name)
+            if start and day < start:
+                continue
+            if end and day > end:
+                continue
+            partitions.append(name)
+        return sorted(partitions)
+
+    def list_files(self, pattern: str, start=None, end=None):
+        """
+        Resolve a file name or glob (e.g. "job_data_page_*.csv") in every
+        partition of the date range.
+
+        Returns:
+            files [list[tuple[str, str]]]: (partition, path) pairs.
+        """
+        files = []
+        for partition in self.list_partitions(start, end):
+            part_dir = os.path.join(self.base_dir, self.root, partition)
+            for path in sorted(glob.glob(os.path.join(part_dir, pattern))):
+                files.append((partition, path))
+        return files
+
+    def load(self,
+        pattern: str,
+        start=None,
+        end=None,
+        columns: list[str] = None,
+        filters: list[tuple] = None,
+        add_partition: bool = True
+    ):
+        """
+        Load and concatenate every matching file in the date range.
+
+        Arguments:
+            pattern [str]: File name or glob inside each partition (.csv or .json).
+            start, end [str | date | None]: Inclusive date range.
+            columns [list[str] | None]: Columns to return (None = all).
+            filters [list[tuple] | None]: Row filters (column, op, value),
+                combined with AND. op is one of FILTER_OPS.
+            add_partition [bool]: Add a "partition_date" column.
+
+        Returns:
+            df [pd.DataFrame]: Loaded rows.
+        """
+        filters = [tuple(f) for f in (filters or [])]
+        for _, op, _ in filters:
+            if op not in FILTER_OPS:
+                raise ValueError(f"Unsupported filter operator: {op}")
+
+        files = self.list_files(pattern, start, end)
+        if not files:
+            return pd.DataFrame(columns=list(columns or []))
+
+        def read(item):
+            partition, path = item
+            df = self._read_cached(path, columns, filters)
+            if add_partition:
+                df = df.assign(partition_date=partition)
+            return df
+
+        if self.max_workers > 1 and len(files) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(files))) as pool:
+                frames = list(pool.map(read, files))
+        else:
+            frames = [read(item) for item in files]
+
+        return pd.concat(frames, ignore_index=True)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    # -- Internal helpers --
+    def _read_cached(self, path: str, columns, filters):
+        stat = os.stat(path)
+        key = (
+            path, stat.st_mtime_ns, stat.st_size,
+            tuple(columns) if columns is not None else None,
+            repr(filters),
+        )
+        # Callers get a copy, so changing a returned frame never alters the cache
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key].copy()
+
+        df = self._read_file(path, columns, filters)
+
+        with self._lock:
+            self._cache[key] = df
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return df.copy()
+
+    def _read_file(self, path: str, columns, filters):
+        # Read filter columns too, then project them away after filtering
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys(list(columns) + [f[0] for f in filters]))
+
+        if path.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            if isinstance(records, dict):
+                records = [records]
+            df = pd.DataFrame(records)
+            if needed is not None:
+                df = df[[c for c in needed if c in df.columns]]
+            df = self._apply_filters(df, filters)
+        elif filters:
+            usecols = lambda c: needed is None or c in needed
+            chunks = pd.read_csv(path, usecols=usecols, encoding="utf-8-sig", chunksize=self.chunksize)
+            frames = [self._apply_filters(chunk, filters) for chunk in chunks]
+            # A header-only file yields no chunk: keep its columns, with no rows
+            df = (pd.concat(frames, ignore_index=True) if frames
+                  else pd.read_csv(path, usecols=usecols, encoding="utf-8-sig", nrows=0))
+        else:
+            df = pd.read_csv(path, usecols=lambda c: needed is None or c in needed, encoding="utf-8-sig")
+
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _apply_filters(df: pd.DataFrame, filters):
+        if not filters or df.empty:
+            return df
+        mask = pd.Series(True, index=df.index)
+        for col, op, value in filters:
+            if col not in df.columns:
+                # Missing column: no row of this file can satisfy the predicate
+                return df.iloc[0:0]
+            mask &= FILTER_OPS[op](df[col], value)
+        return df[mask]
+
+
+def load_dataset(base_dir: str, pattern: str, **kwargs):
+    """Shortcut: DatasetLoader(base_dir).load(pattern, **kwargs)."""
+    root = kwargs.pop("root", "data")
+    return DatasetLoader(base_dir, root=root).load(pattern, **kwargs)
@@ -0,0 +1,491 @@
+import os
+import sys
+import json
+import hashlib
+import inspect
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(BASE_DIR, "data", "_pipeline", "state.json")
+MAX_WORKERS = 4
+
+
+class Stage():
+    """
+    One pipeline step: `func(**params)` reads `inputs` and writes `outputs`
+    (files or directories). Dependencies between stages are inferred from
+    paths: a stage depends on every stage producing one of its inputs.
+    """
+    def __init__(self,
+        name: str,
+        func,
+        inputs: list[str] = (),
+        outputs: list[str] = (),
+        params: dict = None,
+        code: list[str] = (),
+        always_run: bool = False
+    ):
+        """
+        Arguments:
+            name [str]: Unique stage name.
+            func [callable]: Stage body, called as func(**params).
+            inputs / outputs [list[str]]: Paths read / written by the stage.
+            params [dict]: JSON-serializable arguments (part of the fingerprint).
+            code [list[str]]: Source files the stage relies on besides `func`
+                itself; editing them invalidates the stage.
+            always_run [bool]: Run on every invocation (e.g. crawlers, whose
+                input is the outside world).
+        """
+        self.name = name
+        self.func = func
+        self.inputs = [os.path.abspath(p) for p in inputs]
+        self.outputs = [os.path.abspath(p) for p in outputs]
+        self.params = params or {}
+        self.code = [os.path.abspath(p) for p in code]
+        self.always_run = always_run
+
+
+def _contains(parent: str, path: str):
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+class Pipeline():
+    """
+    Content-hash-cached DAG runner.
+
+    A stage's fingerprint is the hash of its function source, the listed
+    code files, its params and the content of its inputs. A stage is skipped
+    when its fingerprint matches the last successful run and its outputs
+    exist; after a small crawl only stages whose inputs actually changed
+    run again. Stages whose dependencies are done run in parallel threads.
+
+    File hashes are cached by (size, mtime) so unchanged inputs are not
+    re-read on every run.
+
+    Usage:
+        pipeline = Pipeline(youtube_stages("2025-10-31"))
+        pipeline.run()                       # {stage: "ran" | "skipped" | "failed" | "blocked"}
+        pipeline.run(force=["yt_sentiment"])
+    """
+    def __init__(self, stages: list[Stage], state_path: str = STATE_PATH, max_workers: int = MAX_WORKERS):
+        names = [s.name for s in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        self.stages = {s.name: s for s in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.state = {"stages": {}, "files": {}}
+        if os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.deps = {
+            s.name: sorted({
+                other.name for other in stages if other is not s
+                and any(_contains(o, i) or _contains(i, o) for i in s.inputs for o in other.outputs)
+            })
+            for s in stages
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in pipeline at stage {name!r}")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    # -- Fingerprints --
+    def _file_hash(self, path: str):
+        stat = os.stat(path)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        with self._lock:
+            cached = self.state["files"].get(path)
+        if cached and cached["stamp"] == stamp:
+            return cached["sha1"]
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._lock:
+            self.state["files"][path] = {"stamp": stamp, "sha1": digest}
+        return digest
+
+    def _path_hash(self, path: str):
+        if os.path.isdir(path):
+            h = hashlib.sha1()
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full = os.path.join(root, name)
+                    h.update(os.path.relpath(full, path).encode("utf-8"))
+                    h.update(self._file_hash(full).encode("ascii"))
+            return h.hexdigest()
+        if os.path.exists(path):
+            return self._file_hash(path)
+        return "missing"
+
+    def fingerprint(self, stage: Stage):
+        h = hashlib.sha1()
+        try:
+            h.update(inspect.getsource(stage.func).encode("utf-8"))
+        except (OSError, TypeError):
+            h.update(stage.func.__code__.co_code)
+        for path in stage.code:
+            h.update(self._path_hash(path).encode("ascii"))
+        h.update(json.dumps(stage.params, sort_keys=True, default=str).encode("utf-8"))
+        for path in stage.inputs:
+            h.update(path.encode("utf-8"))
+            h.update(self._path_hash(path).encode("ascii"))
+        return h.hexdigest()
+
+    def is_fresh(self, stage: Stage, fingerprint: str):
+        if stage.always_run:
+            return False
+        last = self.state["stages"].get(stage.name, {})
+        return last.get("fingerprint") == fingerprint and all(os.path.exists(p) for p in stage.outputs)
+
+    def _save_state(self):
+        with self._lock:
+            dirname = os.path.dirname(self.state_path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            with open(self.state_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=4)
+            os.replace(self.state_path + ".tmp", self.state_path)
+
+    # -- Execution --
+    def _select(self, targets):
+        """Targets plus everything upstream of them."""
+        if not targets:
+            return set(self.stages)
+        selected, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in selected:
+                selected.add(name)
+                todo.extend(self.deps[name])
+        return selected
+
+    def _execute(self, stage: Stage, force: bool):
+        fingerprint = self.fingerprint(stage)
+        if not force and self.is_fresh(stage, fingerprint):
+            return "skipped"
+        print(f"▶️ {stage.name}")
+        stage.func(**stage.params)
+        with self._lock:
+            # Fingerprint taken before the run: inputs changed meanwhile rerun next time
+            self.state["stages"][stage.name] = {
+                "fingerprint": fingerprint,
+                "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        self._save_state()
+        return "ran"
+
+    def run(self, targets: list[str] = None, force: list[str] = ()):
+        """
+        Arguments:
+            targets [list[str]]: Stages to bring up to date (all by default),
+                together with their upstream stages.
+            force [list[str]]: Stages to run even if their fingerprint matches.
+
+        Returns:
+            status [dict]: stage -> "ran" / "skipped" / "failed" / "blocked".
+        """
+        selected = self._select(targets)
+        status = {}
+        pending = {name: set(self.deps[name]) & selected for name in selected}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while pending or running:
+                for name in [n for n, deps in pending.items() if not deps]:
+                    del pending[name]
+                    running[pool.submit(self._execute, self.stages[name], name in force)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ {name}: {e!r}")
+                        status[name] = "failed"
+                    if status[name] == "failed":
+                        blocked = self._downstream(name) & set(pending)
+                        for b in blocked:
+                            status[b] = "blocked"
+                            del pending[b]
+                    else:
+                        for deps in pending.values():
+                            deps.discard(name)
+        self._save_state()
+        print("📋 " + ", ".join(f"{k}: {v}" for k, v in status.items()))
+        return status
+
+    def _downstream(self, name: str):
+        found, todo = set(), [name]
+        while todo:
+            current = todo.pop()
+            for other, deps in self.deps.items():
+                if current in deps and other not in found:
+                    found.add(other)
+                    todo.append(other)
+        return found
+
+
+# ========================
+# Stage bodies
+# ========================
+def _use_folder(name: str):
+    """Make the flat modules of a pipeline folder (YoutubeAds/, Newspaper/) importable."""
+    path = os.path.join(BASE_DIR, name)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def yt_crawl(day: str, playlist_ids: list[str]):
+    _use_folder("YoutubeAds")
+    from youtube_api import API_KEY, QuotaTracker, YouTubeClient
+    from youtube_comments import CommentCrawler
+    from youtube_sync import YouTubeSync
+
+    quota = QuotaTracker()
+    sync = YouTubeSync(YouTubeClient(API_KEY, quota=quota), CommentCrawler(API_KEY, quota=quota))
+    sync.run(os.path.join(BASE_DIR, "YoutubeAds", "data", day), playlist_ids)
+
+
+def _yt_partitions():
+    """Every YoutubeAds store partition, oldest first."""
+    from dataset_loader import DatasetLoader
+    from youtube_store import VIDEOS_FILE
+
+    yt_dir = os.path.join(BASE_DIR, "YoutubeAds")
+    dirs = [os.path.join(yt_dir, "data", p) for p in DatasetLoader(yt_dir).list_partitions()]
+    return [d for d in dirs if os.path.exists(os.path.join(d, VIDEOS_FILE))]
+
+
+def _yt_delta_ids(day: str):
+    """Videos new or changed in the `day` partition (the sync delta)."""
+    from youtube_store import read_videos
+    return read_videos(os.path.join(BASE_DIR, "YoutubeAds", "data", day), ["video_id"])["video_id"].tolist()
+
+
+# The YouTube feature stages upsert the videos of the day's delta into the one
+# FeatureStore (keyed by video_id), each video rebuilt from every partition, so
+# rerunning any day gives the same rows.
+def yt_clean(day: str):
+    _use_folder("YoutubeAds")
+    from text_cleaning import clean_youtube_series, english_stopwords
+    from youtube_store import read_videos, comments_text
+    from feature_store import FeatureStore
+
+    partitions = _yt_partitions()
+    df = read_videos(partitions, ["video_id", "title", "description", "tags"], video_ids=_yt_delta_ids(day))
+    df["tags_text"] = df["tags"].apply(lambda x: " ".join(x) if isinstance(x, list) else "")
+    df["comments_text"] = comments_text(partitions, df["video_id"])
+
+    stopwords = english_stopwords()
+    for col in ["title", "description", "tags_text", "comments_text"]:
+        df[col] = clean_youtube_series(df[col], stopwords)
+    df["combined_text"] = df["title"] + " " + df["description"] + " " + df["tags_text"] + " " + df["comments_text"]
+
+    store = FeatureStore()
+    clean = df.rename(columns={"title": "title_clean", "description": "description_clean"})
+    store.write("clean", clean[["video_id", "title_clean", "description_clean", "tags_text", "comments_text", "combined_text"]])
+    store.compact("clean")
+
+
+def yt_sentiment(day: str, model_name: str, backend: str):
+    _use_folder("YoutubeAds")
+    from feature_store import FeatureStore
+    from sentiment_engine import SentimentEngine
+
+    store = FeatureStore()
+    df = store.read(["combined_text"], video_ids=_yt_delta_ids(day))
+    df["sentiment"] = SentimentEngine(model_name, backend=backend).labels(df["combined_text"])
+    store.write("sentiment", df[["video_id", "sentiment"]])
+    store.compact("sentiment")
+
+
+def yt_comment_sentiment(day: str, model_name: str, backend: str):
+    _use_folder("YoutubeAds")
+    from comment_sentiment import video_comment_sentiment
+    from feature_store import FeatureStore
+    from sentiment_engine import SentimentEngine
+
+    engine = SentimentEngine(model_name, backend=backend)
+    _, per_video = video_comment_sentiment(_yt_partitions(), engine, video_ids=_yt_delta_ids(day))
+    store = FeatureStore()
+    store.write("comment_sentiment", per_video)
+    store.compact("comment_sentiment")
+
+
+def yt_cluster(day: str):
+    _use_folder("YoutubeAds")
+    from embedding_store import EmbeddingStore
+    from feature_store import FeatureStore
+    from online_clustering import OnlineAdClusterer, infer_ad_labels
+
+    store = FeatureStore()
+    embeddings = EmbeddingStore()
+    clusterer = OnlineAdClusterer()
+    # Full refit over every stored video (all cluster ids are rewritten), else the day's delta
+    refit = clusterer.refit_due
+    df = store.read(["combined_text"]) if refit else store.read(["combined_text"], video_ids=_yt_delta_ids(day))
+    X = embeddings.encode(df["combined_text"])
+    rows = [embeddings.index[k] for k in embeddings.keys(df["combined_text"])]
+    if refit:
+        df["cluster"] = clusterer.refit(X, df["combined_text"], rows=rows)
+    else:
+        # Embeddings absorbed by an earlier run (or a rerun of this one) are only assigned
+        df["cluster"] = clusterer.partial_fit(X, df["combined_text"], rows=rows)
+    clusterer.save()
+    df["ad_type"] = infer_ad_labels(df["combined_text"], df["cluster"])
+    for family in ("cluster", "ad_type"):
+        store.write(family, df[["video_id", family]])
+        store.compact(family)
+
+
+def news_crawl():
+    _use_folder("Newspaper")
+    from crawl_cafef_incremental import IncrementalNewsCrawler
+    IncrementalNewsCrawler().run()
+
+
+def news_preprocess(day: str):
+    _use_folder("Newspaper")
+    import pandas as pd
+    from unidecode import unidecode
+    from text_cleaning import clean_vietnamese_series
+    from entity_matcher import EntityMatcher
+    from tokenization import Tokenizer
+
+    data_dir = os.path.join(BASE_DIR, "Newspaper", "data", day)
+    df = pd.read_csv(os.path.join(data_dir, "cafef_news.csv"))
+    df = df[["category", "title", "content", "link"]].dropna(subset=["title", "content"]).reset_index(drop=True)
+    df["title_clean"] = clean_vietnamese_series(df["title"])
+    df["content_clean"] = clean_vietnamese_series(df["content"])
+    EntityMatcher.from_listing().annotate(df)
+    tokenizer = Tokenizer()
+    df["title_tok"] = tokenizer.tokenize_series(df["title_clean"])
+    df["content_tok"] = tokenizer.tokenize_series(df["content_clean"])
+    df["title_noaccent"] = df["title_clean"].apply(unidecode)
+    df["content_noaccent"] = df["content_clean"].apply(unidecode)
+    df.to_csv(os.path.join(data_dir, "cafef_preprocessed.csv"), index=False, encoding="utf-8-sig")
+
+
+def news_tfidf(day: str):
+    _use_folder("Newspaper")
+    import pandas as pd
+    from tfidf_incremental import IncrementalTfidfStore
+
+    df = pd.read_csv(os.path.join(BASE_DIR, "Newspaper", "data", day, "cafef_preprocessed.csv"))
+    for field in ("title_tok", "content_tok"):
+        IncrementalTfidfStore(field).append(df[field], ids=df["link"])
+
+
+# ========================
+# Flows
+# ========================
+def youtube_stages(day: str, playlist_ids: list[str] = None, model_name: str = None, backend: str = "torch",
+                   crawl: bool = True):
+    """
+    crawl -> clean -> (sentiment | comment sentiment | cluster + ad_type) for the
+    videos of one date partition, upserted into the shared FeatureStore.
+    """
+    _use_folder("YoutubeAds")
+    from feature_store import STORE_DIR
+    from sentiment_engine import MODEL_VI
+    from youtube_sync import PLAYLIST_IDS
+
+    yt = lambda *p: os.path.join(BASE_DIR, "YoutubeAds", *p)
+    data_dir = yt("data", day)
+    store_files = [os.path.join(data_dir, f) for f in ("videos.ndjson", "comments.csv", "replies.csv")]
+    features = lambda family: os.path.join(STORE_DIR, family)
+    store_code = [yt("youtube_store.py"), yt("feature_store.py")]
+    model = {"day": day, "model_name": model_name or MODEL_VI, "backend": backend}
+
+    stages = [
+        Stage("yt_clean", yt_clean, inputs=store_files, outputs=[features("clean")], params={"day": day},
+              code=[os.path.join(BASE_DIR, "text_cleaning.py")] + store_code),
+        Stage("yt_sentiment", yt_sentiment, inputs=[features("clean"), store_files[0]], outputs=[features("sentiment")],
+              params=model, code=[yt("sentiment_engine.py")] + store_code),
+        Stage("yt_comment_sentiment", yt_comment_sentiment, inputs=store_files,
+              outputs=[features("comment_sentiment")], params=model,
+              code=[yt("comment_sentiment.py"), yt("sentiment_engine.py")] + store_code),
+        Stage("yt_cluster", yt_cluster, inputs=[features("clean"), store_files[0]],
+              outputs=[features("cluster"), features("ad_type")], params={"day": day},
+              code=[yt("embedding_store.py"), yt("online_clustering.py")] + store_code),
+    ]
+    if crawl:
+        stages.insert(0, Stage("yt_crawl", yt_crawl, outputs=store_files,
+                               params={"day": day, "playlist_ids": playlist_ids or PLAYLIST_IDS},
+                               code=[yt("youtube_sync.py"), yt("youtube_comments.py")], always_run=True))
+    return stages
+
+
+def news_stages(day: str, crawl: bool = True):
+    """
+    crawl_cafef -> preprocessing_cafef -> incremental TF-IDF for one date partition.
+
+    Raises:
+        ValueError: crawl is on and day is not today (the crawler only writes
+            today's partition; use crawl=False to reprocess another day).
+    """
+    today = datetime.today().strftime("%Y-%m-%d")
+    if crawl and day != today:
+        raise ValueError(f"news_crawl writes today's partition ({today}), not {day}: run with --no-crawl")
+    np_ = lambda *p: os.path.join(BASE_DIR, "Newspaper", *p)
+    raw = np_("data", day, "cafef_news.csv")
+    processed = np_("data", day, "cafef_preprocessed.csv")
+    stages = [
+        Stage("news_preprocess", news_preprocess, inputs=[raw], outputs=[processed], params={"day": day},
+              code=[os.path.join(BASE_DIR, "text_cleaning.py"), np_("entity_matcher.py"),
+                    np_("stock_listing.csv"), np_("tokenization.py")]),
+        Stage("news_tfidf", news_tfidf, inputs=[processed], outputs=[np_("data", "_tfidf")], params={"day": day},
+              code=[np_("tfidf_incremental.py")]),
+    ]
+    if crawl:
+        stages.insert(0, Stage("news_crawl", news_crawl, outputs=[raw],
+                               code=[np_("crawl_cafef_incremental.py"), np_("cafef_listing.py"), np_("cafef_content.py")],
+                               always_run=True))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the YouTube / news pipelines with stage caching.")
+    parser.add_argument("flows", nargs="*", default=["youtube", "news"], choices=["youtube", "news"])
+    parser.add_argument("--day", default=datetime.today().strftime("%Y-%m-%d"))
+    parser.add_argument("--no-crawl", action="store_true", help="Only process data already on disk")
+    parser.add_argument("--force", nargs="*", default=[], help="Stages to rerun regardless of fingerprints")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    stages = []
+    if "youtube" in args.flows:
+        stages += youtube_stages(args.day, crawl=not args.no_crawl)
+    if "news" in args.flows:
+        try:
+            stages += news_stages(args.day, crawl=not args.no_crawl)
+        except ValueError as e:
+            parser.error(str(e))
+    Pipeline(stages, max_workers=args.workers).run(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
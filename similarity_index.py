@@ -0,0 +1,264 @@
+import os
+import json
+from collections import defaultdict
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+N_TABLES = 8        # số bảng băm LSH
+N_BITS = 16         # số bit mỗi bảng
+BATCH_SIZE = 2048
+COLUMN_CHUNK = 16_384   # feature columns projected at a time (~16 MB per hash temporary at 128 planes)
+
+
+def _splitmix64(x: np.ndarray):
+    # Wrap-around uint64 arithmetic is intended here
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def projection_rows(columns: np.ndarray, n_hyperplanes: int, seed: int = 0):
+    """
+    ±1 random hyperplane coefficients for the given feature columns,
+    derived from a hash of (seed, column, hyperplane). Nothing is stored,
+    so the same index works for 2**20 hashed TF-IDF features or 384-d
+    embeddings without a dense projection matrix.
+    """
+    cols = columns.astype(np.uint64)[:, None]
+    planes = np.arange(n_hyperplanes, dtype=np.uint64)[None, :]
+    with np.errstate(over="ignore"):
+        h = _splitmix64(cols * np.uint64(n_hyperplanes) + planes + np.uint64(seed) * np.uint64(0x632BE59BD9B4E019))
+    return np.where(h >> np.uint64(63), 1.0, -1.0).astype(np.float32)
+
+
+class SimilarityIndex():
+    """
+    Persistent approximate nearest-neighbour index (random-projection LSH
+    with cosine re-ranking) over news articles, job ads and video ads.
+
+    Every item carries a (source, id) pair, e.g. ("cafef", link),
+    ("topcv", job_id), ("youtube", video_id). All vectors must live in
+    the same space; for text that is e.g. the CafeF hashing TF-IDF store:
+
+        store = IncrementalTfidfStore("content_tok")
+        index = SimilarityIndex()
+        for ids, X in store.iter_tfidf():                  # one memory-mapped shard at a time
+            index.add(X, ids, source="cafef")
+        index.add(store.transform(jobs["jd"]), jobs["job_id"], source="topcv")
+        index.save("data/_ann")
+        index.query(store.transform([suspicious_jd])[0], k=10, sources=["cafef"])
+
+    Candidates are the items sharing a bucket with the query in any table
+    (plus one-bit-flip neighbour buckets when there are too few), then
+    ranked by exact cosine similarity. If there are still fewer than k
+    candidates, every item is scored.
+    """
+    def __init__(self, n_tables: int = N_TABLES, n_bits: int = N_BITS, seed: int = 0):
+        """
+        Arguments:
+            n_tables [int]: Number of hash tables (more = better recall).
+            n_bits [int]: Hyperplanes per table (more = smaller buckets).
+            seed [int]: Seed of the hyperplane hash.
+        """
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.keys = np.zeros((0, n_tables), dtype=np.uint64)
+        self.ids = []
+        self.sources = []
+        self.vectors = None
+        self.sparse = None      # storage type, fixed by the first add()
+        self.buckets = [defaultdict(list) for _ in range(n_tables)]
+        self._item_pos = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    # -- Hashing --
+    def signatures(self, X):
+        """
+        Bucket key of every row of X in every table: uint64 (n_rows, n_tables).
+
+        Rows go in blocks of BATCH_SIZE and the used feature columns of a
+        block in chunks of COLUMN_CHUNK, so peak memory does not grow with
+        the vocabulary of a sparse batch.
+        """
+        n_planes = self.n_tables * self.n_bits
+        weights = (np.uint64(1) << np.arange(self.n_bits, dtype=np.uint64))
+        out = np.zeros((X.shape[0], self.n_tables), dtype=np.uint64)
+        for start in range(0, X.shape[0], BATCH_SIZE):
+            block = X[start:start + BATCH_SIZE]
+            proj = np.zeros((block.shape[0], n_planes), dtype=np.float32)
+            if sp.issparse(block):
+                block = block.tocsr()
+                cols = np.unique(block.indices)
+                sub = block[:, cols].tocsc()
+                for c in range(0, len(cols), COLUMN_CHUNK):
+                    proj += np.asarray(sub[:, c:c + COLUMN_CHUNK] @ projection_rows(cols[c:c + COLUMN_CHUNK], n_planes, self.seed))
+            else:
+                block = np.asarray(block, dtype=np.float32)
+                for c in range(0, block.shape[1], COLUMN_CHUNK):
+                    cols = np.arange(c, min(c + COLUMN_CHUNK, block.shape[1]))
+                    proj += block[:, cols] @ projection_rows(cols, n_planes, self.seed)
+            bits = (proj > 0).reshape(-1, self.n_tables, self.n_bits).astype(np.uint64)
+            out[start:start + BATCH_SIZE] = (bits * weights).sum(axis=2, dtype=np.uint64)
+        return out
+
+    # -- Updates --
+    def _as_storage(self, X):
+        """X as float32 in the index's storage type (sparse CSR or dense)."""
+        if self.sparse:
+            return sp.csr_matrix(X, dtype=np.float32)
+        return X.astype(np.float32).toarray() if sp.issparse(X) else np.asarray(X, dtype=np.float32)
+
+    def add(self, X, ids, source: str):
+        """
+        Add vectors incrementally; an existing (source, id) is replaced.
+        The first call fixes the storage type (sparse or dense); later
+        inputs are converted to it.
+
+        Arguments:
+            X [csr_matrix | np.ndarray]: One row per item.
+            ids [iterable]: Item ids within the source.
+            source [str]: Source name ("cafef", "topcv", "youtube", ...).
+        """
+        ids = [str(i) for i in ids]
+        if X.shape[0] != len(ids):
+            raise ValueError(f"Got {X.shape[0]} vectors for {len(ids)} ids")
+        if self.vectors is not None and X.shape[1] != self.vectors.shape[1]:
+            raise ValueError(f"Vector size {X.shape[1]} does not match index size {self.vectors.shape[1]}")
+
+        replaced = [self._item_pos[(source, i)] for i in ids if (source, i) in self._item_pos]
+        if replaced:
+            self.remove(positions=replaced)
+
+        if self.sparse is None:
+            self.sparse = bool(sp.issparse(X))
+        X = normalize(self._as_storage(X))
+        keys = self.signatures(X)
+        offset = len(self.ids)
+        for row, key_row in enumerate(keys):
+            for table, key in enumerate(key_row):
+                self.buckets[table][int(key)].append(offset + row)
+            self._item_pos[(source, ids[row])] = offset + row
+
+        self.keys = np.vstack([self.keys, keys])
+        self.ids.extend(ids)
+        self.sources.extend([source] * len(ids))
+        if self.vectors is None:
+            self.vectors = X
+        elif self.sparse:
+            self.vectors = sp.vstack([self.vectors, X], format="csr")
+        else:
+            self.vectors = np.vstack([self.vectors, X])
+
+    def remove(self, positions: list[int]):
+        """Drop items by position and rebuild the bucket tables."""
+        keep = np.setdiff1d(np.arange(len(self.ids)), np.asarray(positions, dtype=np.int64))
+        self.keys = self.keys[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self.sources = [self.sources[i] for i in keep]
+        self.vectors = self.vectors[keep]
+        self._rebuild_buckets()
+
+    # -- Queries --
+    def query(self, vector, k: int = 10, sources: list[str] = None, min_candidates: int = None):
+        """
+        Top-k most similar items.
+
+        Arguments:
+            vector [1-row csr_matrix | 1-d array]: Query vector.
+            k [int]: Number of results.
+            sources [list[str] | None]: Only return items of these sources.
+            min_candidates [int]: Probe neighbour buckets until at least this
+                many candidates are found (default 4 * k).
+
+        Returns:
+            results [list[tuple[str, str, float]]]: (source, id, cosine), best first.
+        """
+        if not self.ids:
+            return []
+        vector = vector if sp.issparse(vector) else np.asarray(vector)
+        q = normalize(self._as_storage(vector.reshape(1, -1)))
+        min_candidates = min_candidates or 4 * k
+        allowed = set(sources) if sources else None
+
+        q_keys = self.signatures(q)[0]
+        candidates = set()
+        for table, key in enumerate(q_keys):
+            candidates.update(self.buckets[table].get(int(key), ()))
+        if len(candidates) < min_candidates:
+            # Multi-probe: buckets at Hamming distance 1
+            for table, key in enumerate(q_keys):
+                for bit in range(self.n_bits):
+                    candidates.update(self.buckets[table].get(int(key) ^ (1 << bit), ()))
+        if allowed is not None:
+            candidates = {c for c in candidates if self.sources[c] in allowed}
+        if len(candidates) < k:
+            # Too sparse to rely on buckets (tiny index or outlier query): scan everything
+            candidates = {c for c in range(len(self.ids)) if allowed is None or self.sources[c] in allowed}
+        if not candidates:
+            return []
+
+        cand = np.fromiter(candidates, dtype=np.int64)
+        scores = self.vectors[cand] @ q.T
+        scores = scores.toarray().ravel() if sp.issparse(scores) else np.asarray(scores).ravel()
+        top = np.argsort(-scores)[:k]
+        return [(self.sources[cand[i]], self.ids[cand[i]], float(scores[i])) for i in top]
+
+    # -- Persistence --
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            "n_tables": self.n_tables, "n_bits": self.n_bits, "seed": self.seed,
+            "sparse": bool(self.sparse),
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4)
+        with open(os.path.join(path, "items.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "sources": self.sources}, f, ensure_ascii=False)
+        np.save(os.path.join(path, "keys.npy"), self.keys)
+        if meta["sparse"]:
+            sp.save_npz(os.path.join(path, "vectors.npz"), self.vectors, compressed=False)
+        elif self.vectors is not None:
+            np.save(os.path.join(path, "vectors.npy"), self.vectors)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["n_tables"], meta["n_bits"], meta["seed"])
+        with open(os.path.join(path, "items.json"), "r", encoding="utf-8") as f:
+            items = json.load(f)
+        index.ids, index.sources = items["ids"], items["sources"]
+        index.keys = np.load(os.path.join(path, "keys.npy"))
+        if index.ids:
+            index.sparse = meta["sparse"]
+        if meta["sparse"]:
+            index.vectors = sp.load_npz(os.path.join(path, "vectors.npz")).tocsr()
+        elif os.path.exists(os.path.join(path, "vectors.npy")):
+            index.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        index._rebuild_buckets()
+        return index
+
+    @classmethod
+    def from_tfidf_npz(cls, path: str, key: str, ids, source: str, **kwargs):
+        """
+        Build from the notebook's `np.savez_compressed("tfidf_vectors.npz", title=..., content=...)`.
+        """
+        X = np.load(path, allow_pickle=True)[key].item()
+        index = cls(**kwargs)
+        index.add(X, ids, source)
+        return index
+
+    def _rebuild_buckets(self):
+        self.buckets = [defaultdict(list) for _ in range(self.n_tables)]
+        self._item_pos = {}
+        for pos, key_row in enumerate(self.keys):
+            for table, key in enumerate(key_row):
+                self.buckets[table][int(key)].append(pos)
+            self._item_pos[(self.sources[pos], self.ids[pos])] = pos
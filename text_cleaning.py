@@ -0,0 +1,217 @@
+import re
+import os
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ---------- Precompiled patterns ----------
+# Newspaper/preprocessing_cafef.ipynb -> clean_vietnamese_text
+URL_RE = re.compile(r"http\S+|www\S+|https\S+")
+EMAIL_RE = re.compile(r"\S+@\S+")
+DIGITS_RE = re.compile(r"\d+")
+NEWS_KEEP = "a-zA-Z0-9áàảãạăắằẳẵặâấầẩẫậéèẻẽẹêếềểễệóòỏõọôốồổỗộơớờởỡợíìỉĩịúùủũụưứừửữựýỳỷỹỵđĐ"
+# Special-char -> " " followed by whitespace collapse, fused into one pass:
+# a run of non-kept chars becomes one space; lone spaces are left untouched
+NEWS_SEPARATOR_RE = re.compile(f"[^{NEWS_KEEP}]{{2,}}|[^{NEWS_KEEP} ]")
+
+# YoutubeAds/preprocessing_v0.ipynb -> clean_text
+LINK_RE = re.compile(r"http\S+")
+YT_SPECIAL_RE = re.compile(r"[^0-9a-zA-ZÀ-ỹ\s]")
+
+_EMOJI_RUN_RE = None
+
+DEFAULT_CHUNKSIZE = 5000
+
+
+def _emoji_run_re():
+    """
+    Runs of characters that can belong to an emoji: every non-ASCII code
+    point used in emoji.EMOJI_DATA, plus the ASCII keycap bases (0-9 # *)
+    when followed by VS16 / the keycap mark. No emoji spans a character
+    outside such a run, so emoji.replace_emoji only has to see the runs.
+    """
+    global _EMOJI_RUN_RE
+    if _EMOJI_RUN_RE is None:
+        import emoji
+        code_points = sorted({ord(c) for key in emoji.EMOJI_DATA for c in key if ord(c) > 127})
+        ranges = []
+        for cp in code_points:
+            if ranges and cp == ranges[-1][1] + 1:
+                ranges[-1][1] = cp
+            else:
+                ranges.append([cp, cp])
+        char_class = "".join(
+            re.escape(chr(lo)) if lo == hi else f"{re.escape(chr(lo))}-{re.escape(chr(hi))}"
+            for lo, hi in ranges
+        )
+        _EMOJI_RUN_RE = re.compile(r"(?:[0-9#*](?=[\ufe0f\u20e3])|[" + char_class + "])+")
+    return _EMOJI_RUN_RE
+
+
+def _replace_emoji_run(match):
+    import emoji
+    return emoji.replace_emoji(match.group(0), "")
+
+
+def english_stopwords():
+    """NLTK English stopwords, as used by the YouTube preprocessing notebook."""
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
+
+
+def _drop_stopwords(text, stopwords):
+    return " ".join([w for w in text.split() if w not in stopwords])
+
+
+def _as_text_series(series: pd.Series):
+    # object dtype keeps Python `re` semantics for every .str operation
+    series = pd.Series(series, copy=False).astype(object)
+    is_text = series.map(lambda x: isinstance(x, str)).astype(bool)
+    return series.where(is_text, "")
+
+
+# ---------- Scalar cleaners (same output as the notebooks) ----------
+def clean_vietnamese_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = URL_RE.sub("", text)
+    if "@" in text:
+        text = EMAIL_RE.sub("", text)
+    text = DIGITS_RE.sub("", text)
+    text = NEWS_SEPARATOR_RE.sub(" ", text).strip()
+    return text.lower()
+
+
+def clean_youtube_text(text, stopwords=None):
+    if not isinstance(text, str):
+        return ""
+    stopwords = english_stopwords() if stopwords is None else stopwords
+    text = _emoji_run_re().sub(_replace_emoji_run, text)
+    text = LINK_RE.sub("", text)
+    text = YT_SPECIAL_RE.sub(" ", text)
+    text = text.lower()
+    # split()/join also collapses and strips whitespace like re.sub(r"\s+", " ")
+    return _drop_stopwords(text, stopwords)
+
+
+# ---------- Vectorized cleaners ----------
+def clean_vietnamese_series(series: pd.Series):
+    """Column-wise clean_vietnamese_text over a whole Series."""
+    s = _as_text_series(series)
+    s = s.str.replace(URL_RE, "", regex=True)
+    # `\S+@\S+` backtracks on every token; only rows with "@" can match
+    has_at = s.str.contains("@", regex=False)
+    if has_at.any():
+        s = s.copy()
+        s[has_at] = s[has_at].str.replace(EMAIL_RE, "", regex=True)
+    s = s.str.replace(DIGITS_RE, "", regex=True)
+    s = s.str.replace(NEWS_SEPARATOR_RE, " ", regex=True).str.strip()
+    return s.str.lower()
+
+
+def clean_youtube_series(series: pd.Series, stopwords=None):
+    """Column-wise clean_youtube_text over a whole Series."""
+    stopwords = english_stopwords() if stopwords is None else stopwords
+    s = _as_text_series(series)
+    s = s.str.replace(_emoji_run_re(), _replace_emoji_run, regex=True)
+    s = s.str.replace(LINK_RE, "", regex=True)
+    s = s.str.replace(YT_SPECIAL_RE, " ", regex=True)
+    s = s.str.lower()
+    # One split/filter/join collapses whitespace and drops stopwords;
+    # a set lookup per token beats a stopword alternation regex here
+    return s.map(partial(_drop_stopwords, stopwords=stopwords))
+
+
+# ---------- Chunked multiprocessing ----------
+def parallel_clean(series: pd.Series, func=clean_vietnamese_series, n_jobs: int = None, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Run a vectorized cleaner over chunks of `series` in a process pool.
+
+    Arguments:
+        series [pd.Series]: Text column.
+        func [callable]: Series -> Series cleaner (must be picklable, e.g.
+            clean_vietnamese_series or partial(clean_youtube_series, stopwords=...)).
+        n_jobs [int]: Worker processes (os.cpu_count() if None).
+        chunksize [int]: Rows per chunk.
+
+    Returns:
+        cleaned [pd.Series]: Same index as the input.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(series) <= chunksize:
+        return func(series)
+
+    chunks = [series.iloc[i:i + chunksize] for i in range(0, len(series), chunksize)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        results = list(pool.map(func, chunks))
+    return pd.concat(results)
+
+
+# ---------- Benchmark ----------
+def _legacy_clean_vietnamese_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
+    text = re.sub(r"\S+@\S+", "", text)
+    text = re.sub(r"\d+", "", text)
+    text = re.sub(r"[^a-zA-Z0-9\sáàảãạăắằẳẵặâấầẩẫậéèẻẽẹêếềểễệóòỏõọôốồổỗộơớờởỡợíìỉĩịúùủũụưứừửữựýỳỷỹỵđĐ]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.lower()
+
+
+def _legacy_clean_text(text, stopwords):
+    import emoji
+    if not isinstance(text, str):
+        return ""
+    text = emoji.replace_emoji(text, "")
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^0-9a-zA-ZÀ-ỹ\s]", " ", text)
+    text = text.lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    words = [w for w in text.split() if w not in stopwords]
+    return " ".join(words)
+
+
+def _bench(name, series, legacy, vectorized, parallel):
+    rows = len(series)
+    results = {}
+    for label, fn in [("per-row apply", lambda s: s.apply(legacy)),
+                      ("vectorized", vectorized),
+                      ("multiprocess", parallel)]:
+        start = time.perf_counter()
+        results[label] = fn(series)
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<14} {rows / elapsed:>12,.0f} rows/s ({elapsed:.3f}s)")
+    expected = results["per-row apply"].tolist()
+    for label in ("vectorized", "multiprocess"):
+        assert results[label].tolist() == expected, f"{name}: {label} output differs"
+    print(f"   ✅ {name}: output identical")
+
+
+def main(repeat: int = 20):
+    """Benchmark on the checked-in CafeF and YouTube CSVs (rows repeated `repeat` times)."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    news = pd.read_csv(os.path.join(base_dir, "Newspaper", "cafef_full_data_2.csv"))
+    news_text = pd.concat([news["title"], news["content"]] * repeat, ignore_index=True)
+    print(f"📰 CafeF: {len(news_text)} texts")
+    _bench("clean_vietnamese_text", news_text, _legacy_clean_vietnamese_text,
+           clean_vietnamese_series, partial(parallel_clean, func=clean_vietnamese_series, chunksize=1000))
+
+    try:
+        stopwords = english_stopwords()
+    except LookupError:
+        print("⚠️ NLTK stopwords chưa được tải (nltk.download('stopwords')), bỏ qua stopword.")
+        stopwords = frozenset()
+    yt = pd.read_csv(os.path.join(base_dir, "YoutubeAds", "data", "2025-10-31", "playlist_data.csv"))
+    yt_text = pd.concat([yt[c] for c in ["title", "description", "tags", "comments"]] * repeat, ignore_index=True)
+    print(f"📺 YouTube: {len(yt_text)} texts")
+    yt_clean = partial(clean_youtube_series, stopwords=stopwords)
+    _bench("clean_text", yt_text, partial(_legacy_clean_text, stopwords=stopwords),
+           yt_clean, partial(parallel_clean, func=yt_clean, chunksize=100))
+
+
+if __name__ == "__main__":
+    main()